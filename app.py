@@ -1,9 +1,16 @@
 import streamlit as st
 import os
-import shutil
-from resume_matcher.resume_parser import load_resumes
-from resume_matcher.matcher import rank_resumes
-from resume_matcher.explainer import generate_explanation
+import time
+import uuid
+from config import config
+from resume_matcher.jobs import JobManager, PARSING, EMBEDDING, RANKING, DONE, FAILED
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.explainer import stream_explanation, explain_candidates
+from resume_matcher.matcher import preload_model
+from resume_matcher.metrics import metrics
+from resume_matcher.ranking_context import RankingContext, RankingContextStore, upload_key
+from resume_matcher.resume_parser import UploadTooLarge
+from resume_matcher.skills import SkillFilter, get_vocabulary
 
 # --- 1. CONFIGURATION DE LA PAGE ---
 st.set_page_config(
@@ -26,12 +33,43 @@ if 'results' not in st.session_state:
     st.session_state.results = None
 if 'ai_analyses' not in st.session_state:
     st.session_state.ai_analyses = {}
+if 'job_id' not in st.session_state:
+    # L'identifiant du job est aussi dans l'URL : un rafraîchissement de la page le retrouve
+    st.session_state.job_id = st.query_params.get("job")
+if 'database_query' not in st.session_state:
+    # Dernière recherche dans la base de candidats (filtre et nombre de résultats demandés)
+    st.session_state.database_query = None
+if 'session_key' not in st.session_state:
+    # Identifie la session auprès du stockage partagé des contextes de classement
+    st.session_state.session_key = uuid.uuid4().hex
 
-# Fonction pour nettoyer le dossier uploads
-def clear_upload_folder():
-    if os.path.exists("uploads"):
-        shutil.rmtree("uploads")
-    os.makedirs("uploads")
+# Gestionnaire de jobs partagé par toutes les sessions (analyses en arrière-plan)
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    return JobManager()
+
+job_manager = get_job_manager()
+
+# Base de candidats persistante : les CV sont analysés une seule fois
+@st.cache_resource
+def get_candidate_store() -> CandidateStore:
+    return CandidateStore()
+
+candidate_store = get_candidate_store()
+
+# CV analysés + embeddings par session : modifier l'offre ne ré-encode que l'offre
+@st.cache_resource
+def get_ranking_contexts() -> RankingContextStore:
+    return RankingContextStore()
+
+ranking_contexts = get_ranking_contexts()
+
+# Chargement du modèle en arrière-plan dès le démarrage : la page s'affiche tout de suite
+@st.cache_resource
+def start_model_preload():
+    return preload_model()
+
+start_model_preload()
 
 # --- 3. SIDEBAR (UPLOAD) ---
 with st.sidebar:
@@ -47,9 +85,47 @@ with st.sidebar:
     # Indicateur visuel simple
     if uploaded_files:
         st.success(f"✅ {len(uploaded_files)} resumes loaded")
+        total_mb = sum(uploaded_file.size for uploaded_file in uploaded_files) / 1024 / 1024
+        st.caption(f"{total_mb:.1f} MB / {config.app.max_file_size_mb} MB max")
     else:
         st.info("Waiting for files...")
 
+    st.divider()
+
+    # Source de la recherche : fichiers envoyés ou base de candidats
+    search_source = st.radio("Search in:", ["Uploaded files", "Candidate database"])
+    use_database = search_source == "Candidate database"
+    if use_database:
+        st.caption(f"🗄️ {len(candidate_store)} candidates in the database")
+        if uploaded_files and st.button("➕ Add uploads to database", use_container_width=True):
+            try:
+                with st.spinner("Reading and indexing new resumes..."):
+                    report = candidate_store.ingest_uploads(
+                        [(uploaded_file.name, uploaded_file.getbuffer()) for uploaded_file in uploaded_files]
+                    )
+                st.success(f"✅ {report}")
+            except UploadTooLarge as e:
+                st.error(f"⚠️ {e}")
+
+        with st.expander("Manage database"):
+            to_delete = st.multiselect("Candidates", candidate_store.names())
+            if st.button("🗑️ Delete selected", disabled=not to_delete):
+                candidate_store.delete(to_delete)
+                st.rerun()
+            if st.button("🧹 Compact"):
+                candidate_store.compact()
+                st.rerun()
+
+    st.divider()
+
+    # Filtres structurés : les compétences sont extraites une seule fois, à l'import des CV
+    with st.expander("🧩 Skill filters"):
+        skill_names = get_vocabulary().skills
+        required_skills = st.multiselect("Required skills", skill_names)
+        preferred_skills = st.multiselect("Preferred skills (score boost)", skill_names)
+        min_years = st.number_input("Min. years of experience", min_value=0, max_value=40, value=0)
+    skill_filter = SkillFilter(required=required_skills, preferred=preferred_skills, min_years=min_years or None) or None
+
 # --- 4. ZONE PRINCIPALE (INPUT) ---
 st.title("🎯 Smart Resume Matcher")
 st.markdown("### Find the perfect candidate using AI Vectors")
@@ -65,26 +141,87 @@ job_description = st.text_area(
 # On utilise use_container_width pour qu'il prenne toute la largeur
 if st.button("🚀 Analyze Candidates", type="primary", use_container_width=True):
     
-    if not uploaded_files or not job_description:
+    if use_database:
+        # Un seul encodage de l'offre + un parcours des embeddings stockés
+        if not job_description:
+            st.warning("⚠️ Please provide a job description.")
+        elif not len(candidate_store):
+            st.warning("⚠️ The candidate database is empty. Add resumes first.")
+        else:
+            # Seulement le nombre de résultats affichés : l'index IVF n'a pas à tout parcourir
+            show_top = st.session_state.get("show_top", config.app.default_top_n)
+            top_k = None if show_top == "Tous" else show_top
+            # Même découpage par étape que les analyses en arrière-plan (panneau de diagnostic)
+            with metrics.run("analysis"):
+                st.session_state.results = candidate_store.search(job_description, top_k=top_k, skill_filter=skill_filter)
+            st.session_state.database_query = {"skill_filter": skill_filter, "top_k": top_k}
+            if not st.session_state.results:
+                st.info("No candidate meets the skill filters.")
+            st.session_state.job_text = job_description
+            st.session_state.job_id = None
+            if "job" in st.query_params:
+                del st.query_params["job"]
+            st.session_state.ai_analyses = {}
+    elif not uploaded_files or not job_description:
         st.warning("⚠️ Please upload resumes AND provide a job description.")
     else:
-        with st.spinner("Reading PDFs and calculating scores..."):
-            # 1. Préparation des fichiers
-            clear_upload_folder()
-            file_paths = []
-            for uploaded_file in uploaded_files:
-                file_path = os.path.join("uploads", uploaded_file.name)
-                with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
-                file_paths.append(file_path)
-
-            # 2. Parsing et Matching (Backend)
-            resumes = load_resumes(file_paths)
-            results = rank_resumes(job_description, resumes)
-            
-            # 3. Sauvegarde dans la session
-            st.session_state.results = results
-            st.session_state.ai_analyses = {} # Reset l'IA précédente
+        # getbuffer() : vue mémoire sur le fichier envoyé, sans copie ni écriture disque
+        files = [(uploaded_file.name, uploaded_file.getbuffer()) for uploaded_file in uploaded_files]
+        st.session_state.upload_key = upload_key(files)
+        context = ranking_contexts.get(st.session_state.session_key, st.session_state.upload_key)
+        if context is not None:
+            # Mêmes fichiers déjà analysés : un seul encodage (l'offre) + un produit matrice-vecteur
+            with metrics.run("analysis"):
+                st.session_state.results = context.rank(job_description, skill_filter=skill_filter)
+            st.session_state.database_query = None
+            if not st.session_state.results:
+                st.info("No candidate meets the skill filters.")
+            st.session_state.job_text = job_description
+            st.session_state.job_id = None
+            if "job" in st.query_params:
+                del st.query_params["job"]
+            st.session_state.ai_analyses = {}
+        else:
+            # L'analyse tourne en arrière-plan : le script n'est pas bloqué
+            try:
+                st.session_state.job_id = job_manager.submit(files, job_description, skill_filter=skill_filter)
+                st.query_params["job"] = st.session_state.job_id
+                st.session_state.results = None
+                st.session_state.database_query = None
+                st.session_state.ai_analyses = {} # Reset l'IA précédente
+            except UploadTooLarge as e:
+                # Taille totale vérifiée avant toute analyse
+                st.error(f"⚠️ {e}")
+
+# --- 4b. SUIVI DU JOB EN COURS ---
+job = job_manager.get(st.session_state.job_id) if st.session_state.job_id else None
+if job is not None:
+    # Résultats partiels dès qu'ils sont disponibles, puis résultats finaux
+    st.session_state.results = job.results or st.session_state.results
+    st.session_state.job_text = job.job_description
+    upload_set = st.session_state.get("upload_key")
+    if (job.status == DONE and upload_set and job.embeddings is not None
+            and ranking_contexts.get(st.session_state.session_key, upload_set) is None):
+        # Garde les CV du job, leurs embeddings et leurs compétences pour les prochaines offres.
+        # Sans embeddings (filtre de compétences, recherche hybride), pas de contexte :
+        # les calculer ici bloquerait l'interface, la prochaine offre repasse par un job.
+        ranking_contexts.put(st.session_state.session_key, RankingContext(
+            upload_set, job.resumes, skills=job.skills, embeddings=job.embeddings
+        ))
+    if job.status == FAILED:
+        st.error(f"⚠️ Analysis failed: {job.error}")
+    elif job.status == DONE and job.skill_filter and not job.results:
+        st.info("No candidate meets the skill filters.")
+    elif job.status != DONE:
+        if job.status == PARSING:
+            progress_text = f"Reading PDFs... {job.parsed}/{job.total}"
+        elif job.status == EMBEDDING:
+            progress_text = f"Calculating scores... {job.embedded}/{job.to_embed}"
+        elif job.status == RANKING:
+            progress_text = "Ranking candidates..."
+        else:
+            progress_text = "Waiting for a free worker..."
+        st.progress(job.progress, text=progress_text)
 
 # --- 5. AFFICHAGE DES RÉSULTATS (GRILLE NATIVE) ---
 if st.session_state.results:
@@ -95,9 +232,31 @@ if st.session_state.results:
     
     with col_header:
         st.subheader("📊 Analysis Results")
+        # Analyse IA du Top 3 en parallèle (requêtes concurrentes vers Ollama)
+        if st.button("✨ Explain Top 3", key="btn_ai_all"):
+            top_candidates = st.session_state.results[:3]
+            with st.spinner(f"Llama 3 is analyzing the top {len(top_candidates)} candidates..."):
+                explanations = explain_candidates([c['content'] for c in top_candidates], st.session_state.job_text)
+            for index, explanation in enumerate(explanations):
+                st.session_state.ai_analyses[f"cand_{index}"] = explanation
+            st.rerun()
         
     with col_filter:
-        selected_limit = st.selectbox("Show top:", [5, 10, 25, 50, "Tous"], index=1)
+        limit_options = [5, 10, 25, 50, "Tous"]
+        default_limit = config.app.default_top_n
+        selected_limit = st.selectbox(
+            "Show top:", limit_options, key="show_top",
+            index=limit_options.index(default_limit) if default_limit in limit_options else 1
+        )
+
+    # Plus de résultats demandés que ceux obtenus de la base : nouvelle recherche
+    query = st.session_state.database_query
+    if query and query["top_k"] is not None and (selected_limit == "Tous" or selected_limit > query["top_k"]):
+        query["top_k"] = None if selected_limit == "Tous" else selected_limit
+        with metrics.run("analysis"):
+            st.session_state.results = candidate_store.search(
+                st.session_state.job_text, top_k=query["top_k"], skill_filter=query["skill_filter"]
+            )
     
     # Logique de découpage (Slicing Logic)
     if selected_limit == "Tous":
@@ -105,7 +264,11 @@ if st.session_state.results:
     else:
         results_to_display = st.session_state.results[:selected_limit]
         
-    st.caption(f"Affichage de {len(results_to_display)} résultats sur {len(st.session_state.results)} candidats au total.")
+    if query and query["top_k"] is not None:
+        # Recherche limitée : le total est celui de la base
+        st.caption(f"Affichage de {len(results_to_display)} résultats sur {len(candidate_store)} candidats dans la base.")
+    else:
+        st.caption(f"Affichage de {len(results_to_display)} résultats sur {len(st.session_state.results)} candidats au total.")
     
     # Configuration de la grille : 3 colonnes
     cols = st.columns(3)
@@ -126,6 +289,10 @@ if st.session_state.results:
                 with c_head2:
                     if index == 0:
                         st.markdown(":star: **Top 1**")
+
+                # Doublons regroupés sur ce candidat (même CV envoyé plusieurs fois ou légèrement modifié)
+                if candidate.aliases:
+                    st.caption("📎 Also uploaded as: " + ", ".join(os.path.basename(alias) for alias in candidate.aliases))
                 
                 # Score et Barre
                 score_val = candidate['score']
@@ -159,10 +326,11 @@ if st.session_state.results:
                     # Si l'analyse n'est pas encore faite, afficher le bouton
                     if analysis_key not in st.session_state.ai_analyses:
                         if st.button("✨ Ask AI Why", key=f"btn_ai_{index}", type="secondary", use_container_width=True):
-                            with st.spinner(f"Llama 3 is analyzing candidate #{index+1}..."):
-                                explanation = generate_explanation(candidate['content'], job_description)
-                                st.session_state.ai_analyses[analysis_key] = explanation
-                                st.rerun() # Recharge la page pour afficher le texte
+                            st.info("🤖 **AI Recruiter Analysis:**")
+                            # Affichage progressif : les tokens s'affichent au fil de la génération
+                            explanation = st.write_stream(stream_explanation(candidate['content'], st.session_state.job_text))
+                            st.session_state.ai_analyses[analysis_key] = explanation
+                            st.rerun() # Recharge la page pour afficher le texte
                     
                     # Si l'analyse est faite, l'afficher + bouton fermer
                     else:
@@ -178,4 +346,29 @@ if st.session_state.results:
     if st.button("🔄 Start New Search"):
         st.session_state.results = None
         st.session_state.ai_analyses = {}
-        st.rerun()
\ No newline at end of file
+        st.session_state.job_id = None
+        if "job" in st.query_params:
+            del st.query_params["job"]
+        st.rerun()
+
+# --- 6. DIAGNOSTICS (CACHÉ, ?diagnostics=1 DANS L'URL) ---
+if st.query_params.get("diagnostics") == "1":
+    with st.expander("🔧 Diagnostics", expanded=False):
+        if not metrics.enabled:
+            st.caption("Metrics are disabled. Set METRICS_ENABLED=true to record timings.")
+        last_run = metrics.last_run()
+        if last_run:
+            st.markdown(f"**Last run:** {last_run['total_s']:.2f}s")
+            st.table([
+                {"stage": stage, "seconds": round(data["seconds"], 4), "calls": data["count"]}
+                for stage, data in sorted(last_run["stages"].items(), key=lambda item: -item[1]["seconds"])
+            ])
+        snapshot = metrics.snapshot()
+        if snapshot["counters"]:
+            st.json(snapshot["counters"])
+        st.download_button("Prometheus export", metrics.prometheus_text(), file_name="metrics.prom")
+
+# Tant que le job tourne, on rafraîchit la page pour afficher la progression
+if job is not None and not job.finished:
+    time.sleep(0.5)
+    st.rerun()
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Benchmark of ingest-time duplicate detection (resume_matcher/dedup.py).
+
+Builds synthetic pools in which a share of the resumes are exact copies
+and another share are light edits (a line dropped, a year changed) of
+earlier resumes, then runs them through a Deduplicator and reports:
+
+    docs/s       resumes checked per second (exact hash + MinHash + LSH)
+    cands/doc    LSH candidates compared per resume (vs. the pool size a
+                 pairwise scan would compare)
+    precision    share of the merges that were real duplicates
+    recall       share of the injected duplicates that were merged
+
+The embedding confirmation is off by default (it costs one encode per
+candidate pair); --confirm turns it on with the configured model.
+
+Usage:
+    python benchmarks/bench_dedup.py --sizes 10000 100000
+    python benchmarks/bench_dedup.py --sizes 2000 --confirm
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import make_resumes
+
+
+def make_pool(size: int, exact_share: float, near_share: float, seed: int = 0):
+    """Resumes with injected duplicates, and the original index of each duplicate."""
+    rng = random.Random(seed)
+    n_exact = int(size * exact_share)
+    n_near = int(size * near_share)
+    texts = make_resumes(size - n_exact - n_near, seed=seed)
+    originals = {}
+    for _ in range(n_exact):
+        source = rng.randrange(size - n_exact - n_near)
+        originals[len(texts)] = source
+        texts.append(texts[source])
+    for _ in range(n_near):
+        source = rng.randrange(size - n_exact - n_near)
+        lines = texts[source].split("\n")
+        del lines[rng.randrange(3, len(lines))]
+        edited = "\n".join(lines).replace("20", "19", 1)
+        originals[len(texts)] = source
+        texts.append(edited)
+    order = list(range(len(texts)))
+    # Duplicates come after their original, like re-uploads do
+    rng.shuffle(order)
+    order.sort(key=lambda i: i in originals)
+    return [texts[i] for i in order], order, originals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--exact", type=float, default=0.05, help="Share of exact copies")
+    parser.add_argument("--near", type=float, default=0.05, help="Share of lightly edited copies")
+    parser.add_argument("--confirm", action="store_true", help="Confirm near duplicates with embeddings")
+    args = parser.parse_args()
+
+    # Must happen before the project modules read their configuration
+    os.environ["CACHE_ENABLED"] = "false"
+    from resume_matcher.dedup import Deduplicator
+
+    print(f"{'size':>8} | {'docs/s':>8} | {'cands/doc':>9} | {'exact':>6} | {'near':>6} | {'precision':>9} | {'recall':>6}")
+    print("-" * 70)
+    for size in args.sizes:
+        texts, order, originals = make_pool(size, args.exact, args.near)
+        deduplicator = Deduplicator(embedding_threshold=None if args.confirm else 0)
+        candidates = 0
+        lookup = deduplicator.index.candidates
+
+        def counting(signature):
+            nonlocal candidates
+            found = lookup(signature)
+            candidates += len(found)
+            return found
+
+        deduplicator.index.candidates = counting
+        merged = {}
+        start = time.perf_counter()
+        for position, text in enumerate(texts):
+            canonical = deduplicator.add(str(position), text)
+            if canonical is not None:
+                merged[position] = int(canonical)
+        elapsed = time.perf_counter() - start
+
+        # A merge is right when both resumes derive from the same original
+        def root(position):
+            index = order[position]
+            return originals.get(index, index)
+
+        correct = sum(root(dup) == root(kept) for dup, kept in merged.items())
+        injected = len(originals)
+        stats = deduplicator.stats()
+        print(f"{size:>8} | {size / elapsed:>8.0f} | {candidates / size:>9.2f} | {stats['exact']:>6} | "
+              f"{stats['near']:>6} | {correct / max(len(merged), 1):>9.3f} | {correct / max(injected, 1):>6.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
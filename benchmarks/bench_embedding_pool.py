@@ -0,0 +1,66 @@
+"""
+Benchmark the multi-process embedding pool against in-process encoding.
+
+Encodes the same synthetic resumes in-process (one model, all threads) and
+on pools of several sizes, and reports throughput once the workers have
+loaded their model.
+
+Usage:
+    python benchmarks/bench_embedding_pool.py --docs 2000 --workers 2 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import make_resumes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000, help="Synthetic resumes encoded per pass")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="Pool sizes to compare")
+    parser.add_argument("--threads-per-worker", type=int, default=0, help="0 = cores / workers")
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    # Must happen before the project modules read their configuration
+    os.environ["CACHE_ENABLED"] = "false"
+
+    from resume_matcher.embedding_pool import EmbeddingPool, encode_local
+    from resume_matcher.matcher import get_model
+
+    texts = make_resumes(args.docs, seed=0)
+    model = get_model()
+    encode_local(model, texts[:32])
+
+    start = time.perf_counter()
+    for _ in range(args.repeats):
+        reference = encode_local(model, texts)
+    local_s = (time.perf_counter() - start) / args.repeats
+
+    print(f"{'MODE':<16} | {'docs/s':>8} | {'speed-up':>8} | {'max |diff|':>10}")
+    print("-" * 52)
+    print(f"{'in-process':<16} | {len(texts) / local_s:>8.1f} | {1.0:>8.2f} | {0.0:>10.2e}")
+    for workers in args.workers:
+        pool = EmbeddingPool(workers=workers, threads_per_worker=args.threads_per_worker, min_texts=0)
+        pool.encode(texts[:workers * 8])  # Waits for every worker to load its model
+        start = time.perf_counter()
+        for _ in range(args.repeats):
+            vectors = pool.encode(texts)
+        pool_s = (time.perf_counter() - start) / args.repeats
+        pool.close()
+        label = f"{pool.workers} x {pool.threads_per_worker} threads"
+        print(f"{label:<16} | {len(texts) / pool_s:>8.1f} | {local_s / pool_s:>8.2f} | "
+              f"{float(np.abs(vectors - reference).max()):>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark embedding model start-up and throughput per backend (torch,
+torch-int8, onnx).
+
+Each backend runs in a fresh interpreter so import and load times are the
+ones a new process pays:
+
+- import: ``import resume_matcher.matcher`` (model libraries are lazy)
+- load: first get_model() call, including the warm-up encode (and the
+  one-time ONNX export when no export is cached yet)
+- first: first encode of a batch after loading
+- docs/s: steady-state encode throughput
+- cosine: mean cosine similarity of the embeddings with the torch ones
+
+Usage:
+    python benchmarks/bench_model_backends.py --docs 256 --batch-size 32
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+
+BACKENDS = ["torch", "torch-int8", "onnx"]
+
+# Runs in the child process; prints one JSON line
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {bench!r})
+import resume_matcher.matcher as matcher
+import_s = time.perf_counter() - start
+
+import numpy as np
+from synthetic import make_resumes
+
+texts = make_resumes({docs}, seed=0)
+start = time.perf_counter()
+model = matcher.get_model(backend={backend!r})
+load_s = time.perf_counter() - start
+
+start = time.perf_counter()
+model.encode(texts[:{batch_size}], batch_size={batch_size})
+first_s = time.perf_counter() - start
+
+start = time.perf_counter()
+for _ in range({repeats}):
+    embeddings = np.asarray(model.encode(texts, batch_size={batch_size}))
+encode_s = (time.perf_counter() - start) / {repeats}
+
+np.save({output!r}, embeddings)
+print(json.dumps({{"import_s": import_s, "load_s": load_s, "first_s": first_s, "docs_per_s": len(texts) / encode_s}}))
+"""
+
+
+def run_backend(backend: str, args, output: str) -> dict:
+    code = CHILD.format(
+        root=str(ROOT), bench=str(ROOT / "benchmarks"), docs=args.docs, backend=backend,
+        batch_size=args.batch_size, repeats=args.repeats, output=output
+    )
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=os.environ.copy())
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS, choices=BACKENDS)
+    parser.add_argument("--docs", type=int, default=256, help="Synthetic resumes encoded per pass")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed encode passes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for backend in args.backends:
+            results[backend] = run_backend(backend, args, os.path.join(tmp, f"{backend}.npy"))
+
+        reference = os.path.join(tmp, "torch.npy")
+        print(f"{'BACKEND':<11} | {'import (s)':>10} | {'load (s)':>8} | {'first (s)':>9} | {'docs/s':>8} | {'cosine':>6}")
+        print("-" * 68)
+        for backend, result in results.items():
+            if "error" in result:
+                print(f"{backend:<11} | {result['error']}")
+                continue
+            cosine = float("nan")
+            if os.path.exists(reference):
+                a = np.load(reference)
+                b = np.load(os.path.join(tmp, f"{backend}.npy"))
+                cosine = float(np.mean(np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))))
+            print(f"{backend:<11} | {result['import_s']:>10.2f} | {result['load_s']:>8.2f} | "
+                  f"{result['first_s']:>9.3f} | {result['docs_per_s']:>8.1f} | {cosine:>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark of the explanation prompt: size, prefill latency and relevance.
+
+Explains long synthetic resumes against one job description on the fake
+Ollama server, whose prompt evaluation costs --prompt-delay seconds per
+word not shared with the previous prompt (its simulated KV prefix cache).
+Three prompt strategies are compared:
+
+    cut        the previous prompt: resume before the instructions, cut
+               after MAX_RESUME_CHARS characters
+    prefix     job description and instructions first (shared prefix),
+               resume cut after MAX_RESUME_CHARS characters
+    condensed  shared prefix + the resume condensed to its most relevant
+               passages within OLLAMA_RESUME_TOKEN_BUDGET
+
+For each strategy: prompt words sent, words actually evaluated, mean
+latency per explanation and the share of the job's skills present in the
+resume that made it into the prompt.
+
+Usage:
+    python benchmarks/bench_prompt_budget.py --resumes 20 --prompt-delay 0.001
+    python benchmarks/bench_prompt_budget.py --budget 384 --experience 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from fake_ollama import start_fake_ollama
+from synthetic import SKILLS, make_job_descriptions, make_resume
+
+
+def legacy_prompt(resume_text: str, job_text: str, max_resume_chars: int) -> str:
+    """The prompt layout used before condensation (resume in the middle)."""
+    return f"""
+    You are an expert AI Technical Recruiter.
+
+    JOB DESCRIPTION:
+    {job_text}
+
+    CANDIDATE RESUME:
+    {resume_text[:max_resume_chars]}
+
+    TASK:
+    Based on the resume content, explain in 3 concise bullet points why this candidate is a good match for the job.
+    - Focus on matching hard skills (technologies) and relevant experience.
+    - Do not hallucinate skills not present in the resume.
+    """
+
+
+def skill_recall(job_text: str, resume_text: str, prompt: str) -> float:
+    """Share of the job's skills found in the resume that also appear in the prompt."""
+    relevant = [skill for skill in SKILLS if skill in job_text and skill in resume_text]
+    if not relevant:
+        return 1.0
+    return sum(skill in prompt for skill in relevant) / len(relevant)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20, help="Candidates explained per strategy")
+    parser.add_argument("--experience", type=int, default=30, help="Experience entries per synthetic resume")
+    parser.add_argument("--budget", type=int, help="Resume token budget (defaults to OLLAMA_RESUME_TOKEN_BUDGET)")
+    parser.add_argument("--prompt-delay", type=float, default=0.001, help="Fake prefill seconds per prompt word")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Fake seconds per generated token")
+    args = parser.parse_args()
+
+    # Must happen before the project modules read their configuration
+    os.environ["CACHE_ENABLED"] = "false"
+    server, url = start_fake_ollama(token_delay=args.token_delay, prompt_delay=args.prompt_delay)
+
+    from resume_matcher.condenser import estimate_tokens
+    from resume_matcher.explainer import OllamaClient
+    from resume_matcher.matcher import get_model
+
+    rng = random.Random(0)
+    resumes = [make_resume(rng, n_jobs=args.experience) for _ in range(args.resumes)]
+    job = make_job_descriptions(1, seed=7)[0]
+    client = OllamaClient(base_url=url, max_retries=0, resume_token_budget=args.budget)
+    uncondensed = OllamaClient(base_url=url, max_retries=0, resume_token_budget=0)
+    # Load the embedding model outside the timed region
+    get_model()
+
+    strategies = {
+        "cut": lambda text: legacy_prompt(text, job, client.max_resume_chars),
+        "prefix": lambda text: uncondensed.prompt(text, job),
+        "condensed": lambda text: client.prompt(text, job),
+    }
+
+    print(f"Resumes: ~{sum(estimate_tokens(r) for r in resumes) // len(resumes)} tokens on average, "
+          f"budget {client.resume_token_budget} tokens\n")
+    print(f"{'strategy':<10} | {'words sent':>10} | {'evaluated':>10} | {'ms / call':>10} | {'skill recall':>12}")
+    print("-" * 64)
+    for name, make_prompt in strategies.items():
+        server.cached_prompt = []
+        server.prompt_words_evaluated = 0
+        sent, recall = 0, 0.0
+        start = time.perf_counter()
+        for text in resumes:
+            prompt = make_prompt(text)
+            client.generate(prompt)
+            sent += len(prompt.split())
+            recall += skill_recall(job, text, prompt)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} | {sent // len(resumes):>10} | {server.prompt_words_evaluated // len(resumes):>10} | "
+              f"{elapsed / len(resumes) * 1000:>10.1f} | {recall / len(resumes):>12.2f}")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
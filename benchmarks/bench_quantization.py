@@ -0,0 +1,80 @@
+"""
+Benchmark the quantized embedding store: disk size, scoring latency over
+the memory map, and accuracy of float16 / int8 against float32
+(Spearman rank correlation of the scores, recall@k of the top results).
+
+Uses synthetic clustered embeddings so it runs without the embedding model.
+
+Usage:
+    python benchmarks/bench_quantization.py --size 200000 --k 10
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_vector_index import synthetic_embeddings
+from resume_matcher.quantized_store import CODES_FILE, DTYPES, SCALES_FILE, QuantizedStore, quantization_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=200000, help="Number of stored vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Cut-off for recall@k")
+    parser.add_argument("--report-sample", type=int, default=20000, help="Vectors used for the accuracy report")
+    parser.add_argument("--dtypes", nargs="+", default=list(DTYPES), choices=DTYPES)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = synthetic_embeddings(args.size, args.dim, 200, rng)
+    queries = synthetic_embeddings(args.queries, args.dim, 200, rng)
+    ids = [f"cv_{i}" for i in range(args.size)]
+
+    accuracy = {
+        r["dtype"]: r for r in quantization_report(vectors[:args.report_sample], queries, args.k, args.dtypes)
+    }
+
+    print(f"Vectors: {args.size} x {args.dim}, queries: {args.queries}, k={args.k}")
+    print("-" * 78)
+    print(f"{'DTYPE':<8} | {'DISK (MB)':>9} | {'WRITE (s)':>9} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | "
+          f"{'SPEARMAN':>8} | {'RECALL':>6}")
+    print("-" * 78)
+
+    work_dir = tempfile.mkdtemp(prefix="recruiter_quant_")
+    try:
+        for dtype in args.dtypes:
+            path = os.path.join(work_dir, dtype)
+            start = time.perf_counter()
+            QuantizedStore(path, dtype=dtype).add(ids, vectors)
+            write_time = time.perf_counter() - start
+
+            # Reopen so queries run over the memory map, not freshly written data
+            store = QuantizedStore(path)
+            latencies = []
+            for q in queries:
+                start = time.perf_counter()
+                store.query(q, args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            disk = sum(os.path.getsize(os.path.join(path, name))
+                       for name in (CODES_FILE, SCALES_FILE) if os.path.exists(os.path.join(path, name)))
+            report = accuracy[dtype]
+            print(f"{dtype:<8} | {disk / 2**20:>9.1f} | {write_time:>9.2f} | {np.percentile(latencies, 50):>8.2f} | "
+                  f"{np.percentile(latencies, 95):>8.2f} | {report['spearman']:>8.5f} | {report['recall_at_k']:>6.3f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the vector index backends: build time, query latency and recall@k
+of the approximate IVF index against the exact flat scan.
+
+Uses synthetic clustered embeddings so it runs without the embedding model.
+
+Usage:
+    python benchmarks/bench_vector_index.py --size 100000 --k 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_matcher.vector_index import FlatIndex, IVFIndex
+
+
+def synthetic_embeddings(n: int, dim: int, n_topics: int, rng: np.random.Generator) -> np.ndarray:
+    """Embeddings drawn around a few "topic" directions, like real resumes."""
+    topics = rng.standard_normal((n_topics, dim)).astype(np.float32)
+    labels = rng.integers(0, n_topics, n)
+    noise = rng.standard_normal((n, dim)).astype(np.float32)
+    return topics[labels] + 0.8 * noise
+
+
+def time_queries(index, queries: np.ndarray, k: int):
+    latencies = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(index.query(q, k))
+        latencies.append(time.perf_counter() - start)
+    return results, np.array(latencies) * 1000
+
+
+def recall_at_k(exact, approx) -> float:
+    hits = sum(len({i for i, _ in e} & {i for i, _ in a}) for e, a in zip(exact, approx))
+    return hits / sum(len(e) for e in exact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Number of indexed vectors")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF clusters (0 = sqrt(size))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    vectors = synthetic_embeddings(args.size, args.dim, 200, rng)
+    queries = synthetic_embeddings(args.queries, args.dim, 200, rng)
+    ids = [f"cv_{i}" for i in range(args.size)]
+
+    print(f"Vectors: {args.size} x {args.dim}, queries: {args.queries}, k={args.k}")
+    print("-" * 64)
+    print(f"{'BACKEND':<18} | {'BUILD (s)':>9} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'RECALL':>6}")
+    print("-" * 64)
+
+    start = time.perf_counter()
+    flat = FlatIndex(args.dim).build(ids, vectors)
+    flat_build = time.perf_counter() - start
+    exact, latencies = time_queries(flat, queries, args.k)
+    print(f"{'flat':<18} | {flat_build:>9.2f} | {np.percentile(latencies, 50):>8.2f} | "
+          f"{np.percentile(latencies, 95):>8.2f} | {1.0:>6.3f}")
+
+    start = time.perf_counter()
+    ivf = IVFIndex(args.dim, nlist=args.nlist or None).build(ids, vectors)
+    ivf_build = time.perf_counter() - start
+    for nprobe in args.nprobe:
+        ivf.nprobe = nprobe
+        approx, latencies = time_queries(ivf, queries, args.k)
+        label = f"ivf (nprobe={nprobe})"
+        print(f"{label:<18} | {ivf_build:>9.2f} | {np.percentile(latencies, 50):>8.2f} | "
+              f"{np.percentile(latencies, 95):>8.2f} | {recall_at_k(exact, approx):>6.3f}")
+
+
+if __name__ == "__main__":
+    main()
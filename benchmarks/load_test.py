@@ -0,0 +1,131 @@
+"""
+Load test for the HTTP ranking service (scripts/serve.py).
+
+Sends /rank requests from concurrent client threads for a fixed duration
+and reports throughput, latency percentiles and how many requests were
+shed with 503. Compare runs with different SERVER_BATCH_MAX_WAIT_MS or
+SERVER_MAX_INFLIGHT settings on the server side.
+
+Usage:
+    python benchmarks/load_test.py --url http://127.0.0.1:8080 --seed 1000
+    python benchmarks/load_test.py --concurrency 1 8 32 --duration 20
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from synthetic import make_job_descriptions, make_resumes
+
+
+def post(url: str, payload: dict, timeout: float = 60.0):
+    """POST JSON, return (status, decoded body)."""
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+
+def seed(url: str, count: int, chunk: int = 200) -> None:
+    """Ingest synthetic resumes as text so /rank has candidates to score."""
+    texts = make_resumes(count, seed=0)
+    for start in range(0, count, chunk):
+        records = [{"name": f"synthetic_{i:06d}", "content": text}
+                   for i, text in enumerate(texts[start:start + chunk], start)]
+        status, body = post(f"{url}/ingest", {"resumes": records}, timeout=600)
+        if status != 200:
+            raise SystemExit(f"Seeding failed with {status}: {body}")
+
+
+def run(url: str, concurrency: int, duration: float, jobs: list, top_k: int) -> dict:
+    """Hammer /rank from ``concurrency`` threads for ``duration`` seconds."""
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+    stop = time.perf_counter() + duration
+
+    def client(offset: int):
+        i = offset
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                status, _ = post(f"{url}/rank", {"job_description": jobs[i % len(jobs)], "top_k": top_k})
+            except OSError:
+                status = "error"
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+                if status == 200:
+                    latencies.append(elapsed)
+            i += concurrency
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "rejected": statuses.get(503, 0),
+        "errors": sum(n for status, n in statuses.items() if status not in (200, 503)),
+        "qps": len(latencies) / wall,
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Service base URL")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32], help="Client threads per run")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run")
+    parser.add_argument("--seed", type=int, default=0, help="Ingest this many synthetic resumes first")
+    parser.add_argument("--jobs", type=int, default=200, help="Distinct job descriptions to cycle through")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    if args.seed:
+        print(f"🌱 Ingesting {args.seed} synthetic resumes...")
+        seed(url, args.seed)
+    # Distinct job descriptions, so the embedding cache does not hide the encode cost
+    jobs = make_job_descriptions(args.jobs, seed=int(time.time()))
+
+    results = []
+    print(f"{'clients':>8} {'ok':>7} {'503':>6} {'err':>5} {'qps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for concurrency in args.concurrency:
+        result = run(url, concurrency, args.duration, jobs, args.top_k)
+        results.append(result)
+        print(f"{result['concurrency']:>8} {result['ok']:>7} {result['rejected']:>6} {result['errors']:>5} "
+              f"{result['qps']:>8.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}")
+
+    with urllib.request.urlopen(f"{url}/health") as response:
+        print(f"\nEncode batching: {json.loads(response.read())['encode']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
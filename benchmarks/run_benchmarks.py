@@ -0,0 +1,230 @@
+"""
+End-to-end benchmark of the parse -> embed -> rank -> explain pipeline.
+
+For each pool size, synthetic resumes are generated (as text and as PDFs)
+and each stage is timed:
+
+    extract  extract_text_from_pdf, one call per PDF
+    load     load_resumes over the whole pool
+    embed    get_embeddings, in batches
+    rank     rank_resumes of the pool against several job descriptions
+    explain  generate_explanation against a local fake Ollama server
+
+Every stage reports throughput (items/s), p50/p95 latency of its timed calls
+and the process's peak RSS so far. Results are written as JSON; passing a
+previous run with --baseline flags stages whose p50 latency or throughput
+regressed by more than --threshold (exit code 1).
+
+Caches are disabled unless --with-cache is given, so runs measure real work.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --baseline bench.json --threshold 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add parent directory to path so we can import project modules
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import numpy as np
+
+from fake_ollama import start_fake_ollama
+from synthetic import make_job_descriptions, make_resumes, write_pdfs
+
+STAGES = ["extract", "load", "embed", "rank", "explain"]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB."""
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20
+        except (ImportError, AttributeError):
+            return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def timed_calls(calls: List[Callable[[], object]]) -> List[float]:
+    """Run each call once and return its duration in seconds."""
+    durations = []
+    for call in calls:
+        start = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(stage: str, size: int, items: int, durations: List[float]) -> Dict:
+    total = sum(durations)
+    latencies_ms = np.array(durations) * 1000
+    return {
+        "stage": stage,
+        "size": size,
+        "items": items,
+        "calls": len(durations),
+        "total_s": round(total, 4),
+        "throughput_per_s": round(items / total, 2) if total else None,
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1) if peak_rss_mb() is not None else None,
+    }
+
+
+def run_size(size: int, stages: List[str], args, work_dir: str) -> List[Dict]:
+    from resume_matcher.explainer import generate_explanation
+    from resume_matcher.matcher import get_embeddings, get_model, rank_resumes
+    from resume_matcher.resume_parser import extract_text_from_pdf, load_resumes
+
+    texts = make_resumes(size, seed=args.seed)
+    jobs = make_job_descriptions(args.queries, seed=args.seed + 1)
+    resumes = [{"filename": f"resume_{i:06d}.pdf", "content": text} for i, text in enumerate(texts)]
+    results = []
+
+    needs_pdfs = any(stage in stages for stage in ("extract", "load"))
+    paths = write_pdfs(texts, os.path.join(work_dir, f"pdfs_{args.seed}_{size}")) if needs_pdfs else []
+
+    if "extract" in stages:
+        sample = paths[:args.extract_sample]
+        durations = timed_calls([lambda p=p: extract_text_from_pdf(p) for p in sample])
+        results.append(summarize("extract", size, len(sample), durations))
+
+    if "load" in stages:
+        durations = timed_calls([lambda: load_resumes(paths)])
+        results.append(summarize("load", size, len(paths), durations))
+
+    if "embed" in stages or "rank" in stages:
+        # Load the model outside the timed region
+        get_model()
+
+    if "embed" in stages:
+        batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+        durations = timed_calls([lambda b=b: get_embeddings(b) for b in batches])
+        results.append(summarize("embed", size, len(texts), durations))
+
+    if "rank" in stages:
+        durations = timed_calls([lambda j=j: rank_resumes(j, resumes, top_k=args.top_k) for j in jobs])
+        results.append(summarize("rank", size, len(jobs) * size, durations))
+
+    if "explain" in stages:
+        candidates = texts[:args.explain_calls]
+        durations = timed_calls([lambda t=t: generate_explanation(t, jobs[0]) for t in candidates])
+        results.append(summarize("explain", size, len(candidates), durations))
+
+    for result in results:
+        print(
+            f"{result['stage']:<8} | {size:>7} | {result['throughput_per_s'] or 0:>12.1f} | "
+            f"{result['p50_ms']:>10.2f} | {result['p95_ms']:>10.2f} | {result['peak_rss_mb'] or 0:>8.1f}"
+        )
+    return results
+
+
+def compare(current: List[Dict], baseline: List[Dict], threshold: float) -> List[str]:
+    """
+    List the stages that got slower than the baseline by more than threshold.
+
+    Args:
+        current: Results of this run
+        baseline: Results of a previous run
+        threshold: Allowed relative regression (0.2 = 20%)
+
+    Returns:
+        Human readable regression messages (empty if none)
+    """
+    previous = {(r["stage"], r["size"]): r for r in baseline}
+    regressions = []
+    for result in current:
+        old = previous.get((result["stage"], result["size"]))
+        if old is None:
+            continue
+        label = f"{result['stage']}@{result['size']}"
+        if old["p50_ms"] and result["p50_ms"] > old["p50_ms"] * (1 + threshold):
+            regressions.append(f"{label}: p50 {old['p50_ms']:.2f}ms -> {result['p50_ms']:.2f}ms")
+        if old["throughput_per_s"] and result["throughput_per_s"] is not None \
+                and result["throughput_per_s"] < old["throughput_per_s"] * (1 - threshold):
+            regressions.append(
+                f"{label}: throughput {old['throughput_per_s']:.1f}/s -> {result['throughput_per_s']:.1f}/s"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000], help="Resume pool sizes")
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--queries", type=int, default=5, help="Job descriptions ranked per size")
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per get_embeddings call")
+    parser.add_argument("--extract-sample", type=int, default=200, help="PDFs timed individually")
+    parser.add_argument("--explain-calls", type=int, default=10)
+    parser.add_argument("--token-delay", type=float, default=0.005, help="Fake Ollama seconds per token")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--with-cache", action="store_true", help="Keep embedding/text/explanation caches on")
+    parser.add_argument("--work-dir", help="Where synthetic PDFs are written (default: temp dir)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression ratio")
+    args = parser.parse_args()
+
+    # Must happen before the project modules read their configuration
+    server, ollama_url = start_fake_ollama(token_delay=args.token_delay)
+    os.environ["OLLAMA_BASE_URL"] = ollama_url
+    if not args.with_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="recruiter_bench_")
+
+    print(f"{'STAGE':<8} | {'SIZE':>7} | {'ITEMS/S':>12} | {'p50 (ms)':>10} | {'p95 (ms)':>10} | {'RSS (MB)':>8}")
+    print("-" * 70)
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.stages, args, work_dir))
+    server.shutdown()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "cache": args.with_cache,
+            "args": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"   - {message}")
+            return 1
+        print(f"\n✅ No regression above {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
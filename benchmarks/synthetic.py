@@ -0,0 +1,124 @@
+"""
+Synthetic resumes and job descriptions for benchmarks.
+
+Texts are assembled from a fixed vocabulary of skills, roles and filler
+sentences so runs are reproducible for a given seed. write_pdf produces a
+minimal multi-page PDF (Helvetica text only) that pypdf can parse, without
+any PDF-writing dependency.
+"""
+
+import os
+import random
+from typing import List
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "C++", "SQL", "PostgreSQL",
+    "MongoDB", "Redis", "Kafka", "Spark", "Hadoop", "Airflow", "dbt", "Pandas", "NumPy",
+    "scikit-learn", "PyTorch", "TensorFlow", "Docker", "Kubernetes", "Terraform", "AWS",
+    "Azure", "GCP", "Linux", "Git", "CI/CD", "React", "Angular", "Vue", "Django", "Flask",
+    "FastAPI", "Spring Boot", "Node.js", "GraphQL", "REST APIs", "Microservices", "Agile",
+    "Scrum", "Jira", "Tableau", "Power BI", "Excel", "Machine Learning", "NLP", "Computer Vision",
+]
+
+ROLES = [
+    "Data Scientist", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+    "Data Engineer", "Machine Learning Engineer", "Project Manager", "QA Engineer",
+    "Full Stack Developer", "Business Analyst",
+]
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+FILLER = [
+    "Delivered projects on time in cross-functional teams.",
+    "Mentored junior colleagues and led code reviews.",
+    "Improved system performance and reduced operating costs.",
+    "Collaborated with stakeholders to gather requirements.",
+    "Wrote technical documentation and internal training material.",
+    "Designed and maintained automated test suites.",
+]
+
+
+def make_resume(rng: random.Random, n_jobs: int = 4) -> str:
+    """One resume: summary, experience entries, skills and education."""
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(5, 12))
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        f"{role} with {rng.randint(1, 15)} years of experience.",
+        "EXPERIENCE",
+    ]
+    for _ in range(n_jobs):
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({rng.randint(2008, 2025)})")
+        lines.append(f"Worked with {', '.join(rng.sample(skills, min(3, len(skills))))}.")
+        lines.extend(rng.sample(FILLER, 2))
+    lines.append("SKILLS")
+    lines.append(", ".join(skills))
+    lines.append("EDUCATION")
+    lines.append(f"MSc in {rng.choice(['Computer Science', 'Statistics', 'Engineering', 'Management'])}")
+    return "\n".join(lines)
+
+
+def make_resumes(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [make_resume(rng) for _ in range(n)]
+
+
+def make_job_descriptions(n: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        f"We are looking for a {rng.choice(ROLES)} with experience in "
+        f"{', '.join(rng.sample(SKILLS, 4))} and {rng.randint(2, 8)} years of experience."
+        for _ in range(n)
+    ]
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text: str, lines_per_page: int = 45) -> bytes:
+    """Render text as a minimal PDF, one line per text row."""
+    lines = text.encode("latin-1", "replace").decode("latin-1").split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+
+    n_pages = len(pages)
+    # Object layout: 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [{}] /Count {} >>".format(
+            " ".join(f"{4 + 2 * i} 0 R" for i in range(n_pages)), n_pages
+        ),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, page_lines in enumerate(pages):
+        stream = "BT /F1 10 Tf 50 760 Td 14 TL " + " ".join(f"({_escape(line)}) '" for line in page_lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {5 + 2 * i} 0 R /Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def write_pdfs(texts: List[str], folder: str) -> List[str]:
+    """Write one PDF per text (reusing files from a previous run) and return their paths."""
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for i, text in enumerate(texts):
+        path = os.path.join(folder, f"resume_{i:06d}.pdf")
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(pdf_bytes(text))
+        paths.append(path)
+    return paths
@@ -15,6 +15,15 @@ class ModelConfig:
     name: str = "all-MiniLM-L6-v2"
     cache_dir: Optional[str] = None
     device: str = "cpu"  # or "cuda" if GPU available
+    pooling: str = "none"  # "none" (whole resume), "mean", "max" or "top" chunk
+    chunk_overlap: int = 32  # tokens shared by consecutive resume chunks
+    backend: str = "torch"  # "torch", "torch-int8" (dynamic quantization) or "onnx"
+    warmup: bool = True  # run one encode right after loading
+    workers: int = 1  # embedding processes on CPU: 1 = in-process only, 0 = one per 4 cores
+    threads_per_worker: int = 0  # intra-op threads per worker, 0 = cores / workers
+    pool_min_texts: int = 256  # smaller batches are encoded in-process
+    batch_tokens: int = 8192  # adaptive batch size: ~tokens per forward pass
+    max_batch_size: int = 128
 
 
 @dataclass
@@ -26,6 +35,14 @@ class OllamaConfig:
     temperature: float = 0.7
     context_window: int = 4096
     max_resume_chars: int = 4000
+    max_retries: int = 2
+    retry_backoff: float = 0.5  # seconds, doubled after each failed attempt
+    concurrency: int = 3  # parallel requests for batch explanations
+    deterministic: bool = False  # temperature 0 + fixed seed, stable cached answers
+    seed: int = 42
+    keep_alive: str = "30m"  # how long Ollama keeps the model (and prompt cache) loaded
+    resume_token_budget: int = 768  # estimated resume tokens per prompt, 0 = no condensation
+    passage_tokens: int = 64  # size of the resume passages condensation chooses from
 
 
 @dataclass
@@ -38,6 +55,103 @@ class AppConfig:
     ai_analysis_top_n: int = 3
     grid_columns: int = 3
     results_limit_options: List[int] = field(default_factory=lambda: [5, 10, 25, 50])
+    ranking_contexts: int = 32  # sessions whose parsed + embedded uploads are kept for re-ranking
+    ranking_context_idle_minutes: float = 30  # idle sessions lose their ranking context after this
+
+
+@dataclass
+class ParserConfig:
+    """Configuration for PDF text extraction."""
+    workers: int = 0  # 0 = one worker per CPU core
+    file_timeout: float = 30.0  # seconds per PDF, 0 disables the limit
+    parallel_min_files: int = 8  # smaller batches are parsed serially
+    stream_batch_size: int = 256  # PDFs parsed and embedded per batch by streaming ingestion
+
+
+@dataclass
+class IndexConfig:
+    """Configuration for the candidate vector index."""
+    backend: str = "flat"  # "flat" (exact) or "ivf" (approximate)
+    nlist: int = 0  # IVF clusters, 0 = sqrt(number of vectors)
+    nprobe: int = 32  # IVF clusters scanned per query (recall vs speed)
+    quantization: str = "float16"  # QuantizedStore encoding: "float32", "float16" or "int8"
+
+
+@dataclass
+class RetrievalConfig:
+    """Configuration for hybrid lexical + semantic ranking."""
+    mode: str = "semantic"  # "semantic", "prefilter" (BM25 then embeddings) or "fused" (RRF)
+    prefilter_candidates: int = 200  # BM25 survivors scored by the embedding model
+    rrf_k: int = 60  # reciprocal rank fusion damping constant
+    bm25_k1: float = 1.5
+    bm25_b: float = 0.75
+
+
+@dataclass
+class RerankerConfig:
+    """Configuration for the cross-encoder re-ranking stage."""
+    enabled: bool = False
+    model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    top_n: int = 20  # shortlist re-scored per ranking, bounds the CPU cost
+    batch_size: int = 16
+    weight: float = 0.5  # cross-encoder share of the blended score
+    sigmoid: bool = True  # squash raw logits to 0..1 (ms-marco models output logits)
+    max_length: int = 512  # tokens per (job, resume) pair
+
+
+@dataclass
+class StoreConfig:
+    """Configuration for the persistent candidate database."""
+    dir: str = "data/candidates"
+    compact_ratio: float = 0.25  # dead share of the embedding matrix that triggers compaction
+
+
+@dataclass
+class DedupConfig:
+    """Configuration for duplicate / near-duplicate resume detection."""
+    enabled: bool = True
+    jaccard_threshold: float = 0.7  # estimated shingle overlap of near-duplicate candidates
+    embedding_threshold: float = 0.95  # cosine the candidates must reach to be merged, 0 = no check
+    num_perm: int = 64  # MinHash signature length
+    bands: int = 16  # LSH bands (must divide num_perm)
+    shingle_size: int = 4  # words per shingle
+
+
+@dataclass
+class SkillsConfig:
+    """Configuration for skill / experience extraction and filtering."""
+    enabled: bool = True  # tag resumes at ingest
+    taxonomy_file: str = ""  # JSON {skill: [aliases] or {"aliases": [...], "match_name": false}}, empty = built-in
+    boost: float = 0.1  # score added for mentioning every preferred skill
+
+
+@dataclass
+class ServerConfig:
+    """Configuration for the headless HTTP ranking service."""
+    host: str = "127.0.0.1"
+    port: int = 8080
+    max_inflight: int = 64  # concurrent requests before answering 503
+    batch_max_size: int = 64  # texts per coalesced encode call
+    batch_max_wait_ms: float = 5.0  # how long the first request waits for company
+    batch_max_queue: int = 1024  # texts waiting to be encoded before answering 503
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for persistent on-disk caches."""
+    enabled: bool = True
+    dir: str = ".cache"
+    embedding_max_entries: int = 50000
+    explanation_ttl_hours: float = 24 * 7
+    explanation_max_entries: int = 5000
+
+
+@dataclass
+class MetricsConfig:
+    """Configuration for hot-path instrumentation."""
+    enabled: bool = False
+    json_log: str = "logs/metrics.jsonl"  # empty = no JSON span log
+    prometheus_file: str = ""  # e.g. "logs/metrics.prom", empty = disabled
 
 
 @dataclass
@@ -46,6 +160,16 @@ class Config:
     model: ModelConfig
     ollama: OllamaConfig
     app: AppConfig
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    parser: ParserConfig = field(default_factory=ParserConfig)
+    index: IndexConfig = field(default_factory=IndexConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    retrieval: RetrievalConfig = field(default_factory=RetrievalConfig)
+    reranker: RerankerConfig = field(default_factory=RerankerConfig)
+    store: StoreConfig = field(default_factory=StoreConfig)
+    server: ServerConfig = field(default_factory=ServerConfig)
+    dedup: DedupConfig = field(default_factory=DedupConfig)
+    skills: SkillsConfig = field(default_factory=SkillsConfig)
 
     @classmethod
     def from_env(cls):
@@ -59,7 +183,16 @@ class Config:
             model=ModelConfig(
                 name=os.getenv("MODEL_NAME", "all-MiniLM-L6-v2"),
                 cache_dir=os.getenv("MODEL_CACHE_DIR"),
-                device=os.getenv("MODEL_DEVICE", "cpu")
+                device=os.getenv("MODEL_DEVICE", "cpu"),
+                pooling=os.getenv("MODEL_POOLING", "none"),
+                chunk_overlap=int(os.getenv("CHUNK_OVERLAP", "32")),
+                backend=os.getenv("MODEL_BACKEND", "torch"),
+                warmup=os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes"),
+                workers=int(os.getenv("MODEL_WORKERS", "1")),
+                threads_per_worker=int(os.getenv("MODEL_THREADS_PER_WORKER", "0")),
+                pool_min_texts=int(os.getenv("MODEL_POOL_MIN_TEXTS", "256")),
+                batch_tokens=int(os.getenv("MODEL_BATCH_TOKENS", "8192")),
+                max_batch_size=int(os.getenv("MODEL_MAX_BATCH_SIZE", "128"))
             ),
             ollama=OllamaConfig(
                 base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
@@ -67,14 +200,89 @@ class Config:
                 timeout=int(os.getenv("OLLAMA_TIMEOUT", "30")),
                 temperature=float(os.getenv("OLLAMA_TEMPERATURE", "0.7")),
                 context_window=int(os.getenv("OLLAMA_CONTEXT", "4096")),
-                max_resume_chars=int(os.getenv("MAX_RESUME_CHARS", "4000"))
+                max_resume_chars=int(os.getenv("MAX_RESUME_CHARS", "4000")),
+                max_retries=int(os.getenv("OLLAMA_MAX_RETRIES", "2")),
+                retry_backoff=float(os.getenv("OLLAMA_RETRY_BACKOFF", "0.5")),
+                concurrency=int(os.getenv("OLLAMA_CONCURRENCY", "3")),
+                deterministic=os.getenv("OLLAMA_DETERMINISTIC", "false").lower() in ("1", "true", "yes"),
+                seed=int(os.getenv("OLLAMA_SEED", "42")),
+                keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+                resume_token_budget=int(os.getenv("OLLAMA_RESUME_TOKEN_BUDGET", "768")),
+                passage_tokens=int(os.getenv("OLLAMA_PASSAGE_TOKENS", "64"))
             ),
             app=AppConfig(
                 upload_dir=os.getenv("UPLOAD_DIR", "uploads"),
                 max_file_size_mb=int(os.getenv("MAX_FILE_SIZE_MB", "10")),
                 default_top_n=int(os.getenv("DEFAULT_TOP_N", "10")),
                 ai_analysis_top_n=int(os.getenv("AI_ANALYSIS_TOP_N", "3")),
-                grid_columns=int(os.getenv("GRID_COLUMNS", "3"))
+                grid_columns=int(os.getenv("GRID_COLUMNS", "3")),
+                ranking_contexts=int(os.getenv("RANKING_CONTEXTS", "32")),
+                ranking_context_idle_minutes=float(os.getenv("RANKING_CONTEXT_IDLE_MINUTES", "30"))
+            ),
+            cache=CacheConfig(
+                enabled=os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+                dir=os.getenv("CACHE_DIR", ".cache"),
+                embedding_max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000")),
+                explanation_ttl_hours=float(os.getenv("EXPLANATION_CACHE_TTL_HOURS", "168")),
+                explanation_max_entries=int(os.getenv("EXPLANATION_CACHE_MAX_ENTRIES", "5000"))
+            ),
+            parser=ParserConfig(
+                workers=int(os.getenv("PARSER_WORKERS", "0")),
+                file_timeout=float(os.getenv("PARSER_FILE_TIMEOUT", "30")),
+                parallel_min_files=int(os.getenv("PARSER_PARALLEL_MIN_FILES", "8")),
+                stream_batch_size=int(os.getenv("PARSER_STREAM_BATCH_SIZE", "256"))
+            ),
+            index=IndexConfig(
+                backend=os.getenv("INDEX_BACKEND", "flat"),
+                nlist=int(os.getenv("INDEX_NLIST", "0")),
+                nprobe=int(os.getenv("INDEX_NPROBE", "32")),
+                quantization=os.getenv("INDEX_QUANTIZATION", "float16")
+            ),
+            metrics=MetricsConfig(
+                enabled=os.getenv("METRICS_ENABLED", "false").lower() in ("1", "true", "yes"),
+                json_log=os.getenv("METRICS_JSON_LOG", "logs/metrics.jsonl"),
+                prometheus_file=os.getenv("METRICS_PROMETHEUS_FILE", "")
+            ),
+            retrieval=RetrievalConfig(
+                mode=os.getenv("RETRIEVAL_MODE", "semantic"),
+                prefilter_candidates=int(os.getenv("RETRIEVAL_PREFILTER_CANDIDATES", "200")),
+                rrf_k=int(os.getenv("RETRIEVAL_RRF_K", "60")),
+                bm25_k1=float(os.getenv("BM25_K1", "1.5")),
+                bm25_b=float(os.getenv("BM25_B", "0.75"))
+            ),
+            reranker=RerankerConfig(
+                enabled=os.getenv("RERANKER_ENABLED", "false").lower() in ("1", "true", "yes"),
+                model_name=os.getenv("RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+                top_n=int(os.getenv("RERANKER_TOP_N", "20")),
+                batch_size=int(os.getenv("RERANKER_BATCH_SIZE", "16")),
+                weight=float(os.getenv("RERANKER_WEIGHT", "0.5")),
+                sigmoid=os.getenv("RERANKER_SIGMOID", "true").lower() in ("1", "true", "yes"),
+                max_length=int(os.getenv("RERANKER_MAX_LENGTH", "512"))
+            ),
+            store=StoreConfig(
+                dir=os.getenv("CANDIDATE_STORE_DIR", "data/candidates"),
+                compact_ratio=float(os.getenv("CANDIDATE_STORE_COMPACT_RATIO", "0.25"))
+            ),
+            server=ServerConfig(
+                host=os.getenv("SERVER_HOST", "127.0.0.1"),
+                port=int(os.getenv("SERVER_PORT", "8080")),
+                max_inflight=int(os.getenv("SERVER_MAX_INFLIGHT", "64")),
+                batch_max_size=int(os.getenv("SERVER_BATCH_MAX_SIZE", "64")),
+                batch_max_wait_ms=float(os.getenv("SERVER_BATCH_MAX_WAIT_MS", "5")),
+                batch_max_queue=int(os.getenv("SERVER_BATCH_MAX_QUEUE", "1024"))
+            ),
+            dedup=DedupConfig(
+                enabled=os.getenv("DEDUP_ENABLED", "true").lower() in ("1", "true", "yes"),
+                jaccard_threshold=float(os.getenv("DEDUP_JACCARD_THRESHOLD", "0.7")),
+                embedding_threshold=float(os.getenv("DEDUP_EMBEDDING_THRESHOLD", "0.95")),
+                num_perm=int(os.getenv("DEDUP_NUM_PERM", "64")),
+                bands=int(os.getenv("DEDUP_BANDS", "16")),
+                shingle_size=int(os.getenv("DEDUP_SHINGLE_SIZE", "4"))
+            ),
+            skills=SkillsConfig(
+                enabled=os.getenv("SKILLS_ENABLED", "true").lower() in ("1", "true", "yes"),
+                taxonomy_file=os.getenv("SKILLS_TAXONOMY_FILE", ""),
+                boost=float(os.getenv("SKILLS_BOOST", "0.1"))
             )
         )
 
@@ -0,0 +1,241 @@
+"""
+BM25 inverted index over resume text.
+
+Embedding similarity is good at "this profile looks like the job" but weak
+on hard requirements such as "Kubernetes" or "SQL". BM25Index scores exact
+term matches and is used by rank_resumes in two ways:
+
+- prefilter: lexical candidate generation, then the embedding model only
+  scores (and encodes) the survivors
+- fused: reciprocal rank fusion of the BM25 and embedding rankings
+
+The index is maintained incrementally: add() appends postings, re-adding
+an id replaces its document, and remove() marks rows dead until enough of
+them accumulate to compact the postings. Document frequencies and the
+average length are taken from the live documents at query time, so adds
+never require a rebuild.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.vector_index import top_k_indices
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+# Keeps technology names intact: c++, c#, node.js, ci/cd, scikit-learn
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./\-][a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or that the this to was were will with
+we you your our their they he she his her its who which what looking experience years year
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase terms of a text, without stopwords.
+
+    Args:
+        text: Resume or job description text
+
+    Returns:
+        List of terms in order of appearance
+    """
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Incrementally maintained Okapi BM25 index.
+
+    Args:
+        k1: Term frequency saturation (defaults to config, 1.5)
+        b: Document length normalization (defaults to config, 0.75)
+    """
+
+    # Compact the postings once this fraction of the rows is dead
+    COMPACT_RATIO = 0.5
+
+    def __init__(self, k1: Optional[float] = None, b: Optional[float] = None):
+        retrieval = config.retrieval if config else None
+        self.k1 = k1 if k1 is not None else (retrieval.bm25_k1 if retrieval else 1.5)
+        self.b = b if b is not None else (retrieval.bm25_b if retrieval else 0.75)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._lengths: List[int] = []
+        self._alive: List[bool] = []
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        # term -> (rows, term frequencies) as arrays, rebuilt when the term changes
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._total_length = 0
+        # (alive mask, document lengths) as arrays, rebuilt after mutations
+        self._doc_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return [doc_id for doc_id in self._ids if doc_id is not None]
+
+    def add(self, doc_ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Index documents; an id that is already indexed is replaced.
+
+        Args:
+            doc_ids: Unique identifiers (e.g. resume filenames)
+            texts: Document texts aligned with ``doc_ids``
+        """
+        if len(doc_ids) != len(texts):
+            raise ValueError("doc_ids and texts must have the same length")
+        self.remove([doc_id for doc_id in doc_ids if doc_id in self._rows])
+        self._doc_arrays = None
+
+        for doc_id, text in zip(doc_ids, texts):
+            if doc_id in self._rows:
+                # Repeated within this batch: the last text wins
+                self.remove([doc_id])
+            terms = tokenize(text)
+            row = len(self._ids)
+            self._ids.append(doc_id)
+            self._rows[doc_id] = row
+            self._lengths.append(len(terms))
+            self._alive.append(True)
+            self._total_length += len(terms)
+            for term, tf in Counter(terms).items():
+                rows, tfs = self._postings.setdefault(term, ([], []))
+                rows.append(row)
+                tfs.append(tf)
+                self._arrays.pop(term, None)
+
+    def remove(self, doc_ids: Sequence[str]) -> int:
+        """
+        Delete documents by id (unknown ids are ignored).
+
+        Returns:
+            Number of documents removed
+        """
+        removed = 0
+        for doc_id in doc_ids:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                continue
+            self._ids[row] = None
+            self._alive[row] = False
+            self._total_length -= self._lengths[row]
+            removed += 1
+        self._doc_arrays = None
+        if removed and len(self._ids) - len(self._rows) > self.COMPACT_RATIO * len(self._ids):
+            self._compact()
+        return removed
+
+    def _compact(self) -> None:
+        """Drop dead rows and renumber the survivors."""
+        new_rows = np.cumsum(self._alive) - 1
+        alive = np.asarray(self._alive, dtype=bool)
+        postings = {}
+        for term, (rows, tfs) in self._postings.items():
+            rows = np.asarray(rows)
+            keep = alive[rows]
+            if keep.any():
+                postings[term] = (new_rows[rows[keep]].tolist(), np.asarray(tfs)[keep].tolist())
+        self._postings = postings
+        self._arrays = {}
+        self._ids = [doc_id for doc_id in self._ids if doc_id is not None]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._lengths = [length for length, keep in zip(self._lengths, alive) if keep]
+        self._alive = [True] * len(self._ids)
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            arrays = (np.asarray(postings[0], dtype=np.intp), np.asarray(postings[1], dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every row for a query.
+
+        Args:
+            query: Free text, e.g. a job description
+
+        Returns:
+            1D float32 array indexed by row (see row_of); dead rows score 0
+        """
+        n_rows = len(self._ids)
+        scores = np.zeros(n_rows, dtype=np.float32)
+        n_docs = len(self._rows)
+        if not n_docs:
+            return scores
+
+        if self._doc_arrays is None:
+            self._doc_arrays = (np.asarray(self._alive, dtype=bool), np.asarray(self._lengths, dtype=np.float32))
+        alive, lengths = self._doc_arrays
+        average_length = self._total_length / n_docs or 1.0
+        norms = self.k1 * (1 - self.b + self.b * lengths / average_length)
+
+        for term, query_tf in Counter(tokenize(query)).items():
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            rows, tfs = arrays
+            live = alive[rows]
+            df = int(live.sum())
+            if not df:
+                continue
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            rows, tfs = rows[live], tfs[live]
+            scores[rows] += query_tf * idf * tfs * (self.k1 + 1) / (tfs + norms[rows])
+        return scores
+
+    def row_of(self, doc_id: str) -> Optional[int]:
+        """Row of a document in the arrays returned by scores()."""
+        return self._rows.get(doc_id)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k documents for a query.
+
+        Returns:
+            List of (id, BM25 score) pairs with a positive score, best first
+        """
+        scores = self.scores(query)
+        return [(self._ids[i], float(scores[i])) for i in top_k_indices(scores, k) if scores[i] > 0]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[np.ndarray], size: int, k: int = 60) -> np.ndarray:
+    """
+    Fuse several rankings: each item scores sum(1 / (k + rank)).
+
+    Args:
+        rankings: Arrays of item indices, best first (items may be missing
+            from a ranking, they then get nothing from it)
+        size: Number of items
+        k: Damping constant (60 in the original paper)
+
+    Returns:
+        1D float array of fused scores indexed by item
+    """
+    fused = np.zeros(size, dtype=np.float64)
+    for ranking in rankings:
+        ranking = np.asarray(ranking, dtype=np.intp)
+        fused[ranking] += 1.0 / (k + np.arange(1, len(ranking) + 1))
+    return fused
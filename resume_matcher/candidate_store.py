@@ -0,0 +1,756 @@
+"""
+Persistent candidate database.
+
+Instead of re-uploading, re-writing and re-parsing every PDF for each
+search, resumes are ingested once into a CandidateStore:
+
+- SQLite (``candidates.sqlite3``) holds one row per candidate version:
+  name, file digest, zlib-compressed text, JSON metadata, the skill bitset
+  and years of experience extracted at ingest, and a tombstone flag
+- a QuantizedStore (``vectors/``) holds the normalized embeddings, keyed by
+  the SQLite row id
+
+A search is then one encode of the job description plus a scan of the
+embedding matrix, or, with INDEX_BACKEND=ivf, of the rows an in-memory
+IVFIndex shortlists (see vector_index; it keeps a float32 copy of the
+vectors and is rebuilt from the matrix on first search). Re-ingesting a name with different content is an update:
+the old row is tombstoned and a new one added. Deletes are tombstones too;
+once dead rows make up ``config.store.compact_ratio`` of the matrix the
+store is compacted (live vectors rewritten, dead rows purged).
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+from resume_matcher.quantized_store import QuantizedStore
+from resume_matcher.skills import SkillFilter, SkillIndex, extract_years, get_vocabulary
+from resume_matcher.text_cache import BytesLike, bytes_digest, file_digest
+from resume_matcher.vector_index import VectorIndex, create_index, top_k_indices
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+DB_FILE = "candidates.sqlite3"
+VECTORS_DIR = "vectors"
+
+# Vectors copied per step while compacting
+COMPACT_CHUNK_ROWS = 16384
+
+# Bound on "IN (?, ?, ...)" parameters (older SQLite builds allow 999)
+SQL_BATCH = 500
+
+# Columns added after the first release, created on open when missing
+SKILL_COLUMNS = (("skills", "BLOB"), ("years", "REAL"), ("skills_vocab", "TEXT"))
+
+
+def _batches(items: Sequence, size: int = SQL_BATCH) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _skill_row(text: str) -> Tuple[bytes, Optional[float], str]:
+    """Skill bitset, years of experience (None if unstated) and vocabulary digest of a text."""
+    vocabulary = get_vocabulary()
+    years = extract_years(text)
+    return vocabulary.extract(text).tobytes(), None if np.isnan(years) else years, vocabulary.digest
+
+
+@dataclass
+class IngestReport:
+    """Outcome of an ingest call, by candidate name."""
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    # New names folded into a duplicate candidate (listed in its 'aliases')
+    duplicates: List[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (f"{len(self.added)} added, {len(self.updated)} updated, "
+                f"{len(self.unchanged)} unchanged, {len(self.duplicates)} duplicates, {len(self.failed)} failed")
+
+
+class CandidateStore:
+    """
+    SQLite + embedding matrix store of ingested resumes.
+
+    Args:
+        directory: Store directory (defaults to config.store.dir)
+        compact_ratio: Share of dead vectors that triggers compaction
+            (defaults to config, 0 = only on explicit compact())
+        index_backend: "flat" scans every vector, "ivf" only the rows an
+            IVFIndex shortlists (defaults to config.index.backend)
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        compact_ratio: Optional[float] = None,
+        index_backend: Optional[str] = None
+    ):
+        self.directory = Path(directory or (config.store.dir if config else "data/candidates"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / DB_FILE
+        self.compact_ratio = compact_ratio if compact_ratio is not None else (
+            config.store.compact_ratio if config else 0.25
+        )
+        self._lock = threading.RLock()
+        self._vectors = QuantizedStore(str(self.directory / VECTORS_DIR))
+        self._live_mask: Optional[np.ndarray] = None
+        self._skills: Optional[SkillIndex] = None
+        self.index_backend = index_backend or (config.index.backend if config else "flat")
+        if self.index_backend not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index backend: {self.index_backend}")
+        # Approximate index over the live embedding rows, built on first
+        # search; _index_rows maps its rows to embedding matrix rows
+        self._index: Optional[VectorIndex] = None
+        self._index_rows = np.empty(0, dtype=np.intp)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS candidates ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL,"
+                " digest TEXT NOT NULL,"
+                " text BLOB NOT NULL,"
+                " metadata TEXT NOT NULL DEFAULT '{}',"
+                " deleted INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL"
+                ")"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(candidates)")}
+            for column, kind in SKILL_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE candidates ADD COLUMN {column} {kind}")
+            # At most one live version per name
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS candidates_live_name ON candidates (name) WHERE deleted = 0")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM candidates WHERE deleted = 0").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        return self._live_digests([name]).get(name) is not None
+
+    def names(self) -> List[str]:
+        """Names of the live candidates, alphabetically."""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT name FROM candidates WHERE deleted = 0 ORDER BY name")]
+
+    def get(self, name: str) -> Optional[Dict]:
+        """
+        Look up a live candidate.
+
+        Returns:
+            Dict with 'filename', 'content', 'digest', 'metadata' and
+            'aliases' (names folded into it at ingest), or None
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, name, digest, text, metadata FROM candidates WHERE name = ? AND deleted = 0", (name,)
+            ).fetchone()
+        return self._resume(row) if row else None
+
+    @staticmethod
+    def _resume(row: Tuple) -> Dict:
+        _, name, digest, text, metadata = row
+        metadata = json.loads(metadata)
+        return {
+            "filename": name,
+            "content": zlib.decompress(text).decode("utf-8"),
+            "digest": digest,
+            "metadata": metadata,
+            "aliases": metadata.get("aliases", []),
+        }
+
+    def _live_digests(self, names: Sequence[str]) -> Dict[str, str]:
+        digests = {}
+        with self._connect() as conn:
+            for batch in _batches(list(names)):
+                placeholders = ",".join("?" * len(batch))
+                digests.update(conn.execute(
+                    f"SELECT name, digest FROM candidates WHERE deleted = 0 AND name IN ({placeholders})", tuple(batch)
+                ).fetchall())
+        return digests
+
+    def _live_by_digest(self, digests: Sequence[str]) -> Dict[str, Tuple[int, str]]:
+        """Row id and metadata of the live candidates with these digests."""
+        rows = {}
+        with self._connect() as conn:
+            for batch in _batches(list(set(digests))):
+                placeholders = ",".join("?" * len(batch))
+                for digest, row_id, metadata in conn.execute(
+                    f"SELECT digest, id, metadata FROM candidates WHERE deleted = 0 AND digest IN ({placeholders})",
+                    tuple(batch)
+                ):
+                    rows.setdefault(digest, (row_id, metadata))
+        return rows
+
+    # --- Ingestion ---
+
+    def ingest_files(self, paths: Sequence[str]) -> IngestReport:
+        """
+        Ingest PDFs from disk; the file name is the candidate name.
+
+        Files whose content is already stored under their name are skipped
+        before parsing.
+        """
+        items = []
+        report = IngestReport()
+        for path in paths:
+            try:
+                items.append((os.path.basename(path), file_digest(path), path))
+            except OSError as e:
+                if logger:
+                    logger.error(f"Error reading {path}: {e}")
+                report.failed.append(os.path.basename(path))
+        return self._ingest(items, report)
+
+    def ingest_uploads(self, files: Sequence[Tuple[str, BytesLike]]) -> IngestReport:
+        """
+        Ingest uploaded PDFs given as (file name, content) pairs.
+
+        Only files that are new or changed are parsed, straight from memory
+        (see resume_parser.iter_uploaded_resumes).
+
+        Raises:
+            UploadTooLarge: If the files exceed config.app.max_file_size_mb in total
+        """
+        from resume_matcher.resume_parser import check_upload_size, iter_uploaded_resumes
+
+        check_upload_size(files)
+        # Last file wins when a name repeats
+        uploads = dict(files)
+        known = self._live_digests(list(uploads))
+        report = IngestReport()
+        to_parse = {}
+        for name, data in uploads.items():
+            digest = bytes_digest(data)
+            if known.get(name) == digest:
+                report.unchanged.append(name)
+            else:
+                to_parse[name] = (digest, memoryview(data).nbytes)
+        if config is None or config.dedup.enabled:
+            # Copies of stored candidates are neither parsed nor embedded
+            left = self._alias_stored({name: to_parse[name][0] for name in to_parse if name not in known}, report)
+            to_parse = {name: item for name, item in to_parse.items() if name in known or name in left}
+
+        records = []
+        with metrics.span("ingest_parse", files=len(to_parse)):
+            for resume in iter_uploaded_resumes([(name, uploads[name]) for name in to_parse]):
+                digest, size = to_parse.pop(resume["filename"])
+                metadata = {"source": "upload", "size": size, "chars": len(resume["content"])}
+                records.append({
+                    "name": resume["filename"], "digest": digest, "content": resume["content"], "metadata": metadata
+                })
+        report.failed.extend(to_parse)
+        return self._store(records, report)
+
+    def _ingest(
+        self,
+        items: List[Tuple[str, str, str]],
+        report: IngestReport,
+        source: Optional[str] = None
+    ) -> IngestReport:
+        # Imported here so the store can be opened (e.g. to list or delete
+        # candidates) without loading the parser and model stack
+        from resume_matcher.resume_parser import iter_resumes
+
+        known = self._live_digests([name for name, _, _ in items])
+        to_parse = {}
+        for name, digest, path in items:
+            if known.get(name) == digest:
+                report.unchanged.append(name)
+            else:
+                to_parse[path] = (name, digest)
+        if config is None or config.dedup.enabled:
+            # Copies of stored candidates are neither parsed nor embedded
+            left = self._alias_stored({name: digest for name, digest in to_parse.values() if name not in known}, report)
+            to_parse = {path: item for path, item in to_parse.items() if item[0] in known or item[0] in left}
+
+        records = []
+        with metrics.span("ingest_parse", files=len(to_parse)):
+            for resume in iter_resumes(list(to_parse)):
+                name, digest = to_parse.pop(resume["filename"])
+                metadata = {
+                    "source": source or resume["filename"],
+                    "size": os.path.getsize(resume["filename"]),
+                    "chars": len(resume["content"]),
+                }
+                records.append({"name": name, "digest": digest, "content": resume["content"], "metadata": metadata})
+        # Whatever iter_resumes did not yield had no readable text
+        report.failed.extend(name for name, _ in to_parse.values())
+        return self._store(records, report)
+
+    def _store(self, records: List[Dict], report: IngestReport) -> IngestReport:
+        """Upsert parsed records and merge the outcome into an ingest report."""
+        upserted = self.upsert(records)
+        report.added.extend(upserted.added)
+        report.updated.extend(upserted.updated)
+        report.unchanged.extend(upserted.unchanged)
+        report.duplicates.extend(upserted.duplicates)
+        if logger:
+            logger.info(f"Candidate store ingest: {report}")
+        return report
+
+    def upsert(self, records: Sequence[Dict]) -> IngestReport:
+        """
+        Add or update candidates from already extracted text.
+
+        Args:
+            records: Dicts with 'name' and 'content', optionally 'digest'
+                (defaults to a hash of the text) and 'metadata'
+
+        Returns:
+            IngestReport of added / updated / unchanged / duplicate names
+        """
+        from resume_matcher.matcher import get_embeddings
+
+        report = IngestReport()
+        # Last record wins when a name repeats
+        records = list({record["name"]: record for record in records}.values())
+        if not records:
+            return report
+
+        with self._lock:
+            known = self._live_digests([record["name"] for record in records])
+            changed = []
+            for record in records:
+                digest = record.get("digest") or bytes_digest(record["content"].encode("utf-8"))
+                if known.get(record["name"]) == digest:
+                    report.unchanged.append(record["name"])
+                else:
+                    changed.append(dict(record, digest=digest))
+            if changed and (config is None or config.dedup.enabled):
+                changed = self._fold_duplicates(changed, known, report)
+            if not changed:
+                return report
+
+            with metrics.span("ingest_embed", batch_size=len(changed)):
+                embeddings = get_embeddings([record["content"] for record in changed])
+            skills = [(None, None, None)] * len(changed)
+            if config is None or config.skills.enabled:
+                with metrics.span("skill_extract", resumes=len(changed)):
+                    skills = [_skill_row(record["content"]) for record in changed]
+
+            now = time.time()
+            # The SQLite transaction commits only once the vectors are
+            # stored; a crash in between leaves orphan vectors, which
+            # searches ignore and compaction drops
+            with self._connect() as conn:
+                ids = []
+                for record, (bits, years, vocab) in zip(changed, skills):
+                    if record["name"] in known:
+                        conn.execute(
+                            "UPDATE candidates SET deleted = 1, updated_at = ? WHERE name = ? AND deleted = 0",
+                            (now, record["name"])
+                        )
+                        report.updated.append(record["name"])
+                    else:
+                        report.added.append(record["name"])
+                    cursor = conn.execute(
+                        "INSERT INTO candidates"
+                        " (name, digest, text, metadata, skills, years, skills_vocab, created_at, updated_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            record["name"],
+                            record["digest"],
+                            zlib.compress(record["content"].encode("utf-8")),
+                            json.dumps(record.get("metadata") or {}),
+                            bits,
+                            years,
+                            vocab,
+                            now,
+                            now,
+                        )
+                    )
+                    ids.append(str(cursor.lastrowid))
+                start = len(self._vectors)
+                self._vectors.add(ids, embeddings)
+                if self._index is not None:
+                    self._index.add(ids, embeddings)
+                    self._index_rows = np.concatenate([self._index_rows, np.arange(start, len(self._vectors))])
+            self._live_mask = None
+            self._skills = None
+            if report.updated:
+                self._prune_index()
+
+        if report.updated:
+            self.maybe_compact()
+        return report
+
+    def _alias_stored(self, digests: Dict[str, str], report: IngestReport) -> Dict[str, str]:
+        """
+        Fold new names whose content is already stored under another name.
+
+        Args:
+            digests: Digest of each new name
+            report: Report the folded names are added to, as duplicates
+
+        Returns:
+            The names (and digests) left to store
+        """
+        stored = self._live_by_digest(list(digests.values()))
+        aliases: Dict[int, List[str]] = {}
+        left = {}
+        for name, digest in digests.items():
+            if digest in stored:
+                aliases.setdefault(stored[digest][0], []).append(name)
+                report.duplicates.append(name)
+            else:
+                left[name] = digest
+        if not aliases:
+            return left
+
+        metrics.incr("duplicate_resumes", sum(map(len, aliases.values())))
+        metadata = {row_id: json.loads(text) for row_id, text in stored.values()}
+        with self._lock, self._connect() as conn:
+            for row_id, names in aliases.items():
+                known = metadata[row_id].get("aliases", [])
+                merged = known + [name for name in names if name not in known]
+                conn.execute(
+                    "UPDATE candidates SET metadata = ? WHERE id = ?",
+                    (json.dumps(dict(metadata[row_id], aliases=merged)), row_id)
+                )
+        return left
+
+    def _fold_duplicates(self, records: List[Dict], known: Dict[str, str], report: IngestReport) -> List[Dict]:
+        """
+        Drop the new candidates that duplicate a live one or an earlier record.
+
+        Only new names are folded: an update keeps its name. Copies of
+        stored candidates are found by digest, duplicates within the batch
+        by a Deduplicator (exact and near, see resume_matcher.dedup). The
+        folded names are added to the survivor's metadata 'aliases'.
+
+        Returns:
+            The records left to store
+        """
+        from resume_matcher.dedup import Deduplicator
+
+        left = self._alias_stored(
+            {record["name"]: record["digest"] for record in records if record["name"] not in known}, report
+        )
+        deduplicator = Deduplicator()
+        kept = []
+        aliases: Dict[str, List[str]] = {}
+        for record in records:
+            if record["name"] in known:
+                kept.append(record)
+            elif record["name"] in left:
+                original = deduplicator.add(record["name"], record["content"], record["digest"])
+                if original is None:
+                    kept.append(record)
+                else:
+                    aliases.setdefault(original, []).append(record["name"])
+                    report.duplicates.append(record["name"])
+        if aliases:
+            metrics.incr("duplicate_resumes", sum(map(len, aliases.values())))
+        return [
+            dict(record, metadata=dict(record.get("metadata") or {}, aliases=aliases[record["name"]]))
+            if record["name"] in aliases else record
+            for record in kept
+        ]
+
+    # --- Deletion and compaction ---
+
+    def delete(self, names: Sequence[str]) -> int:
+        """
+        Tombstone candidates by name (unknown names are ignored).
+
+        Returns:
+            Number of candidates deleted
+        """
+        deleted = 0
+        now = time.time()
+        with self._lock:
+            with self._connect() as conn:
+                for batch in _batches(list(names)):
+                    placeholders = ",".join("?" * len(batch))
+                    deleted += conn.execute(
+                        f"UPDATE candidates SET deleted = 1, updated_at = ? WHERE deleted = 0 AND name IN ({placeholders})",
+                        (now, *batch)
+                    ).rowcount
+            self._live_mask = None
+            if deleted:
+                self._prune_index()
+        if deleted:
+            self.maybe_compact()
+        return deleted
+
+    def dead_ratio(self) -> float:
+        """Share of the embedding matrix taken by deleted or orphan vectors."""
+        total = len(self._vectors)
+        return 1.0 - int(self._mask().sum()) / total if total else 0.0
+
+    def maybe_compact(self) -> bool:
+        """Compact if the dead ratio exceeds compact_ratio; returns whether it did."""
+        if self.compact_ratio and self.dead_ratio() > self.compact_ratio:
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> int:
+        """
+        Rewrite the embedding matrix with live vectors only and purge dead rows.
+
+        Returns:
+            Number of vectors dropped
+        """
+        with self._lock:
+            mask = self._mask()
+            old_dir = self.directory / VECTORS_DIR
+            new_dir = self.directory / (VECTORS_DIR + ".new")
+            shutil.rmtree(new_dir, ignore_errors=True)
+
+            ids = self._vectors.ids
+            live_rows = np.flatnonzero(mask)
+            compacted = QuantizedStore(str(new_dir), dim=self._vectors.dim, dtype=self._vectors.dtype)
+            for start in range(0, len(live_rows), COMPACT_CHUNK_ROWS):
+                rows = live_rows[start:start + COMPACT_CHUNK_ROWS]
+                compacted.add([ids[row] for row in rows], self._vectors.vectors(rows))
+
+            # Swap directories, then purge the rows whose vectors are gone
+            trash_dir = self.directory / (VECTORS_DIR + ".old")
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            if old_dir.exists():
+                os.replace(old_dir, trash_dir)
+            if new_dir.exists():
+                os.replace(new_dir, old_dir)
+            shutil.rmtree(trash_dir, ignore_errors=True)
+            with self._connect() as conn:
+                conn.execute("DELETE FROM candidates WHERE deleted = 1")
+
+            self._vectors = QuantizedStore(str(old_dir))
+            self._live_mask = None
+            self._skills = None
+            self._index = None
+            dropped = len(ids) - len(live_rows)
+
+        if logger:
+            logger.info(f"Compacted candidate store: {dropped} dead vectors dropped, {len(live_rows)} kept")
+        return dropped
+
+    def _mask(self) -> np.ndarray:
+        """Boolean mask over the embedding rows of the live candidates."""
+        if self._live_mask is None:
+            with self._connect() as conn:
+                live = {str(row[0]) for row in conn.execute("SELECT id FROM candidates WHERE deleted = 0")}
+            self._live_mask = np.fromiter((item_id in live for item_id in self._vectors.ids), dtype=bool,
+                                          count=len(self._vectors))
+        return self._live_mask
+
+    def _skill_index(self) -> SkillIndex:
+        """
+        Skill bitsets aligned with the embedding rows (empty for dead rows).
+
+        Loaded from SQLite once; rows tagged before skills were stored, or
+        with another vocabulary, are extracted again and written back.
+        """
+        if self._skills is None:
+            vocabulary = get_vocabulary()
+            bits = np.zeros((len(self._vectors), vocabulary.n_words), dtype=np.uint64)
+            years = np.full(len(self._vectors), np.nan, dtype=np.float32)
+            row_of = {item_id: row for row, item_id in enumerate(self._vectors.ids)}
+            stale = []
+            with self._connect() as conn:
+                for item_id, skills, stated, vocab in conn.execute(
+                    "SELECT id, skills, years, skills_vocab FROM candidates WHERE deleted = 0"
+                ):
+                    row = row_of.get(str(item_id))
+                    if row is None:
+                        continue
+                    if vocab != vocabulary.digest:
+                        stale.append(item_id)
+                        continue
+                    bits[row] = np.frombuffer(skills, dtype=np.uint64)
+                    years[row] = np.nan if stated is None else stated
+
+                with metrics.span("skill_extract", resumes=len(stale)):
+                    for batch in _batches(stale):
+                        placeholders = ",".join("?" * len(batch))
+                        for item_id, text in conn.execute(
+                            f"SELECT id, text FROM candidates WHERE id IN ({placeholders})", tuple(batch)
+                        ).fetchall():
+                            skills, stated, vocab = _skill_row(zlib.decompress(text).decode("utf-8"))
+                            conn.execute(
+                                "UPDATE candidates SET skills = ?, years = ?, skills_vocab = ? WHERE id = ?",
+                                (skills, stated, vocab, item_id)
+                            )
+                            row = row_of[str(item_id)]
+                            bits[row] = np.frombuffer(skills, dtype=np.uint64)
+                            years[row] = np.nan if stated is None else stated
+            if stale and logger:
+                logger.info(f"Extracted the skills of {len(stale)} stored candidates")
+            self._skills = SkillIndex(bits, years, vocabulary)
+        return self._skills
+
+    def _ann_index(self) -> VectorIndex:
+        """
+        IVF index over the live embedding rows.
+
+        Tombstoned vectors are left out of the build and pruned on delete,
+        so they neither fill the probed lists nor skew the centroids when
+        the index retrains. Compaction renumbers the rows and drops the index.
+        """
+        if self._index is None:
+            rows = np.flatnonzero(self._mask())
+            ids = self._vectors.ids
+            with metrics.span("index_build", resumes=len(rows)):
+                self._index = create_index(self._vectors.dim, "ivf").build(
+                    [ids[row] for row in rows], self._vectors.vectors(rows)
+                )
+            self._index_rows = rows
+        return self._index
+
+    def _prune_index(self) -> None:
+        """Remove newly tombstoned vectors from the IVF index, if built."""
+        if self._index is None:
+            return
+        live = self._mask()[self._index_rows]
+        if live.all():
+            return
+        index_ids = self._index.ids
+        self._index.remove([item_id for item_id, keep in zip(index_ids, live) if not keep])
+        self._index_rows = self._index_rows[live]
+
+    # --- Search ---
+
+    def search(
+        self,
+        job_description: str,
+        top_k: Optional[int] = 10,
+        rerank: Optional[bool] = None,
+        job_embedding: Optional[np.ndarray] = None,
+        skill_filter: Optional[SkillFilter] = None
+    ) -> list:
+        """
+        Rank the stored candidates against a job description.
+
+        Costs one encode of the job description plus a scan of the
+        embedding matrix (or of the IVF shortlist, falling back to the full
+        scan when it holds fewer than the wanted live candidates); nothing
+        is parsed or re-embedded.
+
+        Args:
+            job_description: The job posting text
+            top_k: Number of results (None = all live candidates)
+            rerank: Re-order the shortlist with the cross-encoder (defaults
+                to config.reranker.enabled)
+            job_embedding: Embedding of the job description, when the caller
+                already has it (e.g. from a MicroBatcher)
+            skill_filter: Required / preferred skills and minimum experience,
+                checked against the skills extracted at ingest
+
+        Returns:
+            List of RankedResume (dict-like with 'filename', 'score' and
+            'content'), best first; 'index' is the embedding row
+
+        Raises:
+            ValueError: If a filter skill is not in the skill vocabulary
+        """
+        from resume_matcher import reranker
+        from resume_matcher.matcher import RankedResume, get_model
+
+        with self._lock:
+            mask = self._mask()
+            boosts = None
+            if skill_filter:
+                skills = self._skill_index()
+                with metrics.span("skill_filter", resumes=len(mask)):
+                    mask = mask & skills.mask(skill_filter)
+                    boosts = skills.boosts(skill_filter)
+            n_live = int(mask.sum())
+            if not n_live:
+                return []
+            if job_embedding is None:
+                with metrics.span("encode", batch_size=1):
+                    job_embedding = get_model().encode([job_description])
+            job_embedding = np.asarray(job_embedding, dtype=np.float32).reshape(1, -1)
+
+            if rerank is None:
+                rerank = config.reranker.enabled if config else False
+            k = n_live if top_k is None else min(top_k, n_live)
+            if rerank:
+                k = max(k, min(config.reranker.top_n if config else 20, n_live))
+
+            scores = None
+            if self.index_backend == "ivf":
+                with metrics.span("score", resumes=len(mask), backend="ivf"):
+                    rows, probed = self._ann_index().scan(job_embedding)
+                    rows = self._index_rows[rows]
+                    # The skill filter can still rule out indexed rows
+                    live = mask[rows]
+                    if int(live.sum()) >= k:
+                        scores = np.full(len(mask), -np.inf, dtype=np.float32)
+                        scores[rows[live]] = probed[live]
+            if scores is None:
+                with metrics.span("score", resumes=len(mask)):
+                    scores = self._vectors.scores(job_embedding)[0]
+                scores[~mask] = -np.inf
+            if boosts is not None:
+                scores += boosts
+
+            with metrics.span("sort", resumes=n_live):
+                best = top_k_indices(scores, k)
+            ids = self._vectors.ids
+            best_ids = [int(ids[row]) for row in best]
+
+        by_id = {}
+        with self._connect() as conn:
+            for batch in _batches(best_ids):
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT id, name, digest, text, metadata FROM candidates WHERE id IN ({placeholders})",
+                    tuple(batch)
+                ).fetchall()
+                by_id.update((row[0], self._resume(row)) for row in rows)
+        results = [
+            RankedResume(by_id[item_id], int(row), float(scores[row]))
+            for item_id, row in zip(best_ids, best) if item_id in by_id
+        ]
+
+        if rerank:
+            results = reranker.rerank(job_description, results)
+            if top_k is not None:
+                results = results[:top_k]
+        return results
+
+    def stats(self) -> Dict:
+        """Live candidates, stored vectors and dead ratio."""
+        return {
+            "candidates": len(self),
+            "vectors": len(self._vectors),
+            "dead_ratio": self.dead_ratio(),
+            "dtype": self._vectors.dtype,
+            "index": self.index_backend,
+        }
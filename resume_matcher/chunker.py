@@ -0,0 +1,217 @@
+"""
+Token-bounded chunking of long resumes and pooling of chunk embeddings.
+
+Sentence-transformer models silently truncate their input (256 tokens for
+all-MiniLM-L6-v2), so most of a multi-page CV never reaches the model.
+Resumes are split into overlapping windows that fit the model, every chunk
+is embedded, and chunk scores are pooled back into one score per resume:
+
+- "mean": cosine with the mean of the resume's chunk vectors
+- "max": cosine with the element-wise max of the chunk vectors
+- "top": score of the resume's best matching chunk
+
+ChunkedEmbeddings keeps the chunk texts and vectors so the best matching
+section of a resume can be shown later without re-encoding.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.vector_index import normalize
+
+
+POOLING_METHODS = ("mean", "max", "top")
+
+_WORD_RE = re.compile(r"\S+")
+
+
+def _token_offsets(text: str, tokenizer=None) -> List[Tuple[int, int]]:
+    """Character span of every token, falling back to whitespace words."""
+    if tokenizer is not None:
+        try:
+            encoding = tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                verbose=False
+            )
+            return [tuple(span) for span in encoding["offset_mapping"]]
+        except (TypeError, KeyError, NotImplementedError, ValueError):
+            # Slow tokenizers do not report offsets
+            pass
+    return [(m.start(), m.end()) for m in _WORD_RE.finditer(text)]
+
+
+def chunk_text(
+    text: str,
+    tokenizer=None,
+    max_tokens: int = 254,
+    overlap: int = 32
+) -> List[Tuple[int, int]]:
+    """
+    Split a text into overlapping windows of at most ``max_tokens`` tokens.
+
+    Args:
+        text: Text to split
+        tokenizer: HuggingFace tokenizer of the embedding model (None = words)
+        max_tokens: Window size in tokens, excluding special tokens
+        overlap: Tokens shared by consecutive windows
+
+    Returns:
+        List of (start, end) character spans into ``text``
+    """
+    offsets = _token_offsets(text, tokenizer)
+    if not offsets:
+        return []
+
+    # Cap the overlap so windows always advance by at least half their size
+    step = max(1, max_tokens - min(overlap, max_tokens // 2))
+    spans = []
+    for start in range(0, len(offsets), step):
+        window = offsets[start:start + max_tokens]
+        spans.append((window[0][0], window[-1][1]))
+        if start + max_tokens >= len(offsets):
+            break
+    return spans
+
+
+@dataclass
+class ChunkedEmbeddings:
+    """
+    Normalized chunk embeddings of a set of documents.
+
+    Attributes:
+        chunks: Text of every chunk
+        owners: Index of the document each chunk belongs to (non-decreasing)
+        vectors: L2-normalized chunk embeddings, one row per chunk
+        n_documents: Number of documents, including ones without any chunk
+    """
+    chunks: List[str]
+    owners: np.ndarray
+    vectors: np.ndarray
+    n_documents: int
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["ChunkedEmbeddings"]) -> "ChunkedEmbeddings":
+        """Chunk embeddings of consecutive document batches, as one set."""
+        chunks, owners, vectors, offset = [], [], [], 0
+        for part in parts:
+            chunks.extend(part.chunks)
+            owners.append(np.asarray(part.owners, dtype=np.int64) + offset)
+            if len(part.chunks):
+                vectors.append(part.vectors)
+            offset += part.n_documents
+        return cls(
+            chunks,
+            np.concatenate(owners) if owners else np.empty(0, dtype=np.int64),
+            np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32),
+            offset
+        )
+
+    def pooled(self, method: str = "mean") -> np.ndarray:
+        """
+        One normalized vector per document ("mean" or "max" pooling).
+
+        Documents without chunks get a zero vector.
+        """
+        if method not in ("mean", "max"):
+            raise ValueError(f"Cannot pool chunk vectors with method {method!r}")
+
+        dim = self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+        pooled = np.zeros((self.n_documents, dim), dtype=np.float32)
+        if method == "mean":
+            np.add.at(pooled, self.owners, self.vectors)
+        else:
+            pooled.fill(-np.inf)
+            np.maximum.at(pooled, self.owners, self.vectors)
+            pooled[~np.isfinite(pooled)] = 0.0
+        return normalize(pooled)
+
+    def score_matrix(self, queries: np.ndarray, method: str = "top") -> np.ndarray:
+        """
+        Cosine scores of every document for a batch of query embeddings.
+
+        Args:
+            queries: 2D array of query embeddings (normalized internally)
+            method: Pooling method, one of POOLING_METHODS
+
+        Returns:
+            Array of shape (n_queries, n_documents)
+        """
+        queries = normalize(queries)
+        if method in ("mean", "max"):
+            return queries @ self.pooled(method).T
+        if method != "top":
+            raise ValueError(f"Unknown pooling method {method!r}, expected one of {POOLING_METHODS}")
+
+        scores = np.zeros((len(queries), self.n_documents), dtype=np.float32)
+        if len(self.chunks) == 0:
+            return scores
+        chunk_scores = queries @ self.vectors.T
+        # Chunks are grouped by owner, so each document's best chunk is a
+        # segment maximum
+        documents, starts = np.unique(self.owners, return_index=True)
+        scores[:, documents] = np.maximum.reduceat(chunk_scores, starts, axis=1)
+        return scores
+
+    def scores(self, query: np.ndarray, method: str = "top") -> np.ndarray:
+        """Cosine score of every document for a single query embedding."""
+        return self.score_matrix(np.atleast_2d(query), method)[0]
+
+    def best_chunks(self, query: np.ndarray, document: int, n: int = 3) -> List[Tuple[str, float]]:
+        """
+        The chunks of one document that best match a query.
+
+        Args:
+            query: Query embedding (e.g. the job description)
+            document: Index of the document
+            n: Number of chunks to return
+
+        Returns:
+            List of (chunk text, cosine score), best first
+        """
+        rows = np.flatnonzero(self.owners == document)
+        if len(rows) == 0:
+            return []
+        scores = self.vectors[rows] @ normalize(query)[0]
+        best = np.argsort(-scores, kind="stable")[:n]
+        return [(self.chunks[rows[i]], float(scores[i])) for i in best]
+
+
+def split_documents(
+    texts: Sequence[str],
+    tokenizer=None,
+    max_tokens: int = 254,
+    overlap: int = 32
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Chunk a batch of documents.
+
+    Args:
+        texts: Document texts
+        tokenizer: HuggingFace tokenizer of the embedding model (None = words)
+        max_tokens: Window size in tokens
+        overlap: Tokens shared by consecutive windows
+
+    Returns:
+        (chunk texts, owner document index of each chunk)
+    """
+    chunks: List[str] = []
+    owners: List[int] = []
+    for i, text in enumerate(texts):
+        for start, end in chunk_text(text, tokenizer, max_tokens, overlap):
+            chunks.append(text[start:end])
+            owners.append(i)
+    return chunks, np.array(owners, dtype=np.int64)
+
+
+def resolve_pooling(pooling: Optional[str]) -> Optional[str]:
+    """Map "none"/None to whole-document embeddings, validate the rest."""
+    if pooling in (None, "", "none"):
+        return None
+    if pooling not in POOLING_METHODS:
+        raise ValueError(f"Unknown pooling method {pooling!r}, expected one of {POOLING_METHODS}")
+    return pooling
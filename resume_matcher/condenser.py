@@ -0,0 +1,174 @@
+"""
+Token-budgeted condensation of resumes for the LLM prompt.
+
+Prompt evaluation (prefill) dominates the latency of a Llama 3
+explanation, and cutting the resume after a fixed number of characters
+often drops the experience that actually matches the job. condense_resume
+instead splits the resume into passages of a few lines, embeds them with
+the matching model (bypassing the embedding cache, which they would only
+churn), and keeps the passages most similar to the job description until
+the token budget is spent. Kept passages stay in their original order;
+gaps are marked with "[...]".
+
+Token counts are estimates (about four characters per Llama 3 token on
+English text): the LLM's tokenizer is not available locally.
+"""
+
+import math
+import re
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+from resume_matcher.vector_index import normalize
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+CHARS_PER_TOKEN = 4
+GAP_MARKER = "[...]"
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate number of LLM tokens in a text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _pieces(line: str, max_chars: int) -> List[str]:
+    """Split an over-long line into sentences, and over-long sentences into words."""
+    if len(line) <= max_chars:
+        return [line]
+    pieces = []
+    for sentence in _SENTENCE_RE.split(line):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def split_passages(text: str, passage_tokens: int = 64) -> List[str]:
+    """
+    Group consecutive lines of a resume into passages of about ``passage_tokens``.
+
+    PDF extraction often yields one skill or date per line, which are
+    meaningless on their own; whole lines are kept together as long as the
+    passage fits, and only lines longer than a passage are split.
+
+    Args:
+        text: Resume text
+        passage_tokens: Target passage size in estimated tokens
+
+    Returns:
+        Passages in reading order
+    """
+    max_chars = passage_tokens * CHARS_PER_TOKEN
+    passages, current, size = [], [], 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        for piece in _pieces(line, max_chars):
+            if current and size + len(piece) + 1 > max_chars:
+                passages.append("\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece) + 1
+    if current:
+        passages.append("\n".join(current))
+    return passages
+
+
+def select_passages(scores: np.ndarray, lengths: Sequence[int], budget: int) -> List[int]:
+    """
+    Pick the best scoring passages that fit a token budget.
+
+    Greedy by score: a passage too long for the remaining budget is skipped
+    and smaller, lower scoring ones can still fill the space.
+
+    Args:
+        scores: Relevance of each passage
+        lengths: Estimated tokens of each passage
+        budget: Tokens available
+
+    Returns:
+        Indices of the kept passages, in reading order
+    """
+    kept, used = [], 0
+    for i in np.argsort(-np.asarray(scores), kind="stable"):
+        if used + lengths[i] <= budget:
+            kept.append(int(i))
+            used += lengths[i]
+    return sorted(kept)
+
+
+def condense_resume(
+    resume_text: str,
+    job_text: str,
+    token_budget: Optional[int] = None,
+    embed: Optional[Callable[[List[str]], np.ndarray]] = None
+) -> str:
+    """
+    Reduce a resume to the passages most relevant to a job, within a token budget.
+
+    Args:
+        resume_text: Extracted resume text
+        job_text: The job posting text
+        token_budget: Estimated tokens the condensed resume may use
+            (defaults to config.ollama.resume_token_budget; 0 = no limit)
+        embed: Function mapping texts to embeddings (defaults to the
+            matcher's encode_texts: passages are not worth caching)
+
+    Returns:
+        The resume unchanged if it fits, otherwise its best passages in
+        reading order, separated by a gap marker where text was left out
+    """
+    if token_budget is None:
+        token_budget = config.ollama.resume_token_budget if config else 768
+    if token_budget <= 0 or estimate_tokens(resume_text) <= token_budget:
+        return resume_text
+
+    passage_tokens = config.ollama.passage_tokens if config else 64
+    passages = split_passages(resume_text, passage_tokens)
+    if not passages:
+        return resume_text
+    if embed is None:
+        # Imported here: the model stack is only needed for long resumes
+        from resume_matcher.matcher import encode_texts as embed
+
+    # The gap marker costs a couple of tokens per kept passage
+    lengths = [estimate_tokens(passage) + 2 for passage in passages]
+    with metrics.span("condense_resume", passages=len(passages)):
+        vectors = normalize(np.asarray(embed([job_text] + passages), dtype=np.float32))
+        scores = vectors[1:] @ vectors[0]
+        kept = select_passages(scores, lengths, token_budget)
+
+    parts, previous = [], -1
+    for i in kept:
+        if i != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(passages[i])
+        previous = i
+    if previous != len(passages) - 1:
+        parts.append(GAP_MARKER)
+    condensed = "\n".join(parts)
+
+    metrics.observe("condensed_resume_ratio", len(condensed) / max(len(resume_text), 1))
+    if logger:
+        logger.debug(
+            f"Condensed resume from ~{estimate_tokens(resume_text)} to ~{estimate_tokens(condensed)} tokens "
+            f"({len(kept)}/{len(passages)} passages)"
+        )
+    return condensed
@@ -0,0 +1,354 @@
+"""
+Duplicate and near-duplicate resume detection.
+
+Candidate pools often contain the same CV several times, or lightly edited
+versions of it. Deduplicator collapses them at ingest, before embedding:
+
+1. Exact: identical file bytes or identical normalized text
+2. Near: MinHash signatures of word shingles, bucketed by an LSH index
+   (banded signatures), so each resume is only compared with the few
+   resumes sharing a band instead of the whole pool
+3. Confirmation: candidates whose estimated Jaccard similarity reaches
+   the threshold must also have near-identical embeddings, so two
+   different people using the same template are not merged
+
+A duplicate is folded into the first resume seen with that content, which
+lists the others in its 'aliases'.
+"""
+
+import hashlib
+import re
+import zlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+from resume_matcher.vector_index import normalize
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+# Mersenne prime 2^31 - 1: (a * x + b) stays below 2^62, no uint64 overflow
+_PRIME = np.uint64((1 << 31) - 1)
+# Multiplier combining consecutive word hashes into shingle hashes
+_SHINGLE_BASE = np.uint64(1000003)
+
+_WORD_RE = re.compile(r"\w[\w+#.]*")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase words only: layout, punctuation and spacing do not count."""
+    return " ".join(_WORD_RE.findall(text.lower()))
+
+
+def shingle_hashes(words: Sequence[str], size: int = 4) -> np.ndarray:
+    """
+    Distinct 31-bit hashes of the ``size``-word shingles of a text.
+
+    Words are hashed once (CRC-32) and combined per window with NumPy, so
+    the cost is one C call per word rather than per shingle.
+
+    Args:
+        words: Normalized words of the text
+        size: Words per shingle
+
+    Returns:
+        Sorted unique uint64 hashes (one for the whole text if it is
+        shorter than a shingle, none if it is empty)
+    """
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+    size = min(size, len(hashes))
+    n = len(hashes) - size + 1
+    combined = np.zeros(n, dtype=np.uint64)
+    for offset in range(size):
+        combined = combined * _SHINGLE_BASE + hashes[offset:offset + n]
+    return np.unique(combined % _PRIME)
+
+
+class MinHasher:
+    """
+    MinHash signatures: for each of ``num_perm`` random hash functions, the
+    smallest hash of the text's shingles. The share of equal positions in
+    two signatures estimates the Jaccard similarity of the shingle sets.
+
+    Args:
+        num_perm: Signature length
+        seed: Seed of the hash functions (signatures are only comparable
+            between hashers with the same seed and length)
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, shingles: np.ndarray) -> np.ndarray:
+        """uint32 signature of a shingle hash set (all-max for an empty set)."""
+        if len(shingles) == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        return ((self._a * shingles[None, :] + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures.
+
+    Signatures are cut into ``bands`` bands of equal length; two items
+    become candidates when any band matches exactly. With r rows per band,
+    a pair of Jaccard similarity s is found with probability
+    1 - (1 - s^r)^bands.
+
+    Args:
+        num_perm: Signature length
+        bands: Number of bands (must divide num_perm)
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"{bands} bands do not divide a signature of {num_perm}")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    def _keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def candidates(self, signature: np.ndarray) -> List[int]:
+        """Ids sharing at least one band with the signature, in insertion order."""
+        found = set()
+        for bucket, key in zip(self._buckets, self._keys(signature)):
+            found.update(bucket.get(key, ()))
+        return sorted(found)
+
+    def add(self, item: int, signature: np.ndarray) -> None:
+        for bucket, key in zip(self._buckets, self._keys(signature)):
+            bucket.setdefault(key, []).append(item)
+
+
+class Deduplicator:
+    """
+    Incremental duplicate detection over a stream of resumes.
+
+    Args:
+        threshold: Estimated Jaccard similarity of the word shingles above
+            which two resumes are near-duplicate candidates (defaults to config)
+        embedding_threshold: Cosine similarity the candidates' embeddings
+            must reach to be merged; 0 skips the confirmation (defaults to config)
+        num_perm: MinHash signature length (defaults to config)
+        bands: LSH bands (defaults to config)
+        shingle_size: Words per shingle (defaults to config)
+        embed: Function mapping texts to embeddings for the confirmation
+            (defaults to the matcher's cached get_embeddings)
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        embedding_threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+        embed: Optional[Callable[[List[str]], np.ndarray]] = None
+    ):
+        dedup = config.dedup if config else None
+        self.threshold = threshold if threshold is not None else (dedup.jaccard_threshold if dedup else 0.7)
+        self.embedding_threshold = (
+            embedding_threshold if embedding_threshold is not None
+            else (dedup.embedding_threshold if dedup else 0.95)
+        )
+        num_perm = num_perm or (dedup.num_perm if dedup else 64)
+        self.shingle_size = shingle_size or (dedup.shingle_size if dedup else 4)
+        self.hasher = MinHasher(num_perm)
+        self.index = LSHIndex(num_perm, bands or (dedup.bands if dedup else 16))
+        self._embed = embed
+        self.names: List[str] = []
+        # Duplicate file names per item, by item index: names are not unique
+        self.aliases: Dict[int, List[str]] = {}
+        # Texts of the items not embedded yet, only read back for confirmations
+        self._texts: Dict[int, str] = {}
+        self._signatures: List[np.ndarray] = []
+        self._vectors: Dict[int, np.ndarray] = {}
+        self._by_bytes: Dict[str, int] = {}
+        self._by_text: Dict[str, int] = {}
+        self.exact = 0
+        self.near = 0
+        self.rejected = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _embeddings(self, texts: List[str]) -> np.ndarray:
+        if self._embed is None:
+            # Imported here: the model is only needed once a candidate pair shows up
+            from resume_matcher.matcher import get_embeddings
+            self._embed = get_embeddings
+        return normalize(np.asarray(self._embed(texts), dtype=np.float32))
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        return self._embeddings([text])[0]
+
+    def _vector(self, item: int) -> np.ndarray:
+        if item not in self._vectors:
+            self._vectors[item] = self._embed_one(self._texts.pop(item))
+        return self._vectors[item]
+
+    def _register(self, name: str, text: str, signature: np.ndarray) -> int:
+        item = len(self.names)
+        self.names.append(name)
+        self._texts[item] = text
+        self._signatures.append(signature)
+        self.index.add(item, signature)
+        return item
+
+    def add(self, name: str, text: str, digest: Optional[str] = None) -> Optional[str]:
+        """
+        Check a resume against the ones seen so far, and remember it if new.
+
+        Args:
+            name: File name of the resume
+            text: Extracted text
+            digest: Digest of the file bytes, when known (skips text work for
+                byte-identical copies)
+
+        Returns:
+            Name of the resume it duplicates (and is now an alias of), or
+            None if it is new
+        """
+        original = self._by_bytes.get(digest) if digest else None
+        kind = "exact"
+        if original is None:
+            words = normalize_text(text).split()
+            key = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+            original = self._by_text.get(key)
+            if original is None:
+                signature = self.hasher.signature(shingle_hashes(words, self.shingle_size))
+                original = self._near_duplicate(signature, text)
+                kind = "near"
+                if original is None:
+                    original = self._register(name, text, signature)
+                    self._by_text[key] = original
+                    if digest:
+                        self._by_bytes[digest] = original
+                    return None
+            if digest:
+                self._by_bytes[digest] = original
+
+        self.aliases.setdefault(original, []).append(name)
+        if kind == "exact":
+            self.exact += 1
+        else:
+            self.near += 1
+        return self.names[original]
+
+    def seen_bytes(self, digest: str) -> Optional[str]:
+        """Name of the resume already seen with these file bytes, if any."""
+        item = self._by_bytes.get(digest)
+        return None if item is None else self.names[item]
+
+    def forget_texts(self, vectors: Optional[Dict[int, np.ndarray]] = None) -> None:
+        """
+        Drop the remembered texts, keeping only what later checks need.
+
+        Texts are only read back to embed near-duplicate candidates, so long
+        streams trade them for float16 embeddings. Without the embedding
+        confirmation nothing replaces them.
+
+        Args:
+            vectors: Normalized embeddings already computed for some items
+                (e.g. while scoring them); the others are embedded in one batch
+        """
+        if self.embedding_threshold > 0 and self._texts:
+            known = {item: vector for item, vector in (vectors or {}).items() if item in self._texts}
+            missing = [item for item in self._texts if item not in known]
+            if missing:
+                known.update(zip(missing, self._embeddings([self._texts[item] for item in missing])))
+            self._vectors.update((item, np.asarray(vector, dtype=np.float16)) for item, vector in known.items())
+        self._texts.clear()
+
+    def _near_duplicate(self, signature: np.ndarray, text: str) -> Optional[int]:
+        """Best confirmed LSH candidate for a signature, if any."""
+        candidates = self.index.candidates(signature)
+        if not candidates:
+            return None
+        similarity = np.mean(np.stack([self._signatures[i] for i in candidates]) == signature, axis=1)
+        vector = None
+        for rank in np.argsort(-similarity, kind="stable"):
+            if similarity[rank] < self.threshold:
+                break
+            item = candidates[rank]
+            if self.embedding_threshold <= 0:
+                return item
+            if vector is None:
+                vector = self._embed_one(text)
+            if float(vector @ self._vector(item)) >= self.embedding_threshold:
+                return item
+            self.rejected += 1
+        return None
+
+    def stats(self) -> Dict:
+        """Unique resumes, duplicates found per kind, candidates rejected by the embeddings."""
+        return {"unique": len(self.names), "exact": self.exact, "near": self.near, "rejected": self.rejected}
+
+
+def fold_duplicates(resumes: List[Dict], deduplicator: Deduplicator) -> List[Tuple[int, int]]:
+    """
+    Feed resumes to a deduplicator and locate the unique ones.
+
+    Args:
+        resumes: Dicts with 'filename' and 'content' keys (and an optional
+            'digest' of the file bytes)
+        deduplicator: Deduplicator to use, e.g. one kept across batches
+
+    Returns:
+        (position in resumes, deduplicator item) of each unique resume, in
+        input order; ``deduplicator.aliases[item]`` lists its duplicates,
+        including those found in later calls
+    """
+    unique = []
+    with metrics.span("dedup", resumes=len(resumes)):
+        for position, resume in enumerate(resumes):
+            if deduplicator.add(resume['filename'], resume['content'], resume.get('digest')) is None:
+                unique.append((position, len(deduplicator) - 1))
+    if len(unique) < len(resumes):
+        metrics.incr("duplicate_resumes", len(resumes) - len(unique))
+    return unique
+
+
+def deduplicate(resumes: List[Dict], deduplicator: Optional[Deduplicator] = None) -> List[Dict]:
+    """
+    Collapse duplicate resumes into the first occurrence.
+
+    Args:
+        resumes: Dicts with 'filename' and 'content' keys (and an optional
+            'digest' of the file bytes)
+        deduplicator: Deduplicator to use, e.g. one kept across batches
+            (defaults to a new one)
+
+    Returns:
+        The unique resumes in input order; those that absorbed duplicates
+        are copies with an 'aliases' list of the duplicates' file names
+    """
+    if deduplicator is None:
+        deduplicator = Deduplicator()
+    unique = fold_duplicates(resumes, deduplicator)
+    if len(unique) == len(resumes):
+        return resumes
+
+    if logger:
+        stats = deduplicator.stats()
+        logger.info(f"Dedup: {len(resumes)} resumes -> {len(unique)} ({stats['exact']} exact, {stats['near']} near duplicates)")
+    return [
+        dict(resumes[position], aliases=list(deduplicator.aliases[item])) if item in deduplicator.aliases
+        else resumes[position]
+        for position, item in unique
+    ]
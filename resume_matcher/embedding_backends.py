@@ -0,0 +1,285 @@
+"""
+Embedding model backends.
+
+``config.model.backend`` selects how the sentence-transformer runs:
+
+- "torch": the regular SentenceTransformer (default)
+- "torch-int8": the same model with its Linear layers dynamically quantized
+  to int8 (torch.quantization.quantize_dynamic); faster on CPU, no extra
+  dependency
+- "onnx": the transformer exported once to ONNX and run with ONNX Runtime.
+  The export (tokenizer, model.onnx and pooling settings) is kept under
+  ``<cache dir>/onnx/<model>``, so later starts load neither torch nor
+  sentence_transformers. Requires the optional ``onnxruntime`` package
+  (and ``onnx`` for the one-time export).
+
+Every backend returns an object with the parts of the SentenceTransformer
+API the project uses: ``encode(texts, batch_size=...)``, ``tokenizer`` and
+``max_seq_length``.
+
+Heavy libraries are imported inside the loaders, so importing this module
+costs nothing.
+"""
+
+import inspect
+import json
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_SETTINGS_FILE = "settings.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def load_model(
+    model_name: str,
+    backend: str = "torch",
+    cache_dir: Optional[str] = None,
+    device: str = "cpu"
+):
+    """
+    Load an embedding model with the requested backend.
+
+    Args:
+        model_name: Sentence-transformers model name or local path
+        backend: "torch", "torch-int8" or "onnx"
+        cache_dir: Download cache of sentence-transformers
+        device: Torch device (the quantized and ONNX backends run on CPU)
+
+    Returns:
+        Model exposing encode(), tokenizer and max_seq_length
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown model backend: {backend} (expected one of {', '.join(BACKENDS)})")
+    if backend == "onnx":
+        return OnnxEncoder.load(model_name, onnx_export_dir(model_name), cache_dir=cache_dir)
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name, cache_folder=cache_dir, device=device)
+
+    import torch
+
+    model = SentenceTransformer(model_name, cache_folder=cache_dir, device="cpu")
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def onnx_export_dir(model_name: str) -> str:
+    """Directory holding the ONNX export of a model."""
+    base = os.path.join(config.cache.dir if config else ".cache", "onnx")
+    return os.path.join(base, re.sub(r"[^A-Za-z0-9_.-]", "_", model_name))
+
+
+class OnnxEncoder:
+    """
+    Sentence embedding with ONNX Runtime.
+
+    Reproduces the SentenceTransformer pipeline: tokenize, run the
+    transformer, pool token embeddings (mean, CLS or max), optionally
+    L2-normalize.
+
+    Args:
+        export_dir: Directory written by export()
+    """
+
+    def __init__(self, export_dir: str):
+        # tokenizers + onnxruntime only: transformers would import torch
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError("MODEL_BACKEND=onnx requires the onnxruntime package (pip install onnxruntime)") from e
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(export_dir, ONNX_SETTINGS_FILE), "r", encoding="utf-8") as f:
+            settings = json.load(f)
+        self.pooling = settings["pooling"]
+        self.normalize = settings["normalize"]
+        self.max_seq_length = settings["max_seq_length"]
+
+        tokenizer_file = os.path.join(export_dir, TOKENIZER_FILE)
+        self.tokenizer = _OffsetTokenizer(Tokenizer.from_file(tokenizer_file))
+        # Separate instance configured for model input, so the chunker's
+        # untruncated calls never share padding/truncation state with it
+        self._batch_tokenizer = Tokenizer.from_file(tokenizer_file)
+        self._batch_tokenizer.enable_truncation(self.max_seq_length)
+        self._batch_tokenizer.enable_padding(pad_id=settings["pad_id"], pad_token=settings["pad_token"])
+
+        options = onnxruntime.SessionOptions()
+        # Honour the thread limit of embedding pool workers (0 = all cores)
+        options.intra_op_num_threads = int(os.environ.get("OMP_NUM_THREADS", "0"))
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(export_dir, ONNX_MODEL_FILE), options, providers=["CPUExecutionProvider"]
+        )
+        self._inputs = {i.name for i in self.session.get_inputs()}
+
+    @classmethod
+    def load(cls, model_name: str, export_dir: str, cache_dir: Optional[str] = None) -> "OnnxEncoder":
+        """Load the export of a model, exporting it first if needed."""
+        if not os.path.exists(os.path.join(export_dir, ONNX_MODEL_FILE)):
+            export(model_name, export_dir, cache_dir=cache_dir)
+        return cls(export_dir)
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Embed texts; accepts the SentenceTransformer.encode arguments the
+        project uses and ignores the others (show_progress_bar, ...).
+
+        Returns:
+            float32 array, 1D for a single string, 2D otherwise
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        # Longest first so similarly sized texts share padded batches
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        batches = []
+        for start in range(0, len(order), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            encodings = self._batch_tokenizer.encode_batch(batch)
+            features = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            feeds = {name: features[name] for name in self._inputs}
+            token_embeddings = self.session.run(None, feeds)[0]
+            batches.append(self._pool(token_embeddings, features["attention_mask"]))
+
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        if self.normalize or normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings[0] if single else embeddings
+
+    def _pool(self, token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        mask = attention_mask[..., None].astype(np.float32)
+        if self.pooling == "cls":
+            return token_embeddings[:, 0].astype(np.float32)
+        if self.pooling == "max":
+            return np.where(mask > 0, token_embeddings, -1e9).max(axis=1).astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return (summed / np.maximum(mask.sum(axis=1), 1e-9)).astype(np.float32)
+
+
+class _OffsetTokenizer:
+    """
+    The part of the HuggingFace tokenizer call API the chunker uses
+    (token character offsets), on top of a ``tokenizers.Tokenizer``.
+    """
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+
+    def __call__(self, text: str, add_special_tokens: bool = True, **kwargs) -> dict:
+        encoding = self._tokenizer.encode(text, add_special_tokens=add_special_tokens)
+        return {
+            "input_ids": encoding.ids,
+            "attention_mask": encoding.attention_mask,
+            "offset_mapping": encoding.offsets,
+        }
+
+
+def export(model_name: str, export_dir: str, cache_dir: Optional[str] = None) -> None:
+    """
+    Export a sentence-transformers model to ONNX (one time, needs torch).
+
+    Args:
+        model_name: Sentence-transformers model name or local path
+        export_dir: Target directory
+        cache_dir: Download cache of sentence-transformers
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if logger:
+        logger.info(f"Exporting {model_name} to ONNX in {export_dir}")
+
+    model = SentenceTransformer(model_name, cache_folder=cache_dir, device="cpu")
+    transformer = model[0]
+    pooling = "mean"
+    normalize = False
+    for module in model:
+        mode = getattr(module, "get_pooling_mode_str", None)
+        if mode is not None:
+            pooling = {"cls": "cls", "max": "max"}.get(mode(), "mean")
+        if type(module).__name__ == "Normalize":
+            normalize = True
+
+    if not getattr(transformer.tokenizer, "is_fast", False):
+        raise ValueError(f"ONNX backend needs a model with a fast (Rust) tokenizer: {model_name}")
+    Path(export_dir).mkdir(parents=True, exist_ok=True)
+    transformer.tokenizer.save_pretrained(export_dir)
+
+    sample = transformer.tokenizer(["warm up"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        # Passes the inputs by keyword: the positional order of forward()
+        # differs between transformers models and versions
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+
+    wrapped = TokenEmbeddings(transformer.auto_model).eval()
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    options = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # Newer torch defaults to the dynamo exporter; the TorchScript one
+        # handles these models with dynamic axes
+        options["dynamo"] = False
+
+    tmp_path = os.path.join(export_dir, ONNX_MODEL_FILE + ".tmp")
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapped,
+            tuple(sample[name] for name in input_names),
+            tmp_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+            **options
+        )
+
+    tokenizer = transformer.tokenizer
+    settings = {
+        "pooling": pooling,
+        "normalize": normalize,
+        "max_seq_length": model.max_seq_length,
+        "pad_token": tokenizer.pad_token,
+        "pad_id": tokenizer.pad_token_id,
+    }
+    with open(os.path.join(export_dir, ONNX_SETTINGS_FILE), "w", encoding="utf-8") as f:
+        json.dump(settings, f)
+    # The model file last: its presence marks a complete export
+    os.replace(tmp_path, os.path.join(export_dir, ONNX_MODEL_FILE))
@@ -0,0 +1,400 @@
+"""
+Persistent, content-addressed cache for resume embeddings.
+
+Vectors live in a memory-mapped float32 matrix (``embeddings.f32``) and a
+small JSON index maps each cache key to its row. Keys are SHA-256 digests
+of the model name and the whitespace-normalized text, so re-ranking the same
+resume pool against a new job description does not re-encode anything.
+
+The cache holds at most ``max_entries`` vectors and evicts the least
+recently used entry when full. Stores append their rows to a journal
+(``index.log``) instead of rewriting the index; the index is rewritten
+only once the journal outgrows it, and at close / exit. Lookups only
+refresh the recency order in memory, saved with the next index rewrite,
+so reads never write anything.
+
+The cache is safe to share between threads of one process (e.g. Streamlit
+sessions). Each process locks its cache directory: a second process on
+the same ``cache_dir`` (say scripts/serve.py while the app runs) gets a
+sibling directory of its own instead of overwriting the rows the first
+one allocates.
+"""
+
+import atexit
+import hashlib
+import itertools
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no advisory locks, keep one process per cache directory
+    fcntl = None
+
+try:
+    from logger import logger
+except ImportError:
+    logger = None
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so layout-only differences share a key."""
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def make_key(model_name: str, text: str) -> str:
+    """
+    Build the cache key for a text embedded by a given model.
+
+    Args:
+        model_name: Name of the embedding model
+        text: Raw text to embed
+
+    Returns:
+        Hex SHA-256 digest of (model name, normalized text)
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(normalize_text(text).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk LRU store of embedding vectors for a single model.
+
+    Args:
+        cache_dir: Root directory of the cache (one sub-directory per model)
+        model_name: Name of the embedding model the vectors belong to
+        max_entries: Maximum number of vectors kept before LRU eviction
+    """
+
+    INDEX_FILE = "index.json"
+    JOURNAL_FILE = "index.log"
+    MATRIX_FILE = "embeddings.f32"
+    LOCK_FILE = "lock"
+    # The index is rewritten once the journal holds more entries than it
+    # (and at least this many), so stores cost O(1) amortized
+    JOURNAL_MIN_ENTRIES = 1024
+
+    def __init__(self, cache_dir: str, model_name: str, max_entries: int = 50000):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lock_handle = None
+        self.path = self._claim(Path(cache_dir) / "embeddings" / re.sub(r"[^\w.-]", "_", model_name))
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.RLock()
+        # Ordered from least to most recently used
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._free_rows: List[int] = []
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        # Changes the journal does not record (resize), index rewrite pending
+        self._dirty = False
+        # Recency refreshed by lookups, not yet on disk
+        self._order_changed = False
+        # Token shared by the index and its journal; None until the index exists
+        self._journal_token: Optional[str] = None
+        self._journal_entries = 0
+
+        self._load()
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Embedding dimension, or None until the first vector is stored."""
+        return self._dim
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up cached vectors for a batch of texts.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            List aligned with ``texts`` holding a vector copy or None on a miss
+        """
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = make_key(self.model_name, text)
+                row = self._index.get(key)
+                if row is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                self._index.move_to_end(key)
+                self.hits += 1
+                self._order_changed = True
+                results.append(np.array(self._matrix[row]))
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Store vectors for a batch of texts, evicting old entries if needed.
+
+        Args:
+            texts: Texts the vectors were computed from
+            vectors: 2D array of shape (len(texts), dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError("vectors must be a 2D array aligned with texts")
+        if len(texts) == 0:
+            return
+
+        with self._lock:
+            if self._matrix is None:
+                self._open_matrix(vectors.shape[1], create=True)
+            elif vectors.shape[1] != self._dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match cache dimension {self._dim}"
+                )
+
+            rows, evicted = [], []
+            for text in texts:
+                key = make_key(self.model_name, text)
+                row = self._index.get(key)
+                if row is None:
+                    row, old_key = self._allocate_row()
+                    if old_key is not None:
+                        evicted.append(old_key)
+                    self._index[key] = row
+                else:
+                    self._index.move_to_end(key)
+                rows.append((key, row))
+
+            if self._journal_token is None:
+                # First vectors of a new cache: write the index itself
+                for (_, row), vector in zip(rows, vectors):
+                    self._matrix[row] = vector
+                self._dirty = True
+                self.flush()
+                return
+            # Evicted keys leave the journal before their rows are reused,
+            # and new keys enter it once their vectors are written: after a
+            # crash, no key points to another text's vector
+            self._append_journal(f"- {key}\n" for key in evicted)
+            for (_, row), vector in zip(rows, vectors):
+                self._matrix[row] = vector
+            self._matrix.flush()
+            self._append_journal(f"+ {key} {row}\n" for key, row in rows if self._index.get(key) == row)
+            if self._journal_entries >= max(len(self._index), self.JOURNAL_MIN_ENTRIES):
+                self.flush()
+
+    def flush(self) -> None:
+        """Rewrite the index (folding the journal into it) if anything changed."""
+        with self._lock:
+            if self._matrix is None or not (self._dirty or self._order_changed or self._journal_entries):
+                return
+            self._matrix.flush()
+            token = os.urandom(8).hex()
+            index = {
+                "model": self.model_name,
+                "dim": self._dim,
+                "capacity": self.max_entries,
+                "journal": token,
+                "entries": list(self._index.items()),
+            }
+            tmp_path = self.path / (self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.path / self.INDEX_FILE)
+            # A journal whose token does not match the index is ignored, so
+            # a crash before this point never replays entries twice
+            with open(self.path / self.JOURNAL_FILE, "w", encoding="utf-8") as f:
+                f.write(f"# {token}\n")
+            self._journal_token = token
+            self._journal_entries = 0
+            self._dirty = False
+            self._order_changed = False
+
+    def close(self) -> None:
+        """Persist pending changes, including the recency order of lookups, and unlock the directory."""
+        with self._lock:
+            self.flush()
+            if self._lock_handle is not None:
+                self._lock_handle.close()
+                self._lock_handle = None
+
+    def clear(self) -> None:
+        """Remove every cached vector."""
+        with self._lock:
+            self._index.clear()
+            self._free_rows = list(range(self.max_entries - 1, -1, -1))
+            self._matrix = None
+            self._dim = None
+            self._journal_token = None
+            self._journal_entries = 0
+            for name in (self.INDEX_FILE, self.JOURNAL_FILE, self.MATRIX_FILE):
+                try:
+                    os.remove(self.path / name)
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "capacity": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _claim(self, root: Path) -> Path:
+        """
+        Lock a cache directory for this process: ``root`` if it is free,
+        otherwise the first free sibling (``<root>.1``, ``<root>.2``...).
+        The lock is released by close() or when the process exits.
+        """
+        for slot in itertools.count():
+            path = root if slot == 0 else root.with_name(f"{root.name}.{slot}")
+            path.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                return path
+            handle = open(path / self.LOCK_FILE, "a")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                continue
+            self._lock_handle = handle
+            if slot and logger:
+                logger.info(f"Embedding cache {root} is used by another process, using {path}")
+            return path
+
+    def _append_journal(self, lines) -> None:
+        data = "".join(lines)
+        if data:
+            with open(self.path / self.JOURNAL_FILE, "a", encoding="utf-8") as f:
+                f.write(data)
+            self._journal_entries += data.count("\n")
+
+    def _allocate_row(self) -> Tuple[int, Optional[str]]:
+        """A free row, and the key evicted to free it (None if none was)."""
+        if self._free_rows:
+            return self._free_rows.pop(), None
+        # Full: reuse the row of the least recently used entry
+        key, row = self._index.popitem(last=False)
+        self.evictions += 1
+        return row, key
+
+    def _open_matrix(self, dim: int, create: bool) -> None:
+        mode = "w+" if create else "r+"
+        self._matrix = np.memmap(
+            self.path / self.MATRIX_FILE, dtype=np.float32, mode=mode,
+            shape=(self.max_entries, dim)
+        )
+        self._dim = dim
+
+    def _load(self) -> None:
+        index_path = self.path / self.INDEX_FILE
+        matrix_path = self.path / self.MATRIX_FILE
+        if not index_path.exists() or not matrix_path.exists():
+            self._free_rows = list(range(self.max_entries - 1, -1, -1))
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            dim = int(index["dim"])
+            capacity = int(index["capacity"])
+            entries = [(key, int(row)) for key, row in index["entries"]]
+            if matrix_path.stat().st_size != capacity * dim * 4:
+                raise ValueError("matrix size does not match index")
+            token = index.get("journal")
+            if token is not None:
+                entries = self._replay_journal(token, entries, capacity)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if logger:
+                logger.warning(f"Discarding unreadable embedding cache at {self.path}: {e}")
+            self.clear()
+            return
+        self._journal_token = token
+
+        if capacity != self.max_entries:
+            self._resize(dim, capacity, entries)
+        else:
+            self._open_matrix(dim, create=False)
+            self._index = OrderedDict(entries)
+            used = set(self._index.values())
+            self._free_rows = [r for r in range(self.max_entries - 1, -1, -1) if r not in used]
+
+        if logger:
+            logger.debug(f"Embedding cache loaded: {len(self._index)} entries from {self.path}")
+
+    def _replay_journal(self, token: str, entries: List[Tuple[str, int]], capacity: int) -> List[Tuple[str, int]]:
+        """Apply the journal written since the index (a torn last line is ignored)."""
+        try:
+            with open(self.path / self.JOURNAL_FILE, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return entries
+        if not lines or lines[0] != f"# {token}\n":
+            return entries
+
+        index = OrderedDict(entries)
+        owners: Dict[int, str] = {row: key for key, row in entries}
+        replayed = 0
+        for line in lines[1:]:
+            parts = line.split()
+            if not line.endswith("\n") or len(parts) not in (2, 3):
+                break
+            if parts[0] == "-" and len(parts) == 2:
+                row = index.pop(parts[1], None)
+                owners.pop(row, None)
+            elif parts[0] == "+" and len(parts) == 3 and 0 <= int(parts[2]) < capacity:
+                key, row = parts[1], int(parts[2])
+                if owners.get(row, key) != key:
+                    del index[owners[row]]
+                old_row = index.pop(key, None)
+                owners.pop(old_row, None)
+                index[key] = row
+                owners[row] = key
+            else:
+                break
+            replayed += 1
+        self._journal_entries = replayed
+        return list(index.items())
+
+    def _resize(self, dim: int, old_capacity: int, entries: list) -> None:
+        """Rewrite the matrix for a new capacity, keeping the most recent entries."""
+        old = np.memmap(self.path / self.MATRIX_FILE, dtype=np.float32, mode="r",
+                        shape=(old_capacity, dim))
+        kept = entries[-self.max_entries:]
+        vectors = np.array(old[[row for _, row in kept]]) if kept else np.empty((0, dim), np.float32)
+        del old
+
+        self._open_matrix(dim, create=True)
+        self._matrix[:len(kept)] = vectors
+        self._index = OrderedDict((key, row) for row, (key, _) in enumerate(kept))
+        self._free_rows = list(range(self.max_entries - 1, len(kept) - 1, -1))
+        self.evictions += len(entries) - len(kept)
+        self._dirty = True
+        self.flush()
@@ -0,0 +1,223 @@
+"""
+Multi-process embedding for CPU-only deployments.
+
+A single ``model.encode`` call leaves most cores of a large CPU node idle.
+EmbeddingPool keeps a set of worker processes, each with its own copy of
+the embedding model and a bounded number of intra-op threads, and shards
+large batches across them. Small batches stay in-process, where the model
+is already loaded and there is no pickling overhead.
+
+Workers are started with the "spawn" method: forking a process that has
+already loaded torch (or runs Streamlit threads) can deadlock in OpenMP.
+Their thread limits are set through the environment before the model
+libraries are imported, so N workers x T threads never exceed the cores.
+"""
+
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+# Environment variables read by the BLAS/OpenMP runtimes behind torch and
+# onnxruntime when they start
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+MIN_BATCH_SIZE = 4
+
+_pool: Optional["EmbeddingPool"] = None
+_pool_lock = threading.Lock()
+
+
+def resolve_pool_size(workers: int, threads_per_worker: int) -> Tuple[int, int]:
+    """
+    Turn configured sizes into (worker processes, threads per worker).
+
+    Args:
+        workers: Worker processes, 0 = one per 4 cores
+        threads_per_worker: Intra-op threads per worker, 0 = cores / workers
+
+    Returns:
+        Tuple of positive (workers, threads)
+    """
+    cores = os.cpu_count() or 1
+    if workers <= 0:
+        # A few threads per worker keeps the matrix products efficient
+        workers = max(1, cores // 4)
+    if threads_per_worker <= 0:
+        threads_per_worker = max(1, cores // workers)
+    return workers, threads_per_worker
+
+
+def adaptive_batch_size(
+    texts: List[str],
+    max_seq_length: int = 256,
+    batch_tokens: Optional[int] = None,
+    max_batch_size: Optional[int] = None
+) -> int:
+    """
+    Batch size that keeps about ``batch_tokens`` tokens per forward pass.
+
+    Short texts (skills lists, chunks) get large batches, long resumes
+    truncated at max_seq_length get small ones, so the padded batch stays
+    about the same size in memory and time.
+
+    Args:
+        texts: Texts about to be encoded
+        max_seq_length: Truncation length of the model, in tokens
+        batch_tokens: Token budget per batch (defaults to config)
+        max_batch_size: Upper bound (defaults to config)
+
+    Returns:
+        Batch size between MIN_BATCH_SIZE and max_batch_size
+    """
+    batch_tokens = batch_tokens or (config.model.batch_tokens if config else 8192)
+    max_batch_size = max_batch_size or (config.model.max_batch_size if config else 128)
+    if not texts:
+        return max_batch_size
+    # ~4 characters per sub-word token, plus [CLS]/[SEP]
+    tokens = np.minimum(np.fromiter((len(t) for t in texts), dtype=np.float64, count=len(texts)) / 4 + 2,
+                        max_seq_length)
+    return int(min(max_batch_size, max(MIN_BATCH_SIZE, batch_tokens // max(tokens.mean(), 1))))
+
+
+def encode_local(model, texts: List[str]) -> np.ndarray:
+    """Encode in this process with an adaptive batch size."""
+    batch_size = adaptive_batch_size(texts, getattr(model, "max_seq_length", None) or 256)
+    return np.asarray(model.encode(texts, batch_size=batch_size, show_progress_bar=False), dtype=np.float32)
+
+
+def _init_worker(threads: int) -> None:
+    """Pool initializer: limit threads, then load the model once."""
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    # Tokenizers would start their own thread pool in every worker
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+    if not config or config.model.backend != "onnx":
+        import torch
+        torch.set_num_threads(threads)
+
+    from resume_matcher.matcher import get_model
+    get_model()
+
+
+def _encode_shard(texts: List[str]) -> np.ndarray:
+    from resume_matcher.matcher import get_model
+    return encode_local(get_model(), texts)
+
+
+class EmbeddingPool:
+    """
+    Worker processes that each hold the embedding model.
+
+    The processes are started by start() or the first encode() that needs
+    them, and kept for the life of the process.
+
+    Args:
+        workers: Worker processes (defaults to config, 0 = one per 4 cores)
+        threads_per_worker: Intra-op threads per worker (defaults to config,
+            0 = cores / workers)
+        min_texts: Smaller batches are encoded in-process (defaults to config)
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = None,
+        min_texts: Optional[int] = None
+    ):
+        model = config.model if config else None
+        self.workers, self.threads_per_worker = resolve_pool_size(
+            workers if workers is not None else (model.workers if model else 1),
+            threads_per_worker if threads_per_worker is not None else (model.threads_per_worker if model else 0)
+        )
+        self.min_texts = min_texts if min_texts is not None else (model.pool_min_texts if model else 256)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def should_use(self, n_texts: int) -> bool:
+        """Whether a batch of this size is worth sharding over the workers."""
+        return self.workers > 1 and n_texts >= self.min_texts
+
+    def start(self):
+        """Start the workers (they load the model in the background)."""
+        with self._lock:
+            if self._pool is None:
+                if logger:
+                    logger.info(
+                        f"Starting {self.workers} embedding workers with "
+                        f"{self.threads_per_worker} threads each"
+                    )
+                context = multiprocessing.get_context("spawn")
+                self._pool = context.Pool(
+                    processes=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.threads_per_worker,)
+                )
+            return self._pool
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts on the worker processes.
+
+        Texts are sorted by length and cut into a few shards per worker, so
+        every shard pads to similar lengths and a slow shard does not hold
+        up an idle worker for long.
+
+        Returns:
+            float32 array aligned with ``texts``
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        shard_size = max(MIN_BATCH_SIZE, math.ceil(len(texts) / (self.workers * 4)))
+        shards = [[texts[i] for i in order[start:start + shard_size]]
+                  for start in range(0, len(order), shard_size)]
+
+        encoded = np.vstack(self.start().map(_encode_shard, shards, chunksize=1))
+        vectors = np.empty_like(encoded)
+        vectors[order] = encoded
+        return vectors
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+
+def get_embedding_pool() -> Optional[EmbeddingPool]:
+    """
+    Return the process-wide embedding pool.
+
+    Returns:
+        EmbeddingPool instance, or None when a single process is configured
+        or the model does not run on the CPU
+    """
+    global _pool
+    if not config or config.model.device != "cpu":
+        return None
+    if resolve_pool_size(config.model.workers, config.model.threads_per_worker)[0] <= 1:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = EmbeddingPool()
+            atexit.register(_pool.close)
+        return _pool
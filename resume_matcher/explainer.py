@@ -1,55 +1,436 @@
-import requests
+import asyncio
 import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
 
-def generate_explanation(resume_text: str, job_text: str) -> str:
+import requests
+from requests.adapters import HTTPAdapter
+
+from resume_matcher.condenser import condense_resume
+from resume_matcher.explanation_cache import ExplanationCache, make_key
+from resume_matcher.metrics import metrics
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama server cannot produce a response."""
+
+
+def build_prompt(resume_text: str, job_text: str, max_resume_chars: int = 4000) -> str:
     """
-    Sends the resume and job description to the local Ollama instance 
-    (running Llama 3) and returns a justification for the match.
+    Builds the recruiter prompt for one candidate.
+
+    Everything before the resume depends on the job only, so consecutive
+    prompts for the same job share a long prefix that Ollama keeps evaluated
+    in its KV cache (as long as the model stays loaded, see keep_alive).
+
+    Args:
+        resume_text: Extracted resume text
+        job_text: The job posting text
+        max_resume_chars: Resume characters kept in the prompt
+
+    Returns:
+        The prompt sent to Llama 3
     """
-    
-    # 1. Define the URL for Ollama's API
-    url = "http://localhost:11434/api/generate"
-    
-    # 2. Construct the Prompt
     # Llama 3 responds well to clear, structured instructions.
-    prompt = f"""
+    return f"""
     You are an expert AI Technical Recruiter.
-    
+
     JOB DESCRIPTION:
     {job_text}
-    
-    CANDIDATE RESUME:
-    {resume_text[:4000]}
-    
+
     TASK:
-    Based on the resume content, explain in 3 concise bullet points why this candidate is a good match for the job.
+    Based on the resume content below, explain in 3 concise bullet points why this candidate is a good match for the job.
     - Focus on matching hard skills (technologies) and relevant experience.
     - Do not hallucinate skills not present in the resume.
+    - "[...]" marks parts of the resume that were left out.
+
+    CANDIDATE RESUME:
+    {resume_text[:max_resume_chars]}
+    """
+
+
+class OllamaClient:
+    """
+    HTTP client for Ollama's /api/generate endpoint.
+
+    A single pooled requests.Session is reused for every call (keep-alive
+    connections), each request honours the configured timeout, and
+    connection errors, timeouts and 5xx responses are retried with
+    exponential backoff.
+
+    Args:
+        base_url: Ollama server URL (defaults to config)
+        model: Model name, must match what was pulled (defaults to config)
+        timeout: Seconds to wait for the server to send data
+        max_retries: Extra attempts after a transient failure
+        retry_backoff: Delay before the first retry, doubled on each one
+        pool_size: Maximum number of pooled keep-alive connections
+        cache: Explanation cache consulted before calling the model (None = off)
+        deterministic: Use temperature 0 and a fixed seed so answers, and
+            therefore cached answers, are stable (defaults to config)
+        resume_token_budget: Estimated tokens of resume text per prompt; longer
+            resumes are condensed to their most relevant passages (defaults
+            to config, 0 = only the max_resume_chars cut)
     """
 
-    # 3. Prepare the Payload
-    # NOTE: The model name here must match what you installed ("llama3")
-    payload = {
-        "model": "llama3", 
-        "prompt": prompt,
-        "stream": False,   # We want the full response at once
-        "options": {
-            "temperature": 0.7, # Controls creativity (0.7 is balanced)
-            "num_ctx": 4096     # Context window size (memory)
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        pool_size: int = 10,
+        cache: Optional[ExplanationCache] = None,
+        deterministic: Optional[bool] = None,
+        resume_token_budget: Optional[int] = None
+    ):
+        ollama = config.ollama if config else None
+        self.base_url = (base_url or (ollama.base_url if ollama else "http://localhost:11434")).rstrip("/")
+        self.model = model or (ollama.model_name if ollama else "llama3")
+        self.timeout = timeout if timeout is not None else (ollama.timeout if ollama else 30)
+        self.max_retries = max_retries if max_retries is not None else (ollama.max_retries if ollama else 2)
+        self.retry_backoff = retry_backoff if retry_backoff is not None else (ollama.retry_backoff if ollama else 0.5)
+        self.temperature = ollama.temperature if ollama else 0.7
+        self.context_window = ollama.context_window if ollama else 4096
+        self.max_resume_chars = ollama.max_resume_chars if ollama else 4000
+        self.deterministic = deterministic if deterministic is not None else (ollama.deterministic if ollama else False)
+        self.seed = ollama.seed if ollama else 42
+        self.keep_alive = ollama.keep_alive if ollama else "30m"
+        self.resume_token_budget = (
+            resume_token_budget if resume_token_budget is not None
+            else (ollama.resume_token_budget if ollama else 768)
+        )
+        self.cache = cache
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @property
+    def generate_url(self) -> str:
+        return f"{self.base_url}/api/generate"
+
+    def options(self) -> Dict:
+        """Sampling options sent with every request."""
+        if self.deterministic:
+            # Greedy decoding: the same prompt always yields the same answer
+            return {"temperature": 0, "seed": self.seed, "num_ctx": self.context_window}
+        return {
+            "temperature": self.temperature,  # Controls creativity (0.7 is balanced)
+            "num_ctx": self.context_window    # Context window size (memory)
         }
-    }
 
-    # 4. Send Request
-    try:
-        response = requests.post(url, json=payload)
-        
-        if response.status_code == 200:
+    def cache_key(self, prompt: str) -> str:
+        return make_key(self.model, self.options(), prompt)
+
+    def explanation_key(self, resume_text: str, job_text: str) -> str:
+        """
+        Cache key of a candidate's explanation, from the raw resume.
+
+        Computed before condensation, so a cached explanation costs no
+        embedding; the settings that shape the condensed prompt are part
+        of the key.
+        """
+        options = dict(
+            self.options(),
+            max_resume_chars=self.max_resume_chars,
+            resume_token_budget=self.resume_token_budget,
+            passage_tokens=config.ollama.passage_tokens if config else 64,
+        )
+        return make_key(self.model, options, build_prompt(resume_text, job_text, len(resume_text)))
+
+    def payload(self, prompt: str, stream: bool) -> Dict:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": self.options()
+        }
+        if self.keep_alive:
+            # Keeps the model, and the evaluated job prefix, loaded between candidates
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def prompt(self, resume_text: str, job_text: str) -> str:
+        """Prompt for one candidate, with the resume condensed to the token budget."""
+        if self.resume_token_budget > 0:
+            resume_text = condense_resume(resume_text, job_text, self.resume_token_budget)
+        return build_prompt(resume_text, job_text, self.max_resume_chars)
+
+    def _post(self, payload: Dict, stream: bool) -> requests.Response:
+        """POST with retries on connection errors, timeouts and 5xx responses."""
+        delay = self.retry_backoff
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.post(self.generate_url, json=payload, stream=stream, timeout=self.timeout)
+                if response.status_code < 500 or attempt == self.max_retries:
+                    return response
+                error = f"HTTP {response.status_code}"
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                error = str(e)
+
+            if logger:
+                logger.warning(f"Ollama request failed ({error}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+            delay *= 2
+
+    @staticmethod
+    def _check(response: requests.Response) -> None:
+        if response.status_code != 200:
+            raise OllamaError(f"Error {response.status_code}: {response.text}")
+
+    def _cached(self, key: Optional[str]) -> Optional[str]:
+        if not key:
+            return None
+        answer = self.cache.get(key)
+        metrics.incr("explanation_cache_hits" if answer is not None else "explanation_cache_misses")
+        return answer
+
+    @staticmethod
+    def _record_generation(data: Dict) -> None:
+        """Record prompt size and generation speed from the final response's statistics."""
+        prompt_eval_count = data.get("prompt_eval_count")
+        if prompt_eval_count is not None:
+            # Tokens actually evaluated: a prefix reused from the KV cache is not counted
+            metrics.incr("ollama_prompt_tokens", prompt_eval_count)
+            metrics.observe("ollama_prompt_eval_tokens", prompt_eval_count)
+        if data.get("prompt_eval_duration"):
+            metrics.observe("ollama_prompt_eval_seconds", data["prompt_eval_duration"] / 1e9)
+        eval_count = data.get("eval_count")
+        eval_duration = data.get("eval_duration")  # nanoseconds
+        if eval_count:
+            metrics.incr("ollama_tokens", eval_count)
+            if eval_duration:
+                metrics.observe("ollama_tokens_per_second", eval_count / (eval_duration / 1e9))
+
+    def generate(self, prompt: str, cache_key: Optional[str] = None) -> str:
+        """
+        Runs a prompt and returns the full response text (cached if enabled).
+
+        Args:
+            prompt: Full prompt text
+            cache_key: Key to store the answer under, when the caller has
+                already looked it up (the cache is then not consulted again)
+
+        Raises:
+            OllamaError: On a non-200 response
+            requests.exceptions.RequestException: If the server is unreachable
+        """
+        key = cache_key
+        if key is None and self.cache is not None:
+            key = self.cache_key(prompt)
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+
+        with metrics.span("ollama_generate", model=self.model, stream=False):
+            response = self._post(self.payload(prompt, stream=False), stream=False)
+            self._check(response)
             data = response.json()
-            return data.get("response", "No response generated.")
-        else:
-            return f"⚠️ Error {response.status_code}: {response.text}"
-            
-    except requests.exceptions.ConnectionError:
+        self._record_generation(data)
+        if "response" not in data:
+            return "No response generated."
+
+        if key:
+            self.cache.put(key, data["response"])
+        return data["response"]
+
+    def stream(self, prompt: str, cache_key: Optional[str] = None) -> Iterator[str]:
+        """
+        Runs a prompt and yields response tokens as Ollama produces them.
+
+        A cached answer is yielded in one piece; a completed stream is added
+        to the cache.
+
+        Args:
+            prompt: Full prompt text
+            cache_key: Key to store the answer under, when the caller has
+                already looked it up (the cache is then not consulted again)
+
+        Raises:
+            OllamaError: On a non-200 response
+            requests.exceptions.RequestException: If the server is unreachable
+        """
+        key = cache_key
+        if key is None and self.cache is not None:
+            key = self.cache_key(prompt)
+            cached = self._cached(key)
+            if cached is not None:
+                yield cached
+                return
+
+        tokens = []
+        # The span includes the time the consumer spends between tokens
+        with metrics.span("ollama_generate", model=self.model, stream=True), \
+                self._post(self.payload(prompt, stream=True), stream=True) as response:
+            self._check(response)
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise OllamaError(data["error"])
+                token = data.get("response")
+                if token:
+                    tokens.append(token)
+                    yield token
+                if data.get("done"):
+                    self._record_generation(data)
+                    if key:
+                        self.cache.put(key, "".join(tokens))
+                    break
+
+    def explain(self, resume_text: str, job_text: str) -> str:
+        """Generates the match explanation for one candidate (condensing the resume on a cache miss only)."""
+        key = self.explanation_key(resume_text, job_text) if self.cache is not None else None
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        return self.generate(self.prompt(resume_text, job_text), cache_key=key)
+
+    def stream_explain(self, resume_text: str, job_text: str) -> Iterator[str]:
+        """Streams the match explanation for one candidate (condensing the resume on a cache miss only)."""
+        key = self.explanation_key(resume_text, job_text) if self.cache is not None else None
+        cached = self._cached(key)
+        if cached is not None:
+            yield cached
+            return
+        yield from self.stream(self.prompt(resume_text, job_text), cache_key=key)
+
+    async def explain_many(
+        self,
+        resume_texts: List[str],
+        job_text: str,
+        concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        Explains several candidates concurrently.
+
+        Requests run on worker threads (sharing the pooled session), at most
+        ``concurrency`` at a time. Failures are returned as error messages
+        in place of the explanation, like generate_explanation.
+
+        Args:
+            resume_texts: Resume texts of the candidates to explain
+            job_text: The job posting text
+            concurrency: Maximum parallel requests (defaults to config)
+
+        Returns:
+            Explanations in the order of ``resume_texts``
+        """
+        if concurrency is None:
+            concurrency = config.ollama.concurrency if config else 3
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        loop = asyncio.get_running_loop()
+
+        async def explain_one(resume_text: str) -> str:
+            async with semaphore:
+                return await loop.run_in_executor(None, _explain_or_error, self, resume_text, job_text)
+
+        return await asyncio.gather(*(explain_one(text) for text in resume_texts))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: Optional[OllamaClient] = None
+_client_lock = threading.Lock()
+_explanation_cache: Optional[ExplanationCache] = None
+
+
+def get_explanation_cache() -> Optional[ExplanationCache]:
+    """
+    Return the process-wide explanation cache.
+
+    Returns:
+        ExplanationCache instance, or None if caching is disabled
+    """
+    global _explanation_cache
+    if not config or not config.cache.enabled:
+        return None
+
+    with _client_lock:
+        if _explanation_cache is None:
+            _explanation_cache = ExplanationCache(
+                os.path.join(config.cache.dir, "explanations.sqlite3"),
+                ttl_seconds=config.cache.explanation_ttl_hours * 3600,
+                max_entries=config.cache.explanation_max_entries
+            )
+        return _explanation_cache
+
+
+def get_client() -> OllamaClient:
+    """Return the shared Ollama client (one connection pool per process)."""
+    global _client
+    cache = get_explanation_cache()
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient(cache=cache)
+        return _client
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, requests.exceptions.ConnectionError):
         return "⚠️ Error: Ollama is not running. Please launch the Ollama app."
+    if isinstance(error, requests.exceptions.Timeout):
+        return "⚠️ Error: Ollama did not answer in time. Try again or increase OLLAMA_TIMEOUT."
+    if isinstance(error, OllamaError):
+        return f"⚠️ {error}"
+    return f"⚠️ An error occurred: {str(error)}"
+
+
+def _explain_or_error(client: OllamaClient, resume_text: str, job_text: str) -> str:
+    try:
+        return client.explain(resume_text, job_text)
+    except Exception as e:
+        if logger:
+            logger.error(f"Explanation failed: {e}")
+        return _error_message(e)
+
+
+def generate_explanation(resume_text: str, job_text: str) -> str:
+    """
+    Sends the resume and job description to the local Ollama instance
+    (running Llama 3) and returns a justification for the match.
+    """
+    return _explain_or_error(get_client(), resume_text, job_text)
+
+
+def stream_explanation(resume_text: str, job_text: str) -> Iterator[str]:
+    """
+    Like generate_explanation, but yields the answer token by token so the
+    UI can render it progressively (e.g. with st.write_stream).
+    """
+    try:
+        yield from get_client().stream_explain(resume_text, job_text)
     except Exception as e:
-        return f"⚠️ An error occurred: {str(e)}"
\ No newline at end of file
+        if logger:
+            logger.error(f"Explanation failed: {e}")
+        yield _error_message(e)
+
+
+def explain_candidates(
+    resume_texts: List[str],
+    job_text: str,
+    concurrency: Optional[int] = None
+) -> List[str]:
+    """
+    Synchronous wrapper around OllamaClient.explain_many for scripts and
+    the Streamlit app.
+    """
+    return asyncio.run(get_client().explain_many(resume_texts, job_text, concurrency))
@@ -0,0 +1,160 @@
+"""
+Persistent cache of LLM explanations.
+
+Keys are SHA-256 digests of everything that determines Ollama's answer:
+model name, sampling options and the prompt (job text + truncated resume).
+Entries live in a SQLite database shared by every Streamlit session and
+process, expire after a TTL and are evicted least-recently-used once the
+cache exceeds its size limit.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    from logger import logger
+except ImportError:
+    logger = None
+
+
+def make_key(model: str, options: Dict, prompt: str) -> str:
+    """
+    Build the cache key of a generation request.
+
+    Args:
+        model: Ollama model name
+        options: Sampling options (temperature, seed, num_ctx, ...)
+        prompt: Full prompt text
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    material = json.dumps({"model": model, "options": options, "prompt": prompt}, sort_keys=True)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """
+    SQLite-backed explanation store with TTL and size-based eviction.
+
+    Args:
+        db_path: Path of the SQLite database file (created if missing)
+        ttl_seconds: Age after which an entry is ignored and purged (0 = never)
+        max_entries: Maximum number of entries kept (least recently used go first)
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 5000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS explanations ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_explanations_accessed ON explanations (accessed_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the cache thread-safe
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached explanation.
+
+        Args:
+            key: Key built with make_key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM explanations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._is_expired(row[1], now):
+                conn.execute("DELETE FROM explanations WHERE key = ?", (key,))
+                row = None
+            if row is not None:
+                conn.execute("UPDATE explanations SET accessed_at = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            hits, misses = self.hits, self.misses
+        if logger:
+            logger.debug(
+                f"Explanation cache {'hit' if row else 'miss'} "
+                f"(hit rate {hits / (hits + misses):.0%} over {hits + misses} lookups)"
+            )
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store an explanation, then enforce the TTL and size limit.
+
+        Args:
+            key: Key built with make_key
+            response: Generated explanation
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO explanations (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            if self.ttl_seconds:
+                conn.execute("DELETE FROM explanations WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM explanations WHERE key IN ("
+                " SELECT key FROM explanations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        """Remove every cached explanation."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM explanations")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters of this process."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
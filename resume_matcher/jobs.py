@@ -0,0 +1,311 @@
+"""
+Background analysis jobs.
+
+The Streamlit button handler used to parse, encode and rank inline, which
+held the session's script thread for the whole analysis and lost the work
+on page refresh. JobManager runs analyses on a thread pool instead:
+
+- submit() returns a job id immediately
+- get() returns a snapshot with progress (parsed n/N, embedded n/N) and the
+  partial ranking of the resumes embedded so far
+- completed jobs stay in a bounded LRU store; submitting the same files and
+  job description again returns the finished job instantly
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from resume_matcher.dedup import deduplicate
+from resume_matcher import reranker
+from resume_matcher.chunker import ChunkedEmbeddings, resolve_pooling
+from resume_matcher.matcher import RankedResume, _score_embeddings, embed_resumes, get_model, rank_resumes
+from resume_matcher.metrics import metrics
+from resume_matcher.resume_parser import check_upload_size, iter_uploaded_resumes
+from resume_matcher.skills import SkillFilter, SkillIndex
+from resume_matcher.text_cache import BytesLike, bytes_digest
+from resume_matcher.vector_index import normalize, top_k_indices
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+QUEUED = "queued"
+PARSING = "parsing"
+EMBEDDING = "embedding"
+RANKING = "ranking"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED_STATES = (DONE, FAILED)
+
+
+@dataclass
+class AnalysisJob:
+    """State of one analysis; JobManager.get returns copies of it."""
+    id: str
+    job_description: str
+    total: int
+    status: str = QUEUED
+    parsed: int = 0
+    to_embed: int = 0
+    embedded: int = 0
+    results: List[RankedResume] = field(default_factory=list)
+    resumes: List[Dict] = field(default_factory=list)  # parsed uploads, in upload order
+    skills: Optional[SkillIndex] = None  # extracted from ``resumes`` at parse time
+    skill_filter: Optional[SkillFilter] = None
+    # embed_resumes output for ``resumes``, when the job embedded all of them
+    embeddings: Optional[Union[np.ndarray, ChunkedEmbeddings]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        """Overall progress in [0, 1]: parsing and embedding weigh half each."""
+        if self.status == DONE:
+            return 1.0
+        parsed = self.parsed / self.total if self.total else 0.0
+        embedded = self.embedded / self.to_embed if self.to_embed else 0.0
+        return 0.5 * (parsed + embedded)
+
+
+def unique_names(names: List[str]) -> List[str]:
+    """Base names of the uploads, with " (2)", " (3)"... added to repeated ones."""
+    seen: Dict[str, int] = {}
+    unique = []
+    for name in names:
+        name = os.path.basename(name)
+        count = seen.get(name, 0) + 1
+        seen[name] = count
+        if count > 1:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem} ({count}){ext}"
+        unique.append(name)
+    return unique
+
+
+def fingerprint(
+    files: List[Tuple[str, BytesLike]],
+    job_description: str,
+    skill_filter: Optional[SkillFilter] = None
+) -> str:
+    """Identify an analysis by its file contents, file names, job text and skill filter."""
+    digest = hashlib.sha256(job_description.encode("utf-8"))
+    if skill_filter:
+        digest.update(skill_filter.key().encode("utf-8"))
+    for name, data in files:
+        digest.update(name.encode("utf-8"))
+        digest.update(bytes_digest(data).encode("ascii"))
+    return digest.hexdigest()
+
+
+class JobManager:
+    """
+    Runs analysis jobs on a thread pool and keeps their state.
+
+    Args:
+        max_workers: Analyses running at the same time
+        max_completed: Finished jobs kept for instant reruns (LRU)
+        upload_dir: Parent of the per-job directories PDFs are spilled to
+            when they are parsed on the process pool
+        embed_batch_size: Resumes embedded between two progress updates
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_completed: int = 20,
+        upload_dir: Optional[str] = None,
+        embed_batch_size: int = 32
+    ):
+        self.max_completed = max_completed
+        self.upload_dir = upload_dir or (config.app.upload_dir if config else "uploads")
+        self.embed_batch_size = embed_batch_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._by_fingerprint: Dict[str, str] = {}
+
+    def submit(
+        self,
+        files: List[Tuple[str, BytesLike]],
+        job_description: str,
+        skill_filter: Optional[SkillFilter] = None
+    ) -> str:
+        """
+        Queue an analysis.
+
+        Args:
+            files: (file name, PDF content) pairs; memoryviews such as
+                ``uploaded_file.getbuffer()`` are used without copying
+            job_description: The job posting text
+            skill_filter: Required / preferred skills and minimum experience
+
+        Returns:
+            Job id to poll with get()
+
+        Raises:
+            UploadTooLarge: If the files exceed config.app.max_file_size_mb in total
+        """
+        check_upload_size(files)
+        key = fingerprint(files, job_description, skill_filter)
+        with self._lock:
+            existing_id = self._by_fingerprint.get(key)
+            existing = self._jobs.get(existing_id) if existing_id else None
+            if existing is not None and existing.status != FAILED:
+                self._jobs.move_to_end(existing_id)
+                return existing_id
+
+            job = AnalysisJob(
+                id=uuid.uuid4().hex, job_description=job_description, total=len(files), skill_filter=skill_filter
+            )
+            self._jobs[job.id] = job
+            self._by_fingerprint[key] = job.id
+
+        if logger:
+            logger.info(f"Queued analysis job {job.id} ({len(files)} files)")
+        self._executor.submit(self._run, job, files)
+        return job.id
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        """
+        Snapshot of a job's state.
+
+        Args:
+            job_id: Id returned by submit()
+
+        Returns:
+            Copy of the job, or None if unknown or evicted
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return replace(job, results=list(job.results))
+
+    def _update(self, job: AnalysisJob, **changes) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+
+    def _evict(self) -> None:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished[:max(0, len(finished) - self.max_completed)]:
+                del self._jobs[job_id]
+            live = set(self._jobs)
+            self._by_fingerprint = {k: v for k, v in self._by_fingerprint.items() if v in live}
+
+    def _run(self, job: AnalysisJob, files: List[Tuple[str, BytesLike]]) -> None:
+        job_dir = os.path.join(self.upload_dir, job.id)
+        try:
+            with metrics.run("analysis"):
+                resumes = self._parse(job, files, job_dir)
+                self._embed_and_rank(job, resumes)
+            self._update(job, status=DONE, finished_at=time.time())
+            if logger:
+                logger.info(f"Analysis job {job.id} done in {job.finished_at - job.created_at:.1f}s")
+        except Exception as e:
+            if logger:
+                logger.error(f"Analysis job {job.id} failed: {e}", exc_info=True)
+            self._update(job, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            self._evict()
+
+    def _parse(self, job: AnalysisJob, files: List[Tuple[str, BytesLike]], job_dir: str) -> List[Dict]:
+        """
+        Parse the uploads from memory (spilling to the job directory only
+        for the process pool), fold duplicates into their first copy, then
+        extract the skills of the remaining resumes.
+        """
+        self._update(job, status=PARSING)
+        names = unique_names([name for name, _ in files])
+        upload_order = {name: i for i, name in enumerate(names)}
+        resumes = []
+
+        for resume in iter_uploaded_resumes(list(zip(names, (data for _, data in files))), spill_dir=job_dir):
+            resumes.append(resume)
+            self._update(job, parsed=job.parsed + 1)
+        # Unreadable files are skipped but still count as processed
+        self._update(job, parsed=len(files))
+
+        resumes.sort(key=lambda r: upload_order[r['filename']])
+        if config is None or config.dedup.enabled:
+            resumes = deduplicate(resumes)
+        skills = None
+        if job.skill_filter or config is None or config.skills.enabled:
+            skills = SkillIndex.build([r['content'] for r in resumes])
+        self._update(job, resumes=resumes, skills=skills)
+        return resumes
+
+    def _embed_and_rank(self, job: AnalysisJob, resumes: List[Dict]) -> None:
+        """Embed in batches, publishing a partial ranking after each one."""
+        # Resumes failing the skill filter are never embedded
+        rows = np.arange(len(resumes))
+        boosts = np.zeros(len(resumes), dtype=np.float32)
+        if job.skill_filter:
+            rows = np.flatnonzero(job.skills.mask(job.skill_filter))
+            boosts = job.skills.boosts(job.skill_filter)
+        self._update(job, status=EMBEDDING, to_embed=len(rows))
+        if not len(rows):
+            return
+
+        if config and config.retrieval.mode != "semantic":
+            # Hybrid retrieval only embeds the resumes BM25 selects, so
+            # there is no point embedding the whole pool batch by batch
+            self._update(job, status=RANKING)
+            results = rank_resumes(job.job_description, resumes, skill_filter=job.skill_filter, skill_index=job.skills)
+            self._update(job, embedded=len(rows), results=results)
+            return
+
+        # Batches are embedded in the form rank_resumes scores them (whole
+        # text or chunk pooling), so the last partial ranking is the final one
+        pooling = resolve_pooling(config.model.pooling if config else None)
+        job_matrix = normalize(get_model().encode([job.job_description]))
+        scores = np.empty(0, dtype=np.float32)
+        parts = []
+        for start in range(0, len(rows), self.embed_batch_size):
+            batch = rows[start:start + self.embed_batch_size]
+            embeddings = embed_resumes([resumes[i]['content'] for i in batch], pooling)
+            parts.append(embeddings)
+            scores = np.concatenate([scores, _score_embeddings(job_matrix, embeddings)[0] + boosts[batch]])
+            partial = [
+                RankedResume(resumes[rows[i]], int(rows[i]), float(scores[i])) for i in top_k_indices(scores, len(scores))
+            ]
+            self._update(job, embedded=start + len(batch), results=partial)
+
+        if len(rows) == len(resumes):
+            # Kept for the session's RankingContext, which would otherwise
+            # embed the whole upload set again
+            if pooling == "top":
+                embeddings = ChunkedEmbeddings.concatenate(parts)
+            else:
+                embeddings = np.vstack(parts)
+            self._update(job, embeddings=embeddings)
+
+        if config and config.reranker.enabled:
+            self._update(job, status=RANKING)
+            self._update(job, results=reranker.rerank(job.job_description, partial))
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -1,8 +1,18 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import streamlit as st
-from typing import Optional, List, Dict, Any
+import threading
+from collections.abc import Mapping
+from typing import Optional, List, Dict, Any, Iterator, Union
+
+from resume_matcher import reranker
+from resume_matcher.bm25 import BM25Index, reciprocal_rank_fusion
+from resume_matcher.chunker import ChunkedEmbeddings, resolve_pooling, split_documents
+from resume_matcher.dedup import Deduplicator, fold_duplicates
+from resume_matcher.embedding_cache import EmbeddingCache
+from resume_matcher.embedding_pool import encode_local, get_embedding_pool
+from resume_matcher.metrics import metrics
+from resume_matcher.quantized_store import QuantizedStore
+from resume_matcher.skills import SkillFilter, SkillIndex
+from resume_matcher.vector_index import normalize, top_k_indices
 
 try:
     from config import config
@@ -13,111 +23,649 @@ except ImportError:
     logger = None
 
 
-@st.cache_resource(show_spinner="Loading embedding model...")
-def get_model(model_name: Optional[str] = None) -> SentenceTransformer:
+RETRIEVAL_MODES = ("semantic", "prefilter", "fused")
+
+# Upper bound on the number of job x resume scores held in memory at once
+SCORE_CHUNK_ELEMENTS = 1 << 24
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+# (model name, backend) -> loaded model; shared by every session and thread
+_models: Dict[tuple, Any] = {}
+_model_lock = threading.Lock()
+
+
+class RankedResume(Mapping):
+    """
+    A ranking result that references its resume instead of copying it.
+
+    Behaves like the read-only dict rank_resumes used to return, with the
+    keys 'filename', 'score' and 'content', so ``candidate['content']`` keeps
+    working without duplicating the resume text per result.
+    """
+
+    __slots__ = ("resume", "index", "score")
+
+    _KEYS = ("filename", "score", "content")
+
+    def __init__(self, resume: Dict, index: int, score: float):
+        self.resume = resume
+        self.index = index  # position in the ranked input list
+        self.score = score
+
+    @property
+    def filename(self) -> str:
+        return self.resume['filename']
+
+    @property
+    def content(self) -> str:
+        return self.resume['content']
+
+    @property
+    def aliases(self) -> List[str]:
+        """File names of the duplicates folded into this resume (see resume_matcher.dedup)."""
+        return self.resume.get('aliases', [])
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "score":
+            return self.score
+        if key in self._KEYS:
+            return self.resume[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        return f"RankedResume(filename={self.filename!r}, score={self.score:.4f})"
+
+
+def get_model(model_name: Optional[str] = None, backend: Optional[str] = None):
     """
-    Load and cache the SentenceTransformer model.
+    Load and cache the embedding model.
 
-    Uses Streamlit's cache_resource to ensure the model is:
-    - Loaded only once per app lifecycle
-    - Shared across all sessions
-    - Persists across reruns
+    The model is a process-level singleton, so the Streamlit app, the job
+    workers, the CLI scripts and the benchmarks all share one instance.
+    sentence_transformers/torch are only imported here, on first use, which
+    keeps parser-only and CLI start-up fast.
 
     Args:
         model_name: Name of the model to load (defaults to config value)
+        backend: "torch", "torch-int8" or "onnx" (defaults to config.model.backend)
 
     Returns:
-        Loaded SentenceTransformer model
+        Loaded model (SentenceTransformer or a compatible encoder)
     """
     if config:
         model_name = model_name or config.model.name
-        cache_dir = config.model.cache_dir
-        device = config.model.device
+        backend = backend or config.model.backend
     else:
         model_name = model_name or 'all-MiniLM-L6-v2'
-        cache_dir = None
-        device = 'cpu'
+        backend = backend or 'torch'
 
-    if logger:
-        logger.info(f"Loading SentenceTransformer model: {model_name}")
+    key = (model_name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _model_lock:
+        model = _models.get(key)
+        if model is not None:
+            return model
+
+        from resume_matcher.embedding_backends import load_model
+
+        if logger:
+            logger.info(f"Loading embedding model: {model_name} (backend: {backend})")
+        try:
+            with metrics.span("model_load", model=model_name, backend=backend):
+                model = load_model(
+                    model_name,
+                    backend=backend,
+                    cache_dir=config.model.cache_dir if config else None,
+                    device=config.model.device if config else 'cpu'
+                )
+                if not config or config.model.warmup:
+                    # The first forward pass allocates buffers and picks kernels
+                    model.encode(["warm up"], show_progress_bar=False)
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to load model {model_name}: {e}", exc_info=True)
+            raise
 
-    try:
-        model = SentenceTransformer(
-            model_name,
-            cache_folder=cache_dir,
-            device=device
-        )
         if logger:
             logger.info(f"Model loaded successfully: {model_name}")
+        _models[key] = model
         return model
-    except Exception as e:
-        if logger:
-            logger.error(f"Failed to load model {model_name}: {e}", exc_info=True)
-        raise
+
+
+def preload_model() -> threading.Thread:
+    """
+    Load the embedding model (and start the embedding pool workers, if
+    configured) in a background thread.
+
+    Lets the UI render while the model loads; the first get_model() call
+    then waits on the lock instead of starting a second load.
+
+    Returns:
+        The started daemon thread
+    """
+    def load():
+        try:
+            pool = get_embedding_pool()
+            if pool is not None:
+                pool.start()
+            get_model()
+        except Exception:
+            # Already logged; the next get_model() call raises it again
+            pass
+
+    thread = threading.Thread(target=load, name="model-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def model_cache_name() -> str:
+    """Model identifier used to key cached embeddings ("name" or "name@backend")."""
+    if not config:
+        return 'all-MiniLM-L6-v2'
+    if config.model.backend == "torch":
+        return config.model.name
+    # Quantized/exported backends give slightly different vectors
+    return f"{config.model.name}@{config.model.backend}"
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Return the process-wide embedding cache for the configured model.
+
+    Returns:
+        EmbeddingCache instance, or None if caching is disabled
+    """
+    global _embedding_cache
+    if not config or not config.cache.enabled:
+        return None
+
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache(
+                config.cache.dir,
+                model_cache_name(),
+                max_entries=config.cache.embedding_max_entries
+            )
+        return _embedding_cache
+
+
+def _encode(texts: List[str]) -> np.ndarray:
+    """
+    Encode texts in-process or on the embedding pool, whichever suits the
+    batch size (see embedding_pool).
+    """
+    pool = get_embedding_pool()
+    if pool is not None and pool.should_use(len(texts)):
+        metrics.incr("embedding_pool_texts", len(texts))
+        return pool.encode(texts)
+    return encode_local(get_model(), texts)
+
+
+def encode_texts(text_list: list) -> np.ndarray:
+    """
+    Converts a list of strings into a matrix of vectors, bypassing the cache.
+
+    For transient texts such as job descriptions and resume passages, which
+    would otherwise push resume vectors out of the embedding cache.
+
+    Args:
+        text_list: List of text strings to embed
+
+    Returns:
+        numpy array of embeddings
+    """
+    with metrics.span("encode", batch_size=len(text_list)):
+        return _encode(text_list)
+
 
 def get_embeddings(text_list: list):
     """
     Converts a list of strings into a matrix of vectors.
 
+    Vectors already present in the embedding cache are reused; only unseen
+    texts are sent to the model.
+
     Args:
         text_list: List of text strings to embed
 
     Returns:
         numpy array of embeddings
     """
+    cache = get_embedding_cache()
+
+    if cache is None:
+        if logger:
+            logger.debug(f"Generating embeddings for {len(text_list)} texts")
+        with metrics.span("encode", batch_size=len(text_list)):
+            return _encode(text_list)
+
+    cached = cache.get_many(text_list)
+    missing = [i for i, vector in enumerate(cached) if vector is None]
+
+    if missing:
+        # Encode each distinct unseen text once, even if repeated in the batch
+        unique_texts = list(dict.fromkeys(text_list[i] for i in missing))
+        if logger:
+            logger.debug(f"Generating embeddings for {len(unique_texts)} texts")
+        with metrics.span("encode", batch_size=len(unique_texts)):
+            new_embeddings = _encode(unique_texts)
+        cache.put_many(unique_texts, new_embeddings)
+        by_text = dict(zip(unique_texts, new_embeddings))
+        for i in missing:
+            cached[i] = by_text[text_list[i]]
+
+    metrics.incr("embedding_cache_hits", len(text_list) - len(missing))
+    metrics.incr("embedding_cache_misses", len(missing))
+    if logger:
+        stats = cache.stats()
+        logger.info(
+            f"Embedding cache: {len(text_list) - len(missing)} hits, {len(missing)} misses "
+            f"(total {stats['hits']} hits / {stats['misses']} misses, {stats['entries']} entries)"
+        )
+
+    if not cached:
+        return np.empty((0, cache.dim or 0), dtype=np.float32)
+    return np.vstack(cached)
+
+def embed_resume_chunks(resume_texts: List[str]) -> ChunkedEmbeddings:
+    """
+    Embeds long resumes as overlapping token windows instead of truncating them.
+
+    All chunks of all resumes go through a single get_embeddings call
+    (so chunks are cached too), longest first so similarly sized chunks
+    share padded batches.
+
+    Args:
+        resume_texts: Resume texts
+
+    Returns:
+        ChunkedEmbeddings holding chunk texts, owners and normalized vectors
+    """
     model = get_model()
+    tokenizer = getattr(model, "tokenizer", None)
+    # Leave room for the [CLS]/[SEP] tokens added by the model
+    max_tokens = (getattr(model, "max_seq_length", None) or 256) - 2
+    overlap = config.model.chunk_overlap if config else 32
+
+    chunks, owners = split_documents(resume_texts, tokenizer, max_tokens, overlap)
     if logger:
-        logger.debug(f"Generating embeddings for {len(text_list)} texts")
-    embeddings = model.encode(text_list)
-    return embeddings
+        logger.debug(f"Split {len(resume_texts)} resumes into {len(chunks)} chunks")
+
+    if not chunks:
+        return ChunkedEmbeddings(chunks, owners, np.empty((0, 0), dtype=np.float32), len(resume_texts))
+
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]), reverse=True)
+    encoded = np.asarray(get_embeddings([chunks[i] for i in order]), dtype=np.float32)
+    vectors = np.empty_like(encoded)
+    vectors[order] = encoded
+    return ChunkedEmbeddings(chunks, owners, normalize(vectors), len(resume_texts))
 
-def rank_resumes(job_description: str, resumes: list):
+
+def embed_resumes(resume_texts: List[str], pooling: Optional[str] = None) -> Union[np.ndarray, ChunkedEmbeddings]:
+    """
+    Embeds resumes once, in the form they are scored in.
+
+    For callers that rank the same resumes against several job descriptions
+    (see rank_resumes' ``resume_embeddings``).
+
+    Args:
+        resume_texts: Resume texts
+        pooling: Resolved pooling method (None = whole-resume embeddings)
+
+    Returns:
+        Normalized matrix with one row per resume (whole text, "mean" or
+        "max" pooling), or the ChunkedEmbeddings for "top" pooling
+    """
+    if pooling is None:
+        return normalize(get_embeddings(resume_texts))
+    chunked = embed_resume_chunks(resume_texts)
+    return chunked if pooling == "top" else chunked.pooled(pooling)
+
+
+def _score_embeddings(job_matrix: np.ndarray, embeddings: Union[np.ndarray, ChunkedEmbeddings]) -> np.ndarray:
+    """Cosine scores (jobs x resumes) of normalized job vectors against embed_resumes output."""
+    if isinstance(embeddings, ChunkedEmbeddings):
+        return embeddings.score_matrix(job_matrix, "top")
+    return job_matrix @ embeddings.T
+
+
+def _resume_score_matrix(job_matrix: np.ndarray, resume_texts: List[str], pooling: Optional[str]):
+    """
+    Cosine scores (jobs x resumes), as a generator of job blocks.
+
+    Whole-resume embeddings are used when pooling is None, chunk embeddings
+    pooled with the given method otherwise. Blocks are sized so at most
+    SCORE_CHUNK_ELEMENTS scores are in memory at once.
+    """
+    job_matrix = normalize(job_matrix)
+    embeddings = embed_resumes(resume_texts, pooling)
+    if isinstance(embeddings, ChunkedEmbeddings):
+        width = max(len(embeddings.chunks), len(resume_texts))
+    else:
+        width = len(resume_texts)
+
+    jobs_per_block = max(1, SCORE_CHUNK_ELEMENTS // max(width, 1))
+    for start in range(0, len(job_matrix), jobs_per_block):
+        jobs = job_matrix[start:start + jobs_per_block]
+        with metrics.span("score", jobs=len(jobs), resumes=len(resume_texts)):
+            block = _score_embeddings(jobs, embeddings)
+        yield block
+
+
+def rank_resumes(
+    job_description: str,
+    resumes: list,
+    top_k: Optional[int] = None,
+    pooling: Optional[str] = None,
+    retrieval: Optional[str] = None,
+    lexical_index: Optional[BM25Index] = None,
+    rerank: Optional[bool] = None,
+    job_embedding: Optional[np.ndarray] = None,
+    resume_embeddings: Optional[Union[np.ndarray, ChunkedEmbeddings]] = None,
+    skill_filter: Optional[SkillFilter] = None,
+    skill_index: Optional[SkillIndex] = None
+) -> List[RankedResume]:
     """
     Ranks resumes by similarity to job description using cosine similarity.
 
     Steps:
     1. Vectorizes the Job Description
-    2. Vectorizes all Resumes
+    2. Vectorizes all Resumes (whole text, or chunks when pooling is set)
     3. Calculates Cosine Similarity
-    4. Returns a sorted list of matches
+    4. Selects and sorts the best matches
+
+    With retrieval="prefilter", a BM25 search first keeps the
+    ``config.retrieval.prefilter_candidates`` best lexical matches and only
+    those are embedded and scored (if nothing matches lexically, every
+    resume is scored). With retrieval="fused", the embedding ranking and the
+    BM25 ranking are merged by reciprocal rank fusion.
+
+    With rerank enabled, the best ``config.reranker.top_n`` results are
+    re-scored by a cross-encoder (see resume_matcher.reranker).
+
+    A skill_filter is applied before anything else: resumes missing a
+    required skill or the minimum experience are neither embedded nor
+    scored, and preferred skills add to the score of those that remain
+    (see resume_matcher.skills).
 
     Args:
         job_description: The job posting text
         resumes: List of dicts with 'filename' and 'content' keys
+        top_k: Only return the k best matches (None = all). Selection uses
+            np.argpartition, so only the kept results are sorted.
+        pooling: "mean", "max" or "top" to score token-bounded chunks of each
+            resume instead of its truncated full text; "none" disables it
+            (defaults to config.model.pooling)
+        retrieval: "semantic", "prefilter" or "fused" (defaults to
+            config.retrieval.mode)
+        lexical_index: BM25Index keyed by filename, kept by the caller across
+            calls; resumes missing from it are added. Built for this call
+            when None.
+        rerank: Re-order the shortlist with the cross-encoder (defaults to
+            config.reranker.enabled)
+        job_embedding: Embedding of the job description, when the caller
+            already has it (e.g. from a MicroBatcher)
+        resume_embeddings: embed_resumes output for ``resumes`` with the same
+            pooling, kept by the caller across calls; the resumes are then
+            scored without being embedded again
+        skill_filter: Required / preferred skills and minimum experience
+        skill_index: SkillIndex of ``resumes``, extracted at ingest and kept
+            by the caller; extracted for this call when None
 
     Returns:
-        List of dicts with 'filename', 'score', and 'content', sorted by score descending
+        List of RankedResume (dict-like with 'filename', 'score' and 'content'),
+        sorted by score descending; ties keep their input order. In fused
+        mode the order is the fused one and 'score' stays the cosine
+        similarity. With rerank, every result carries the blended score,
+        the ones past the shortlist an estimate of it, and the order stays
+        by score (see resume_matcher.reranker). Preferred skill boosts are
+        included in 'score'.
+
+    Raises:
+        ValueError: If a filter skill is not in the skill vocabulary
     """
-    model = get_model()
+    if not resumes:
+        return []
+
+    pooling = resolve_pooling(pooling if pooling is not None else (config.model.pooling if config else None))
+    retrieval = retrieval or (config.retrieval.mode if config else "semantic")
+    if retrieval not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode: {retrieval} (expected one of {', '.join(RETRIEVAL_MODES)})")
 
     if logger:
-        logger.info(f"Ranking {len(resumes)} resumes against job description")
+        logger.info(f"Ranking {len(resumes)} resumes against job description ({retrieval})")
+
+    # Structured criteria first: a few bitset operations over every resume
+    allowed = None
+    boosts = None
+    if skill_filter:
+        if skill_index is None:
+            skill_index = SkillIndex.build([r['content'] for r in resumes])
+        with metrics.span("skill_filter", resumes=len(resumes)):
+            allowed = skill_index.mask(skill_filter)
+            boosts = skill_index.boosts(skill_filter)
+        if not allowed.any():
+            if logger:
+                logger.info("No resume meets the skill filter")
+            return []
+
+    # Lexical candidates, when a hybrid mode is on
+    candidates = np.arange(len(resumes)) if allowed is None else np.flatnonzero(allowed)
+    lexical = None
+    if retrieval != "semantic":
+        with metrics.span("bm25", resumes=len(resumes)):
+            lexical = _lexical_scores(job_description, resumes, lexical_index)
+        if allowed is not None:
+            lexical[~allowed] = 0
+        if retrieval == "prefilter":
+            limit = config.retrieval.prefilter_candidates if config else 200
+            matched = top_k_indices(lexical, limit)
+            matched = matched[lexical[matched] > 0]
+            if len(matched):
+                candidates = np.sort(matched)
+            elif logger:
+                logger.info("No lexical match for the job description, scoring every candidate")
 
     # 1. Get embedding for the job description
-    # Reshape is needed because cosine_similarity expects a 2D array
-    job_embedding = model.encode([job_description])
-
-    # 2. Get embeddings for all resumes (just the content text)
-    resume_texts = [r['content'] for r in resumes]
-    resume_embeddings = model.encode(resume_texts)
-    
-    # 3. Calculate similarity
-    # Result is a matrix of shape (1, n_resumes)
-    scores = cosine_similarity(job_embedding, resume_embeddings)[0]
-    
-    # 4. Attach scores to resume objects and sort
-    results = []
-    for i, score in enumerate(scores):
-        results.append({
-            "filename": resumes[i]['filename'],
-            "score": float(score), # Convert numpy float to python float
-            "content": resumes[i]['content']
-        })
-    
-    # Sort by score descending (highest match first)
-    results.sort(key=lambda x: x['score'], reverse=True)
+    if job_embedding is None:
+        with metrics.span("encode", batch_size=1):
+            job_embedding = get_model().encode([job_description])
+    job_embedding = np.asarray(job_embedding, dtype=np.float32).reshape(1, -1)
+
+    # 2-3. Embed the resumes (cached vectors are reused) and score them
+    scores = np.zeros(len(resumes), dtype=np.float32)
+    if resume_embeddings is not None:
+        with metrics.span("score", jobs=1, resumes=len(resumes)):
+            scores[candidates] = _score_embeddings(normalize(job_embedding), resume_embeddings)[0][candidates]
+    else:
+        resume_texts = [resumes[i]['content'] for i in candidates]
+        scores[candidates] = next(_resume_score_matrix(job_embedding, resume_texts, pooling))[0]
+    if boosts is not None:
+        scores[candidates] += boosts[candidates]
+
+    # 4. Keep the best matches (highest first) and wrap them without copying text
+    if rerank is None:
+        rerank = config.reranker.enabled if config else False
+    k = len(candidates) if top_k is None else min(top_k, len(candidates))
+    if rerank:
+        # The cross-encoder needs the whole shortlist, even beyond top_k
+        k = max(k, min(config.reranker.top_n if config else 20, len(candidates)))
+    with metrics.span("sort", resumes=len(candidates)):
+        if retrieval == "fused":
+            rrf_k = config.retrieval.rrf_k if config else 60
+            lexical_order = top_k_indices(lexical, len(lexical))
+            fused = reciprocal_rank_fusion(
+                [candidates[top_k_indices(scores[candidates], len(candidates))], lexical_order[lexical[lexical_order] > 0]],
+                len(resumes),
+                rrf_k
+            )
+            if allowed is not None:
+                fused[~allowed] = -np.inf
+            best = top_k_indices(fused, k)
+        else:
+            best = candidates[top_k_indices(scores[candidates], k)]
+        results = [RankedResume(resumes[i], int(i), float(scores[i])) for i in best]
+
+    if rerank:
+        results = reranker.rerank(job_description, results)
+        if top_k is not None:
+            results = results[:top_k]
 
     if logger and results:
-        logger.info(f"Ranking complete. Top score: {results[0]['score']:.4f}")
+        logger.info(f"Ranking complete. Top score: {results[0].score:.4f}")
+
+    return results
+
+
+def score_texts(job_embedding: np.ndarray, resume_texts: List[str], pooling: Optional[str] = None) -> np.ndarray:
+    """
+    Cosine scores of one job embedding against resume texts.
+
+    Resumes are embedded through the embedding cache, as in rank_resumes.
+
+    Args:
+        job_embedding: Embedding of the job description (1D or 1 x dim)
+        resume_texts: Resume texts
+        pooling: Chunk pooling method, as in rank_resumes (defaults to config)
+
+    Returns:
+        1D float32 array aligned with ``resume_texts``
+    """
+    if not resume_texts:
+        return np.empty(0, dtype=np.float32)
+    pooling = resolve_pooling(pooling if pooling is not None else (config.model.pooling if config else None))
+    job_matrix = np.asarray(job_embedding, dtype=np.float32).reshape(1, -1)
+    return np.asarray(next(_resume_score_matrix(job_matrix, resume_texts, pooling))[0], dtype=np.float32)
 
-    return results
\ No newline at end of file
+
+def _lexical_scores(job_description: str, resumes: list, lexical_index: Optional[BM25Index]) -> np.ndarray:
+    """BM25 scores aligned with ``resumes``."""
+    if lexical_index is None:
+        lexical_index = BM25Index()
+        lexical_index.add([str(i) for i in range(len(resumes))], [r['content'] for r in resumes])
+        return lexical_index.scores(job_description)
+
+    missing = [r for r in resumes if r['filename'] not in lexical_index]
+    if missing:
+        lexical_index.add([r['filename'] for r in missing], [r['content'] for r in missing])
+    rows = [lexical_index.row_of(r['filename']) for r in resumes]
+    return lexical_index.scores(job_description)[rows]
+
+
+def rank_many(
+    job_descriptions: List[str],
+    resumes: list,
+    top_k: Optional[int] = 10,
+    pooling: Optional[str] = None
+) -> List[List[RankedResume]]:
+    """
+    Ranks one resume pool against many job descriptions at once.
+
+    The pool is encoded once (through the embedding cache) and all jobs in a
+    single batch. Scores come from one normalized matrix product, computed
+    in blocks of jobs so at most SCORE_CHUNK_ELEMENTS scores are in memory.
+    Duplicate resumes are folded into their first copy first (unless
+    config.dedup is disabled), so copies neither get encoded nor take
+    several slots of a ranking; the copy's 'aliases' lists them.
+
+    Args:
+        job_descriptions: Job posting texts
+        resumes: List of dicts with 'filename' and 'content' keys
+        top_k: Matches kept per job (None = all)
+        pooling: Chunk pooling method, as in rank_resumes
+
+    Returns:
+        One list of RankedResume per job description, in the same order,
+        each sorted by score descending (same ordering as rank_resumes);
+        RankedResume.index is the position in ``resumes``
+    """
+    if not job_descriptions:
+        return []
+    if not resumes:
+        return [[] for _ in job_descriptions]
+
+    model = get_model()
+    pooling = resolve_pooling(pooling if pooling is not None else (config.model.pooling if config else None))
+
+    if logger:
+        logger.info(f"Ranking {len(resumes)} resumes against {len(job_descriptions)} job descriptions")
+
+    positions = list(range(len(resumes)))
+    pool = resumes
+    if config is None or config.dedup.enabled:
+        deduplicator = Deduplicator()
+        positions, items = zip(*fold_duplicates(resumes, deduplicator))
+        pool = [
+            dict(resumes[position], aliases=list(deduplicator.aliases[item])) if item in deduplicator.aliases
+            else resumes[position]
+            for position, item in zip(positions, items)
+        ]
+
+    with metrics.span("encode", batch_size=len(job_descriptions)):
+        job_matrix = model.encode(job_descriptions)
+    resume_texts = [r['content'] for r in pool]
+    k = len(pool) if top_k is None else top_k
+
+    rankings = []
+    for block in _resume_score_matrix(job_matrix, resume_texts, pooling):
+        with metrics.span("sort", jobs=len(block), resumes=len(pool)):
+            for scores in block:
+                best = top_k_indices(scores, k)
+                rankings.append([RankedResume(pool[i], positions[i], float(scores[i])) for i in best])
+
+    if logger:
+        logger.info(f"Batch ranking complete for {len(rankings)} job descriptions")
+
+    return rankings
+
+
+def add_to_store(store: QuantizedStore, resumes: list, ids: Optional[List[str]] = None) -> int:
+    """
+    Embeds resumes and appends them to a quantized embedding store.
+
+    Args:
+        store: Target QuantizedStore
+        resumes: List of dicts with 'filename' and 'content' keys
+        ids: Store ids (defaults to the filenames); ids already stored are skipped
+
+    Returns:
+        Number of resumes added
+    """
+    ids = ids if ids is not None else [r['filename'] for r in resumes]
+    todo = [i for i, item_id in enumerate(ids) if item_id not in store]
+    if not todo:
+        return 0
+    vectors = get_embeddings([resumes[i]['content'] for i in todo])
+    return store.add([ids[i] for i in todo], vectors)
+
+
+def rank_stored(job_description: str, store: QuantizedStore, top_k: int = 10) -> List[tuple]:
+    """
+    Ranks every resume of a quantized store against a job description.
+
+    Stored vectors are already normalized, so scoring is a chunked dot
+    product straight over the memory-mapped file.
+
+    Args:
+        job_description: The job posting text
+        store: QuantizedStore holding the resume embeddings
+        top_k: Number of matches returned
+
+    Returns:
+        List of (id, score) pairs, best first
+    """
+    with metrics.span("encode", batch_size=1):
+        job_embedding = get_model().encode([job_description])
+    with metrics.span("score", resumes=len(store), dtype=store.dtype):
+        return store.query(job_embedding[0], top_k)
@@ -0,0 +1,274 @@
+"""
+Lightweight instrumentation: timed spans, counters and observations.
+
+    from resume_matcher.metrics import metrics
+
+    with metrics.span("encode", batch_size=len(texts)):
+        ...
+    metrics.incr("embedding_cache_hits", hits)
+    metrics.observe("ollama_tokens_per_second", rate)
+
+Collected data is exported three ways:
+
+- structured JSON records, one line per span, appended to
+  ``config.metrics.json_log`` (logs/metrics.jsonl by default)
+- Prometheus text exposition format via prometheus_text(), also written to
+  ``config.metrics.prometheus_file`` after each run when configured
+- a per-run stage breakdown: spans recorded inside ``with metrics.run(...)``
+  are summed by name and kept as last_run() for the diagnostics panel
+
+When disabled (the default), span() returns a shared no-op context manager
+and incr()/observe() return immediately, so instrumented code pays one
+attribute check per call.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+class _NullSpan:
+    """No-op span used when metrics are disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("registry", "name", "attrs", "start")
+
+    def __init__(self, registry: "Metrics", name: str, attrs: Dict):
+        self.registry = registry
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.registry._record_span(self.name, duration, self.attrs)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Attach attributes known only once the span is running (e.g. page count)."""
+        self.attrs.update(attrs)
+
+
+class Metrics:
+    """
+    Thread-safe in-process metrics registry.
+
+    Args:
+        enabled: Record anything at all
+        json_log: Path of the JSON-lines span log (None = no log)
+        prometheus_file: Path rewritten with the Prometheus text export after
+            each run (None = only on demand)
+    """
+
+    def __init__(self, enabled: bool = False, json_log: Optional[str] = None, prometheus_file: Optional[str] = None):
+        self.enabled = enabled
+        self.json_log = json_log
+        self.prometheus_file = prometheus_file
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        # name -> [count, sum, max]
+        self._summaries: Dict[str, list] = {}
+        self._local = threading.local()
+        self._last_run: Optional[Dict] = None
+
+    def span(self, name: str, **attrs):
+        """
+        Time a block of code.
+
+        Args:
+            name: Stage name (e.g. "parse_pdf", "encode", "score")
+            **attrs: Attributes written to the JSON record (e.g. batch_size)
+
+        Returns:
+            Context manager; call .set(**attrs) on it to add attributes
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        """Increase a counter (e.g. cache hits)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one observation of a value (e.g. pages per PDF, tokens/s)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._observe(name, value)
+
+    def record(self, name: str, seconds: float, **attrs) -> None:
+        """
+        Record a span timed elsewhere (e.g. in a worker process).
+
+        Args:
+            name: Stage name
+            seconds: Measured duration
+            **attrs: Attributes written to the JSON record
+        """
+        if not self.enabled:
+            return
+        self._record_span(name, seconds, attrs)
+
+    def _observe(self, name: str, value: float) -> None:
+        summary = self._summaries.setdefault(name, [0, 0.0, float("-inf")])
+        summary[0] += 1
+        summary[1] += value
+        summary[2] = max(summary[2], value)
+
+    def _record_span(self, name: str, duration: float, attrs: Dict) -> None:
+        with self._lock:
+            self._observe(f"{name}_seconds", duration)
+        stages = getattr(self._local, "stages", None)
+        if stages is not None:
+            total, count = stages.get(name, (0.0, 0))
+            stages[name] = (total + duration, count + 1)
+        if self.json_log:
+            self._write_record({"ts": time.time(), "span": name, "duration_s": round(duration, 6), **attrs})
+
+    def _write_record(self, record: Dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.json_log) or ".", exist_ok=True)
+                with open(self.json_log, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                if logger:
+                    logger.warning(f"Could not write metrics record: {e}")
+
+    @contextmanager
+    def run(self, name: str) -> Iterator[None]:
+        """
+        Group the spans of one analysis run (on the current thread).
+
+        On exit the per-stage totals become last_run() and the Prometheus
+        file, if configured, is refreshed.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._local.stages = {}
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stages = self._local.stages
+            self._local.stages = None
+            breakdown = {
+                "run": name,
+                "finished_at": time.time(),
+                "total_s": time.perf_counter() - start,
+                "stages": {stage: {"seconds": total, "count": count} for stage, (total, count) in stages.items()},
+            }
+            with self._lock:
+                self._last_run = breakdown
+            if self.json_log:
+                self._write_record({"ts": time.time(), "run": name, "total_s": round(breakdown["total_s"], 6)})
+            if self.prometheus_file:
+                self.write_prometheus(self.prometheus_file)
+
+    def last_run(self) -> Optional[Dict]:
+        """Stage breakdown of the most recent completed run, if any."""
+        with self._lock:
+            return self._last_run
+
+    def snapshot(self) -> Dict:
+        """Copy of all counters and summaries."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "summaries": {
+                    name: {"count": c, "sum": s, "max": m} for name, (c, s, m) in self._summaries.items()
+                },
+            }
+
+    def prometheus_text(self, prefix: str = "recruiter_") -> str:
+        """Render counters and summaries in the Prometheus text format."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = _metric_name(prefix + name + "_total")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, summary in sorted(snapshot["summaries"].items()):
+            metric = _metric_name(prefix + name)
+            lines.append(f"# TYPE {metric} summary")
+            lines.append(f"{metric}_count {summary['count']}")
+            lines.append(f"{metric}_sum {summary['sum']}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            lines.append(f"{metric}_max {summary['max']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Atomically write the Prometheus export (node_exporter textfile style)."""
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            if logger:
+                logger.warning(f"Could not write Prometheus metrics to {path}: {e}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+            self._last_run = None
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+
+
+def _from_config() -> Metrics:
+    if not config:
+        return Metrics()
+    return Metrics(
+        enabled=config.metrics.enabled,
+        json_log=config.metrics.json_log or None,
+        prometheus_file=config.metrics.prometheus_file or None
+    )
+
+
+# Global metrics registry
+metrics = _from_config()
@@ -0,0 +1,166 @@
+"""
+Dynamic micro-batching of encode calls.
+
+Concurrent requests to the HTTP service each need a few texts embedded
+(usually one job description). Encoding them one call at a time wastes
+most of every forward pass; MicroBatcher queues them and a single thread
+encodes whatever arrived within ``max_wait_ms`` of the first waiting
+request (or ``max_size`` texts, whichever comes first) in one call.
+
+The queue is bounded: once ``max_queue`` texts are waiting, submit()
+raises QueueFull so callers can shed load instead of piling up latency.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+class QueueFull(RuntimeError):
+    """Raised by MicroBatcher.submit when too many texts are already waiting."""
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent encode requests into single calls.
+
+    Args:
+        encode: Function mapping a list of texts to a 2D array of embeddings
+        max_size: Texts per coalesced call (defaults to config)
+        max_wait_ms: Longest time the first queued request waits for others
+            (defaults to config)
+        max_queue: Texts allowed to wait before submit() raises QueueFull
+            (defaults to config)
+    """
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], np.ndarray],
+        max_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        max_queue: Optional[int] = None
+    ):
+        server = config.server if config else None
+        self.encode = encode
+        self.max_size = max_size or (server.batch_max_size if server else 64)
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else (server.batch_max_wait_ms if server else 5.0)) / 1000
+        self.max_queue = max_queue or (server.batch_max_queue if server else 1024)
+        self.batches = 0
+        self.texts = 0
+        self._queue: Deque[Tuple[List[str], Future, float]] = deque()
+        self._pending = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Texts waiting to be encoded."""
+        return self._pending
+
+    def submit(self, texts: Sequence[str], timeout: Optional[float] = None) -> np.ndarray:
+        """
+        Encode texts together with whatever else is queued.
+
+        Args:
+            texts: Texts to embed
+            timeout: Seconds to wait for the result (None = no limit)
+
+        Returns:
+            2D float32 array aligned with ``texts``
+
+        Raises:
+            QueueFull: If ``max_queue`` texts are already waiting
+        """
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self._pending + len(texts) > self.max_queue:
+                metrics.incr("encode_queue_rejected")
+                raise QueueFull(f"{self._pending} texts already waiting to be encoded")
+            self._queue.append((texts, future, time.perf_counter()))
+            self._pending += len(texts)
+            self._cond.notify()
+        return future.result(timeout)
+
+    def _next_batch(self) -> List[Tuple[List[str], Future, float]]:
+        """Wait for work, then for the batch to fill or the oldest request's deadline."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return []
+            deadline = self._queue[0][2] + self.max_wait
+            while self._pending < self.max_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, size = [], 0
+            # Always take the first request, even if it alone exceeds max_size
+            while self._queue and (not batch or size + len(self._queue[0][0]) <= self.max_size):
+                item = self._queue.popleft()
+                batch.append(item)
+                size += len(item[0])
+            self._pending -= size
+            return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            texts = [text for item in batch for text in item[0]]
+            try:
+                with metrics.span("micro_batch", texts=len(texts), requests=len(batch)):
+                    vectors = np.asarray(self.encode(texts), dtype=np.float32)
+            except Exception as e:
+                if logger:
+                    logger.error(f"Batched encode of {len(texts)} texts failed: {e}", exc_info=True)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+            metrics.observe("encode_batch_texts", len(texts))
+            start = 0
+            for item_texts, future, _ in batch:
+                future.set_result(vectors[start:start + len(item_texts)])
+                start += len(item_texts)
+
+    def stats(self) -> dict:
+        """Batch counters: calls made, texts encoded, mean texts per call."""
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch": self.texts / self.batches if self.batches else 0.0,
+            "pending": self._pending,
+        }
+
+    def close(self) -> None:
+        """Encode what is queued, then stop the batching thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
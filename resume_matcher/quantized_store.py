@@ -0,0 +1,377 @@
+"""
+Memory-mapped store of pre-normalized, optionally quantized embeddings.
+
+Keeping float32 vectors for millions of historical resumes costs
+gigabytes (384 dims x 4 bytes = 1.5 KB per resume). QuantizedStore keeps
+L2-normalized vectors on disk in one of three encodings:
+
+- float32: 4 bytes per dimension, exact
+- float16: 2 bytes per dimension
+- int8:    1 byte per dimension plus one float32 scale per vector
+           (symmetric per-vector quantization, x ~= code * scale)
+
+Vectors are normalized once on insertion, so scoring is a plain dot
+product. It runs in row chunks directly over the memory map: only one
+chunk is ever converted to float32, and the OS page cache decides what
+stays in memory.
+
+quantization_report() measures what an encoding costs in accuracy
+(Spearman rank correlation of the scores and recall@k against float32),
+so the tradeoff can be chosen per deployment.
+
+Layout of a store directory:
+
+    meta.json     dim, dtype and count
+    ids.txt       one id per line, in row order (append-only)
+    vectors.bin   count x dim codes (row-major)
+    scales.f32    count float32 scales (int8 only)
+
+Every file is appended to, so adding vectors costs the size of the batch,
+not of the store. Stores written with the ids inside meta.json are still
+read, and move to ids.txt on their next add().
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from resume_matcher.vector_index import normalize, top_k_indices
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+DTYPES = ("float32", "float16", "int8")
+
+META_FILE = "meta.json"
+IDS_FILE = "ids.txt"
+CODES_FILE = "vectors.bin"
+SCALES_FILE = "scales.f32"
+
+# Rows converted to float32 at once while scoring (~25 MB at 384 dims)
+SCORE_CHUNK_ROWS = 16384
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Encode normalized vectors.
+
+    Args:
+        vectors: 2D float array
+        dtype: "float32", "float16" or "int8"
+
+    Returns:
+        (codes, scales); scales is None except for int8
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dtype == "float32":
+        return vectors, None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"Unknown dtype: {dtype} (expected one of {', '.join(DTYPES)})")
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decode vectors produced by quantize() back to float32."""
+    vectors = np.asarray(codes, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * np.asarray(scales, dtype=np.float32)[:, None]
+    return vectors
+
+
+class QuantizedStore:
+    """
+    Append-only embedding store backed by memory-mapped files.
+
+    Opens the store at ``path`` if it exists, otherwise creates an empty one
+    (``dim`` is then taken from the first add() if not given).
+
+    Args:
+        path: Store directory
+        dim: Embedding dimension (checked against an existing store)
+        dtype: Encoding for a new store (defaults to config.index.quantization);
+            an existing store keeps its own
+    """
+
+    def __init__(self, path: str, dim: Optional[int] = None, dtype: Optional[str] = None):
+        self.path = Path(path)
+        self._codes: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._ids_view: Optional[Tuple[str, ...]] = None
+        # Bytes of ids.txt covered by meta's count; None while the ids are
+        # still inside meta.json (stores written before ids.txt)
+        self._ids_bytes: Optional[int] = None
+
+        meta_path = self.path / META_FILE
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if dim is not None and dim != meta["dim"]:
+                raise ValueError(f"Store at {path} has dimension {meta['dim']}, not {dim}")
+            self.dim = meta["dim"]
+            self.dtype = meta["dtype"]
+            if "ids" in meta:
+                self._ids: List[str] = list(meta["ids"])
+            else:
+                self._ids = self._read_ids(meta["count"])
+        else:
+            self.dim = dim
+            self.dtype = dtype or (config.index.quantization if config else "float16")
+            self._ids = []
+            self._ids_bytes = 0
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unknown dtype: {self.dtype} (expected one of {', '.join(DTYPES)})")
+        self._rows: Dict[str, int] = {item_id: row for row, item_id in enumerate(self._ids)}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> Tuple[str, ...]:
+        """Ids in row order, as a read-only view (rebuilt only after an add)."""
+        if self._ids_view is None:
+            self._ids_view = tuple(self._ids)
+        return self._ids_view
+
+    def _read_ids(self, count: int) -> List[str]:
+        """The first ``count`` lines of ids.txt; lines past them are leftovers of an interrupted add()."""
+        ids, size = [], 0
+        with open(self.path / IDS_FILE, "rb") as f:
+            for line in f:
+                if len(ids) == count:
+                    break
+                ids.append(line.rstrip(b"\n").decode("utf-8"))
+                size += len(line)
+        if len(ids) != count:
+            raise ValueError(f"Store at {self.path} lists {len(ids)} ids, expected {count}")
+        self._ids_bytes = size
+        return ids
+
+    @property
+    def bytes_per_vector(self) -> int:
+        dim = self.dim or 0
+        return dim * np.dtype(self.dtype).itemsize + (4 if self.dtype == "int8" else 0)
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> int:
+        """
+        Normalize, encode and append vectors.
+
+        Ids already in the store are skipped (the store is append-only).
+
+        Args:
+            ids: Unique identifiers (e.g. resume digests)
+            vectors: 2D array of embeddings aligned with ``ids``
+
+        Returns:
+            Number of vectors appended
+        """
+        vectors = normalize(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+        # Last occurrence wins when an id repeats within the batch
+        batch = {item_id: row for row, item_id in enumerate(ids) if item_id not in self._rows}
+        if not batch:
+            return 0
+        new_ids = list(batch)
+        keep = list(batch.values())
+        if any("\n" in item_id for item_id in new_ids):
+            raise ValueError("ids must not contain line breaks")
+
+        codes, scales = quantize(vectors[keep], self.dtype)
+        self.path.mkdir(parents=True, exist_ok=True)
+        # Release the read-only maps; they are reopened with the new shape
+        self._codes = self._scales = None
+        # Data first, metadata last: after a crash the extra bytes past
+        # meta's count are simply overwritten by the next add()
+        self._append(CODES_FILE, np.ascontiguousarray(codes).tobytes(), len(self) * self.dim * codes.itemsize)
+        if scales is not None:
+            self._append(SCALES_FILE, np.ascontiguousarray(scales).tobytes(), len(self) * 4)
+        if self._ids_bytes is None:
+            # Store from before ids.txt: write the ids it had in meta.json once
+            new_lines = "".join(f"{item_id}\n" for item_id in self._ids + new_ids).encode("utf-8")
+            self._append(IDS_FILE, new_lines, 0)
+        else:
+            new_lines = "".join(f"{item_id}\n" for item_id in new_ids).encode("utf-8")
+            self._append(IDS_FILE, new_lines, self._ids_bytes)
+        self._ids_bytes = (self._ids_bytes or 0) + len(new_lines)
+
+        for offset, item_id in enumerate(new_ids):
+            self._rows[item_id] = len(self._ids) + offset
+        self._ids.extend(new_ids)
+        self._ids_view = None
+        self._write_meta()
+        return len(new_ids)
+
+    def _append(self, name: str, data: bytes, offset: int) -> None:
+        path = self.path / name
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+
+    def _write_meta(self) -> None:
+        meta = {"dim": self.dim, "dtype": self.dtype, "count": len(self._ids)}
+        tmp_path = self.path / (META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.path / META_FILE)
+
+    def _maps(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self._codes is None:
+            self._codes = np.memmap(
+                self.path / CODES_FILE, dtype=self.dtype, mode="r", shape=(len(self), self.dim)
+            )
+            if self.dtype == "int8":
+                self._scales = np.memmap(self.path / SCALES_FILE, dtype=np.float32, mode="r", shape=(len(self),))
+        return self._codes, self._scales
+
+    def vectors(self, rows: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Decoded float32 vectors.
+
+        Args:
+            rows: Row numbers to decode (None = all, mind the memory)
+
+        Returns:
+            2D float32 array
+        """
+        if not self._ids:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        codes, scales = self._maps()
+        if rows is None:
+            return dequantize(codes, scales)
+        rows = np.asarray(rows, dtype=np.intp)
+        return dequantize(codes[rows], scales[rows] if scales is not None else None)
+
+    def iter_scores(self, queries: np.ndarray, chunk_rows: int = SCORE_CHUNK_ROWS) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Cosine scores of queries against the store, one row chunk at a time.
+
+        Args:
+            queries: 2D array of query embeddings (normalized internally)
+            chunk_rows: Stored vectors decoded per step
+
+        Yields:
+            (first row, scores block of shape queries x chunk)
+        """
+        if not self._ids:
+            return
+        queries = normalize(queries)
+        codes, scales = self._maps()
+        for start in range(0, len(self), chunk_rows):
+            block = np.asarray(codes[start:start + chunk_rows], dtype=np.float32) @ queries.T
+            if scales is not None:
+                block *= scales[start:start + chunk_rows, None]
+            yield start, block.T
+
+    def scores(self, queries: np.ndarray, chunk_rows: int = SCORE_CHUNK_ROWS) -> np.ndarray:
+        """
+        Full score matrix (queries x stored vectors), computed in chunks.
+
+        Returns:
+            2D float32 array
+        """
+        queries = np.atleast_2d(queries)
+        result = np.empty((len(queries), len(self)), dtype=np.float32)
+        for start, block in self.iter_scores(queries, chunk_rows):
+            result[:, start:start + block.shape[1]] = block
+        return result
+
+    def query(self, vector: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the k stored vectors most similar to a query embedding.
+
+        Args:
+            vector: Query embedding (normalized internally)
+            k: Number of results
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        return self.query_many(np.atleast_2d(vector), k)[0]
+
+    def query_many(self, vectors: np.ndarray, k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Like query(), for several query embeddings scored in one pass."""
+        vectors = np.atleast_2d(vectors)
+        if not self._ids:
+            return [[] for _ in vectors]
+        scores = self.scores(vectors)
+        return [[(self._ids[i], float(row[i])) for i in top_k_indices(row, k)] for row in scores]
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(scores), dtype=np.float64)
+    ranks[np.argsort(scores, kind="stable")] = np.arange(len(scores))
+    return ranks
+
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    """Spearman rank correlation of two score vectors (ties broken by position)."""
+    ra, rb = _ranks(a), _ranks(b)
+    ra -= ra.mean()
+    rb -= rb.mean()
+    denominator = np.sqrt((ra * ra).sum() * (rb * rb).sum())
+    return float((ra * rb).sum() / denominator) if denominator else 1.0
+
+
+def quantization_report(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    dtypes: Sequence[str] = DTYPES
+) -> List[Dict]:
+    """
+    Compare the scores of each encoding with exact float32 scores.
+
+    Args:
+        vectors: Stored embeddings (a representative sample is enough)
+        queries: Query embeddings, e.g. encoded job descriptions
+        k: Cut-off for recall@k
+        dtypes: Encodings to evaluate
+
+    Returns:
+        One dict per dtype with bytes_per_vector, spearman (mean over
+        queries), recall_at_k and max_abs_error of the scores
+    """
+    vectors = normalize(vectors)
+    queries = normalize(queries)
+    exact = queries @ vectors.T
+
+    report = []
+    for dtype in dtypes:
+        codes, scales = quantize(vectors, dtype)
+        approx = queries @ dequantize(codes, scales).T
+        correlations = [spearman(e, a) for e, a in zip(exact, approx)]
+        hits = sum(
+            len(set(top_k_indices(e, k)) & set(top_k_indices(a, k)))
+            for e, a in zip(exact, approx)
+        )
+        report.append({
+            "dtype": dtype,
+            "bytes_per_vector": vectors.shape[1] * np.dtype(dtype).itemsize + (4 if scales is not None else 0),
+            "spearman": float(np.mean(correlations)),
+            "recall_at_k": hits / (len(queries) * min(k, len(vectors))),
+            "max_abs_error": float(np.abs(exact - approx).max()),
+        })
+    return report
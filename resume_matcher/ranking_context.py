@@ -0,0 +1,219 @@
+"""
+Session-scoped ranking contexts: re-rank an upload set without re-embedding it.
+
+Once a session's uploads are parsed and embedded, its RankingContext keeps
+the resume texts and their normalized embeddings. Ranking the same uploads
+against an edited job description is then one job encode plus one
+matrix-vector product, instead of re-parsing and re-embedding every
+resume. Contexts are keyed by the digests of the uploaded files, so a
+changed upload set is never ranked with stale vectors. The skills
+extracted at parse time are kept too, so skill filters cost no text scan.
+
+RankingContextStore holds one context per session, process-wide, with an
+LRU bound on the number of sessions and eviction of sessions left idle.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from resume_matcher.bm25 import BM25Index
+from resume_matcher.chunker import ChunkedEmbeddings, resolve_pooling
+from resume_matcher.matcher import RankedResume, embed_resumes, encode_texts, rank_resumes
+from resume_matcher.metrics import metrics
+from resume_matcher.skills import SkillFilter, SkillIndex
+from resume_matcher.text_cache import BytesLike, bytes_digest
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+def upload_key(files: Sequence[Tuple[str, BytesLike]]) -> str:
+    """Identify an upload set by its file names and contents."""
+    digest = hashlib.sha256()
+    for name, data in files:
+        digest.update(name.encode("utf-8"))
+        digest.update(bytes_digest(data).encode("ascii"))
+    return digest.hexdigest()
+
+
+class RankingContext:
+    """
+    Parsed resumes of one upload set with their embeddings and skills.
+
+    Args:
+        key: upload_key of the files the resumes come from
+        resumes: Dicts with 'filename' and 'content' keys, in upload order
+        pooling: Chunk pooling method (defaults to config.model.pooling)
+        skills: SkillIndex of the resumes, e.g. the analysis job's
+            (extracted on first filtered ranking when None)
+        embeddings: embed_resumes output for ``resumes`` with ``pooling``,
+            e.g. the analysis job's (the resumes are embedded when None)
+    """
+
+    def __init__(
+        self,
+        key: str,
+        resumes: List[Dict],
+        pooling: Optional[str] = None,
+        skills: Optional[SkillIndex] = None,
+        embeddings: Optional[Union[np.ndarray, ChunkedEmbeddings]] = None
+    ):
+        self.key = key
+        self.resumes = resumes
+        self.pooling = resolve_pooling(pooling if pooling is not None else (config.model.pooling if config else None))
+        if embeddings is None:
+            with metrics.span("context_embed", resumes=len(resumes)):
+                embeddings = embed_resumes([r['content'] for r in resumes], self.pooling)
+        self.embeddings = embeddings
+        # Filled by the hybrid retrieval modes on first use, then reused
+        self.lexical_index = BM25Index()
+        self.skills = skills
+        self.last_used = time.monotonic()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held: vectors, skill bitsets and resume texts."""
+        vectors = self.embeddings.vectors if isinstance(self.embeddings, ChunkedEmbeddings) else self.embeddings
+        skills = self.skills.nbytes if self.skills is not None else 0
+        return int(vectors.nbytes) + skills + sum(len(r['content']) for r in self.resumes)
+
+    def rank(
+        self,
+        job_description: str,
+        top_k: Optional[int] = None,
+        rerank: Optional[bool] = None,
+        skill_filter: Optional[SkillFilter] = None
+    ) -> List[RankedResume]:
+        """
+        Rank the context's resumes against a job description.
+
+        Only the job description is encoded. It bypasses the embedding
+        cache: each edited wording is a one-off query that would otherwise
+        push resume vectors out of it.
+
+        Args:
+            job_description: The job posting text
+            top_k: Number of results (None = all)
+            rerank: Re-order the shortlist with the cross-encoder (defaults
+                to config.reranker.enabled)
+            skill_filter: Required / preferred skills and minimum experience
+
+        Returns:
+            List of RankedResume, as rank_resumes
+        """
+        self.last_used = time.monotonic()
+        if skill_filter and self.skills is None:
+            self.skills = SkillIndex.build([r['content'] for r in self.resumes])
+        job_embedding = np.asarray(encode_texts([job_description]), dtype=np.float32)
+        return rank_resumes(
+            job_description,
+            self.resumes,
+            top_k=top_k,
+            pooling=self.pooling or "none",
+            lexical_index=self.lexical_index,
+            rerank=rerank,
+            job_embedding=job_embedding,
+            resume_embeddings=self.embeddings,
+            skill_filter=skill_filter,
+            skill_index=self.skills
+        )
+
+
+class RankingContextStore:
+    """
+    One RankingContext per session, bounded in number and idle time.
+
+    Thread-safe; meant to be shared by every session of the app.
+
+    Args:
+        max_sessions: Contexts kept; the least recently used is evicted
+            beyond it (defaults to config.app.ranking_contexts)
+        idle_minutes: Contexts unused for this long are evicted (defaults
+            to config.app.ranking_context_idle_minutes)
+    """
+
+    def __init__(self, max_sessions: Optional[int] = None, idle_minutes: Optional[float] = None):
+        app = config.app if config else None
+        self.max_sessions = max_sessions or (app.ranking_contexts if app else 32)
+        idle_minutes = idle_minutes if idle_minutes is not None else (app.ranking_context_idle_minutes if app else 30)
+        self.idle_seconds = idle_minutes * 60
+        self._lock = threading.Lock()
+        self._contexts: "OrderedDict[str, RankingContext]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def get(self, session_id: str, key: str) -> Optional[RankingContext]:
+        """
+        The session's context, if it was built for the upload set ``key``.
+
+        Args:
+            session_id: Id of the session
+            key: upload_key of the session's current uploads
+
+        Returns:
+            RankingContext, or None if the session has none, or one for
+            other files
+        """
+        self.evict_idle()
+        with self._lock:
+            context = self._contexts.get(session_id)
+            if context is None or context.key != key:
+                metrics.incr("ranking_context_misses")
+                return None
+            self._contexts.move_to_end(session_id)
+            context.last_used = time.monotonic()
+        metrics.incr("ranking_context_hits")
+        return context
+
+    def put(self, session_id: str, context: RankingContext) -> None:
+        """Set the session's context, replacing its previous one."""
+        with self._lock:
+            self._contexts[session_id] = context
+            self._contexts.move_to_end(session_id)
+            while len(self._contexts) > self.max_sessions:
+                evicted, _ = self._contexts.popitem(last=False)
+                if logger:
+                    logger.debug(f"Evicted ranking context of session {evicted} (limit {self.max_sessions})")
+        self.evict_idle()
+
+    def drop(self, session_id: str) -> None:
+        """Forget the session's context (e.g. when it clears its results)."""
+        with self._lock:
+            self._contexts.pop(session_id, None)
+
+    def evict_idle(self) -> int:
+        """
+        Evict the contexts of sessions idle for longer than the limit.
+
+        Returns:
+            Number of contexts evicted
+        """
+        cutoff = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = [session_id for session_id, context in self._contexts.items() if context.last_used < cutoff]
+            for session_id in idle:
+                del self._contexts[session_id]
+        if idle and logger:
+            logger.info(f"Evicted {len(idle)} idle ranking contexts")
+        return len(idle)
+
+    def stats(self) -> Dict:
+        """Number of contexts and the memory they hold."""
+        with self._lock:
+            contexts = list(self._contexts.values())
+        return {
+            "sessions": len(contexts),
+            "resumes": sum(len(c.resumes) for c in contexts),
+            "mb": sum(c.nbytes for c in contexts) / 2**20,
+        }
@@ -0,0 +1,263 @@
+"""
+Second-stage re-ranking of the shortlist with a cross-encoder.
+
+The bi-encoder cosine score of rank_resumes compares two independently
+computed vectors; a cross-encoder reads the job description and the resume
+together and orders candidates much better, at a cost per pair. It is
+therefore only run over the top-N of a ranking (``RERANKER_TOP_N``), in
+length-sorted batches, and its scores are cached in SQLite per
+(model, job hash, resume hash) so re-running a search is free.
+
+The returned score blends both stages:
+
+    score = weight * sigmoid(cross_score) + (1 - weight) * cosine
+
+Candidates past the top-N are not read by the cross-encoder; they are
+given the lowest cross-encoder score of the shortlist instead, so their
+score is on the same scale and never above a re-ranked one.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+# Resume characters sent to the cross-encoder; its tokenizer truncates to
+# max_length tokens anyway, this only avoids tokenizing text that is cut
+MAX_RESUME_CHARS = 4000
+
+_cross_encoder = None
+_score_cache: Optional["ScoreCache"] = None
+_lock = threading.Lock()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of a text with whitespace runs collapsed."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """
+    SQLite-backed map from (model, job hash, resume hash) to a cross-encoder score.
+
+    Args:
+        db_path: Path of the SQLite database file (created if missing)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " model TEXT NOT NULL,"
+                " job_hash TEXT NOT NULL,"
+                " resume_hash TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " PRIMARY KEY (model, job_hash, resume_hash)"
+                ")"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the cache thread-safe
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, model: str, job_hash: str, resume_hashes: Sequence[str]) -> Dict[str, float]:
+        """
+        Look up the cached scores of one job against several resumes.
+
+        Returns:
+            Dict of resume hash -> score, for the hashes found
+        """
+        if not resume_hashes:
+            return {}
+        placeholders = ",".join("?" * len(resume_hashes))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT resume_hash, score FROM scores WHERE model = ? AND job_hash = ?"
+                f" AND resume_hash IN ({placeholders})",
+                (model, job_hash, *resume_hashes)
+            ).fetchall()
+        found = dict(rows)
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(set(resume_hashes)) - len(found)
+        return found
+
+    def put_many(self, model: str, job_hash: str, scores: Dict[str, float]) -> None:
+        """Store scores of one job against several resumes (keyed by resume hash)."""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scores (model, job_hash, resume_hash, score) VALUES (?, ?, ?, ?)",
+                [(model, job_hash, resume_hash, float(score)) for resume_hash, score in scores.items()]
+            )
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def get_cross_encoder():
+    """
+    Load the configured CrossEncoder once per process.
+
+    Returns:
+        sentence_transformers.CrossEncoder instance
+    """
+    global _cross_encoder
+    with _lock:
+        if _cross_encoder is None:
+            from sentence_transformers import CrossEncoder
+
+            model_name = config.reranker.model_name if config else "cross-encoder/ms-marco-MiniLM-L-6-v2"
+            if logger:
+                logger.info(f"Loading CrossEncoder model: {model_name}")
+            _cross_encoder = CrossEncoder(
+                model_name,
+                max_length=config.reranker.max_length if config else 512,
+                device=config.model.device if config else "cpu"
+            )
+        return _cross_encoder
+
+
+def get_score_cache() -> Optional[ScoreCache]:
+    """
+    Return the process-wide cross-encoder score cache.
+
+    Returns:
+        ScoreCache instance, or None if caching is disabled
+    """
+    global _score_cache
+    if not config or not config.cache.enabled:
+        return None
+
+    with _lock:
+        if _score_cache is None:
+            _score_cache = ScoreCache(os.path.join(config.cache.dir, "rerank.sqlite3"))
+        return _score_cache
+
+
+def cross_scores(job_description: str, resume_texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Raw cross-encoder scores of a job against resumes, through the cache.
+
+    Args:
+        job_description: The job posting text
+        resume_texts: Resume texts
+        batch_size: Pairs per forward pass (defaults to config)
+
+    Returns:
+        1D float32 array aligned with ``resume_texts``
+    """
+    model_name = config.reranker.model_name if config else "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    batch_size = batch_size or (config.reranker.batch_size if config else 16)
+    cache = get_score_cache()
+    job_hash = text_hash(job_description)
+    hashes = [text_hash(text) for text in resume_texts]
+
+    known = cache.get_many(model_name, job_hash, hashes) if cache is not None else {}
+    metrics.incr("rerank_cache_hits", sum(1 for h in hashes if h in known))
+
+    # Each distinct unseen resume is scored once; longest first so similarly
+    # sized pairs share padded batches
+    todo = {h: text for h, text in zip(hashes, resume_texts) if h not in known}
+    if todo:
+        metrics.incr("rerank_cache_misses", len(todo))
+        order = sorted(todo, key=lambda h: len(todo[h]), reverse=True)
+        pairs = [(job_description, todo[h][:MAX_RESUME_CHARS]) for h in order]
+        with metrics.span("rerank", pairs=len(pairs), batch_size=batch_size):
+            predicted = get_cross_encoder().predict(pairs, batch_size=batch_size, show_progress_bar=False)
+        fresh = {h: float(score) for h, score in zip(order, np.asarray(predicted).reshape(-1))}
+        if cache is not None:
+            cache.put_many(model_name, job_hash, fresh)
+        known.update(fresh)
+
+    return np.array([known[h] for h in hashes], dtype=np.float32)
+
+
+def rerank(
+    job_description: str,
+    ranked: list,
+    top_n: Optional[int] = None,
+    weight: Optional[float] = None,
+    batch_size: Optional[int] = None
+) -> list:
+    """
+    Re-orders the top-N of a ranking with the cross-encoder.
+
+    Args:
+        job_description: The job posting text
+        ranked: RankedResume list from rank_resumes, best first
+        top_n: Candidates re-scored (defaults to config.reranker.top_n)
+        weight: Share of the cross-encoder in the blended score, 0..1
+            (defaults to config.reranker.weight)
+        batch_size: Pairs per forward pass (defaults to config)
+
+    Returns:
+        New list sorted by blended score: the top-N re-ordered, followed by
+        the rest of ``ranked`` in its order, blended with the shortlist's
+        lowest cross-encoder score (see the module docstring)
+    """
+    # Imported here: matcher imports this module
+    from resume_matcher.matcher import RankedResume
+
+    top_n = top_n if top_n is not None else (config.reranker.top_n if config else 20)
+    weight = weight if weight is not None else (config.reranker.weight if config else 0.5)
+    head, tail = list(ranked[:top_n]), list(ranked[top_n:])
+    if not head:
+        return list(ranked)
+
+    raw = cross_scores(job_description, [candidate['content'] for candidate in head], batch_size)
+    if not config or config.reranker.sigmoid:
+        # ms-marco cross-encoders output logits
+        raw = 1.0 / (1.0 + np.exp(-raw))
+    blended = weight * raw + (1 - weight) * np.array([candidate['score'] for candidate in head])
+    # Every head candidate has at least this cross score and at least the
+    # cosine of any tail candidate, so the tail stays below the head
+    floor = weight * float(raw.min())
+
+    # Stable sort: equal blended scores keep the first-stage order
+    order = np.argsort(-blended, kind="stable")
+    if logger:
+        moved = int((order != np.arange(len(order))).sum())
+        logger.info(f"Re-ranked top {len(head)} with the cross-encoder ({moved} positions changed)")
+    return [RankedResume(head[i].resume, head[i].index, float(blended[i])) for i in order] + [
+        RankedResume(candidate.resume, candidate.index, floor + (1 - weight) * candidate['score'])
+        for candidate in tail
+    ]
@@ -1,36 +1,427 @@
+import io
+import multiprocessing
+import os
+import signal
+import threading
+import tempfile
+import time
+from functools import partial
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
 import pypdf
-from typing import List, Dict
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+from resume_matcher.metrics import metrics
+from resume_matcher.text_cache import BytesLike, TextCache, bytes_digest, file_digest
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+_text_cache: Optional[TextCache] = None
+_text_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> Optional[TextCache]:
+    """
+    Return the process-wide cache of extracted PDF text.
+
+    Returns:
+        TextCache instance, or None if caching is disabled
+    """
+    global _text_cache
+    if not config or not config.cache.enabled:
+        return None
+
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = TextCache(os.path.join(config.cache.dir, "texts.sqlite3"))
+        return _text_cache
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised inside a worker when a PDF exceeds its time budget.
+
+    Derives from BaseException so the generic error handling in
+    extract_text_from_pdf does not swallow it.
+    """
+
+
+PdfSource = Union[str, BytesLike, BinaryIO]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file over a bytes-like object, without copying it.
+
+    io.BytesIO copies a memoryview (e.g. ``uploaded_file.getbuffer()``) up
+    front; this reader only copies the ranges pypdf actually reads.
+    """
+
+    def __init__(self, data: BytesLike):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return chunk
+
+    def readinto(self, buffer) -> int:
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def _pdf_stream(source: PdfSource):
+    """What pypdf.PdfReader should open for a path, buffer or file object."""
+    if isinstance(source, (str, os.PathLike)):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return BufferReader(source)
+    if not source.seekable():
+        # pypdf reads the cross-reference table from the end of the file
+        return io.BytesIO(source.read())
+    return source
+
+
+class UploadTooLarge(ValueError):
+    """Raised when uploaded files exceed ``config.app.max_file_size_mb`` in total."""
+
+
+def check_upload_size(files: Sequence[Tuple[str, BytesLike]]) -> int:
+    """
+    Enforce the upload size limit before anything is parsed.
+
+    Args:
+        files: (file name, PDF content) pairs
+
+    Returns:
+        Total size in bytes
+
+    Raises:
+        UploadTooLarge: If the total exceeds config.app.max_file_size_mb
+    """
+    limit_mb = config.app.max_file_size_mb if config else 10
+    total = sum(memoryview(data).nbytes for _, data in files)
+    if total > limit_mb * 1024 * 1024:
+        raise UploadTooLarge(f"Uploads total {total / 1024 / 1024:.1f} MB, the limit is {limit_mb} MB")
+    return total
+
+
+def extract_text_from_pdf(pdf: PdfSource) -> str:
     """
-    Opens a PDF file and extracts text from all pages.
+    Opens a PDF and extracts text from all pages.
+
+    Args:
+        pdf: Path, bytes-like content (bytes, bytearray, memoryview) or
+            binary file object
+    """
+    if isinstance(pdf, (str, os.PathLike)):
+        return _read_pdf(os.fspath(pdf))[0]
+    return _read_pdf(getattr(pdf, "name", "<buffer>"), pdf)[0]
+
+
+def _read_pdf(pdf_path: str, data: Optional[PdfSource] = None) -> Tuple[str, int]:
+    """
+    Extract the text of a PDF and return it with the document's page count.
+
+    ``data`` holds the file content (bytes-like or file object) when it is
+    not on disk, e.g. an upload or an archive member; ``pdf_path`` is then
+    only used in messages.
     """
-    text = ""
+    pages = []
+    page_count = 0
     try:
-        reader = pypdf.PdfReader(pdf_path)
+        reader = pypdf.PdfReader(_pdf_stream(data if data is not None else pdf_path))
+        page_count = len(reader.pages)
         for page in reader.pages:
             content = page.extract_text()
             if content:
-                text += content + "\n"
+                pages.append(content)
     except Exception as e:
-        print(f"Error reading {pdf_path}: {e}")
-        return ""
-    
-    return text.strip()
+        if logger:
+            logger.error(f"Error reading {pdf_path}: {e}")
+        else:
+            print(f"Error reading {pdf_path}: {e}")
+        return "", page_count
 
-def load_resumes(file_paths: List[str]) -> List[Dict]:
+    return "\n".join(pages).strip(), page_count
+
+
+def _parse_timed(path: str, data: Optional[PdfSource] = None) -> str:
+    """Extract one PDF in this process, recording its parse time and page count."""
+    with metrics.span("parse_pdf", file=os.path.basename(path)) as span:
+        text, pages = _read_pdf(path, data)
+        span.set(pages=pages)
+    metrics.observe("pdf_pages", pages)
+    return text
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _extract_worker(
+    path: str,
+    timeout: Optional[float] = None,
+    data: Optional[BytesLike] = None
+) -> Tuple[str, str, float, int]:
     """
-    Iterates through a list of file paths and returns a structured list 
-    of dictionaries containing the filename and the extracted text.
+    Process-pool entry point: extract one PDF, enforcing the per-file timeout.
+    ``data`` is the file content for PDFs that are not on disk.
+
+    The timeout relies on SIGALRM and is skipped on platforms without it
+    (Windows); the parent's stall guard in _extract_resumes still applies there.
+
+    Returns:
+        (path, text, parse seconds, page count); the parent records the
+        timing since metrics live in the parent process
+    """
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    start = time.perf_counter()
+    try:
+        text, pages = _read_pdf(path, data)
+        return path, text, time.perf_counter() - start, pages
+    except ExtractionTimeout:
+        if logger:
+            logger.warning(f"Timed out after {timeout}s reading {path}, skipping")
+        return path, "", time.perf_counter() - start, 0
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    if workers is None:
+        workers = config.parser.workers if config else 0
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def iter_resumes(
+    file_paths: List[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Iterator[Dict]:
+    """
+    Extracts text from PDFs and yields resume dictionaries as they complete.
+
+    Files whose bytes were parsed before are served from the text cache
+    first. The rest are spread over a process pool so parsing uses every
+    core; batches smaller than ``config.parser.parallel_min_files`` (or a
+    single worker) are parsed serially in input order.
+
+    Args:
+        file_paths: Paths of the PDF files to parse
+        workers: Number of worker processes (defaults to config, 0 = CPU count)
+        timeout: Per-file time limit in seconds (defaults to config, 0 = none)
+
+    Yields:
+        Dicts with 'filename' and 'content' keys, in completion order.
+        Files that yield no text (unreadable, empty or timed out) are skipped.
     """
-    resume_data = []
-    
+    cache = get_text_cache()
+    if cache is None:
+        yield from _extract_resumes(file_paths, workers, timeout)
+        return
+
+    digests = {}
     for path in file_paths:
-        text = extract_text_from_pdf(path)
+        try:
+            digest = file_digest(path)
+        except OSError as e:
+            if logger:
+                logger.error(f"Error reading {path}: {e}")
+            continue
+        text = cache.get(digest)
+        if text is not None:
+            yield {"filename": path, "content": text}
+        else:
+            digests[path] = digest
+
+    hits = len(file_paths) - len(digests)
+    metrics.incr("text_cache_hits", hits)
+    metrics.incr("text_cache_misses", len(digests))
+    if logger:
+        logger.info(f"Text cache: {hits} hits, {len(digests)} misses")
+
+    for resume in _extract_resumes(list(digests), workers, timeout):
+        cache.put(digests[resume["filename"]], resume["content"])
+        yield resume
+
+
+def _extract_resumes(
+    file_paths: List[str],
+    workers: Optional[int],
+    timeout: Optional[float]
+) -> Iterator[Dict]:
+    """Parse PDFs serially or on a process pool (see iter_resumes)."""
+    if not file_paths:
+        return
+
+    workers = min(_resolve_workers(workers), max(len(file_paths), 1))
+    if timeout is None:
+        timeout = config.parser.file_timeout if config else 0
+    min_files = config.parser.parallel_min_files if config else 8
+
+    if workers <= 1 or len(file_paths) < min_files:
+        for path in file_paths:
+            text = _parse_timed(path)
+            if text:
+                yield {"filename": path, "content": text}
+        return
+
+    if logger:
+        logger.info(f"Parsing {len(file_paths)} PDFs with {workers} worker processes")
+
+    # If no worker reports back for this long, every worker is stuck on a
+    # file the per-file timeout could not interrupt
+    stall_timeout = timeout * 2 if timeout else None
+    worker = partial(_extract_worker, timeout=timeout)
+
+    # Pool.__exit__ terminates the workers, including when the consumer
+    # stops iterating early. Workers are spawned rather than forked: the
+    # parent may hold the model, its threads and open locks (Streamlit, the
+    # HTTP server), none of which survive a fork safely.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(processes=workers) as pool:
+        results = pool.imap_unordered(worker, file_paths, chunksize=1)
+        for remaining in range(len(file_paths), 0, -1):
+            try:
+                path, text, seconds, pages = results.next(timeout=stall_timeout)
+            except multiprocessing.TimeoutError:
+                if logger:
+                    logger.error(f"PDF extraction stalled, abandoning {remaining} remaining files")
+                return
+            metrics.record("parse_pdf", seconds, file=os.path.basename(path), pages=pages)
+            metrics.observe("pdf_pages", pages)
+            if text:
+                yield {"filename": path, "content": text}
+
+
+def iter_uploaded_resumes(
+    files: Sequence[Tuple[str, BytesLike]],
+    spill_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> Iterator[Dict]:
+    """
+    Extracts text from in-memory PDFs (e.g. Streamlit uploads).
+
+    Cached texts are served by content digest. Small batches are parsed in
+    this process straight from the buffers (a memoryview such as
+    ``uploaded_file.getbuffer()`` is never copied as a whole). Batches big
+    enough for the process pool are spilled once to ``spill_dir`` under
+    their SHA-256 digest, so identical uploads are written and parsed once
+    and two files with the same name never overwrite each other.
+
+    Args:
+        files: (file name, PDF content) pairs
+        spill_dir: Directory for the pool's spilled files, owned by the
+            caller (e.g. one per job); a temporary directory when None
+        workers: Number of worker processes (defaults to config, 0 = CPU count)
+        timeout: Per-file time limit in seconds for pooled parsing (defaults to config)
+
+    Yields:
+        Dicts with 'filename' (the given name), 'content' and 'digest' (of
+        the file bytes, for resume_matcher.dedup) keys, in completion
+        order; files without text are skipped
+    """
+    cache = get_text_cache()
+    by_digest: Dict[str, List[int]] = {}
+    for i, (name, data) in enumerate(files):
+        by_digest.setdefault(bytes_digest(data), []).append(i)
+
+    todo = {}
+    for digest, indices in by_digest.items():
+        text = cache.get(digest) if cache is not None else None
+        if text is not None:
+            for i in indices:
+                yield {"filename": files[i][0], "content": text, "digest": digest}
+        else:
+            todo[digest] = indices
+    if cache is not None:
+        hits = len(by_digest) - len(todo)
+        metrics.incr("text_cache_hits", hits)
+        metrics.incr("text_cache_misses", len(todo))
+        if logger:
+            logger.info(f"Text cache: {hits} hits, {len(todo)} misses")
+    if not todo:
+        return
+
+    def emit(digest: str, text: str) -> Iterator[Dict]:
+        if cache is not None and text:
+            cache.put(digest, text)
         if text:
-            resume_data.append({
-                "filename": path,
-                "content": text
-            })
-            
-    return resume_data
\ No newline at end of file
+            for i in todo[digest]:
+                yield {"filename": files[i][0], "content": text, "digest": digest}
+
+    min_files = config.parser.parallel_min_files if config else 8
+    if _resolve_workers(workers) <= 1 or len(todo) < min_files:
+        for digest, indices in todo.items():
+            name, data = files[indices[0]]
+            yield from emit(digest, _parse_timed(name, data))
+        return
+
+    owned = None
+    if spill_dir is None:
+        owned = tempfile.TemporaryDirectory(prefix="recruiter_spill_")
+        spill_dir = owned.name
+    try:
+        os.makedirs(spill_dir, exist_ok=True)
+        paths = {}
+        for digest, indices in todo.items():
+            path = os.path.join(spill_dir, f"{digest}.pdf")
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(files[indices[0]][1])
+            paths[path] = digest
+        # Spilled files are parsed as-is: the cache was consulted above
+        for resume in _extract_resumes(list(paths), workers, timeout):
+            yield from emit(paths[resume["filename"]], resume["content"])
+    finally:
+        if owned is not None:
+            owned.cleanup()
+
+
+def load_resumes(
+    file_paths: List[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> List[Dict]:
+    """
+    Iterates through a list of file paths and returns a structured list
+    of dictionaries containing the filename and the extracted text.
+
+    Parsing is parallelised by iter_resumes; results are returned in the
+    order of ``file_paths``.
+    """
+    order = {path: i for i, path in enumerate(file_paths)}
+    resume_data = list(iter_resumes(file_paths, workers=workers, timeout=timeout))
+    resume_data.sort(key=lambda r: order[r["filename"]])
+    return resume_data
@@ -0,0 +1,343 @@
+"""
+Headless HTTP ranking service.
+
+Exposes the candidate database and the matcher to other systems (e.g. an
+ATS) as a small JSON API, using only the standard library:
+
+    GET  /health    status, candidate count, encode queue, batch stats
+    GET  /skills    skill vocabulary usable in /rank filters
+    POST /ingest    add resumes to the candidate database: a raw PDF body
+                    (Content-Type: application/pdf, ?name=cv.pdf), or JSON
+                    {"files": [{"name", "content_base64"}]} for PDFs and/or
+                    {"resumes": [{"name", "content"}]} for extracted text
+    POST /rank      {"job_description", "top_k"?, "rerank"?, "include_content"?,
+                    "required_skills"?, "preferred_skills"?, "min_years"?,
+                    "resumes"?: [{"filename", "content"}]}; ranks the given
+                    resumes, or the candidate database when none are given;
+                    duplicates are folded into the first copy, whose result
+                    lists them in "aliases"
+    POST /explain   {"job_description", "candidate"} (a stored name) or
+                    {"job_description", "resume"} (text)
+
+Job descriptions of concurrent /rank requests are embedded together by a
+MicroBatcher. Load is bounded twice: more than ``config.server.max_inflight``
+concurrent requests, or a full encode queue, get 503 with Retry-After
+instead of queueing without limit.
+"""
+
+import base64
+import json
+import threading
+import time
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.dedup import deduplicate
+from resume_matcher.matcher import encode_texts, rank_resumes
+from resume_matcher.metrics import metrics
+from resume_matcher.micro_batcher import MicroBatcher, QueueFull
+from resume_matcher.resume_parser import UploadTooLarge
+from resume_matcher.skills import SkillFilter, get_vocabulary
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+class HTTPError(Exception):
+    """An error answered with a specific HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _max_body_bytes() -> int:
+    return (config.app.max_file_size_mb if config else 10) * 1024 * 1024
+
+
+def _skill_filter(payload: Dict) -> Optional[SkillFilter]:
+    """SkillFilter of a /rank payload, None when it has no criteria."""
+    required = payload.get("required_skills") or []
+    preferred = payload.get("preferred_skills") or []
+    min_years = payload.get("min_years")
+    for key, skills in (("required_skills", required), ("preferred_skills", preferred)):
+        if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+            raise HTTPError(400, f"'{key}' must be a list of skill names")
+    if min_years is not None and (isinstance(min_years, bool) or not isinstance(min_years, (int, float))):
+        raise HTTPError(400, "'min_years' must be a number")
+    try:
+        # Unknown skills are reported before any encoding
+        get_vocabulary().bits(required + preferred)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+    skill_filter = SkillFilter(required=required, preferred=preferred, min_years=min_years)
+    return skill_filter if skill_filter else None
+
+
+class RankingService:
+    """
+    The API's operations, independent of HTTP.
+
+    Args:
+        store: Candidate database (defaults to one at config.store.dir)
+        batcher: MicroBatcher for job descriptions (defaults to one over
+            encode_texts: job descriptions are one-off queries, kept out of
+            the resume embedding cache)
+    """
+
+    def __init__(self, store: Optional[CandidateStore] = None, batcher: Optional[MicroBatcher] = None):
+        # An empty store is falsy (CandidateStore defines __len__)
+        self.store = store if store is not None else CandidateStore()
+        self.batcher = batcher or MicroBatcher(encode_texts)
+
+    def health(self) -> Dict:
+        return {"status": "ok", "candidates": len(self.store), "encode": self.batcher.stats()}
+
+    def skills(self) -> Dict:
+        return {"skills": get_vocabulary().skills}
+
+    def ingest(self, payload: Dict) -> Dict:
+        """Ingest PDFs (base64) and/or extracted texts into the candidate database."""
+        files = payload.get("files") or []
+        texts = payload.get("resumes") or []
+        if not files and not texts:
+            raise HTTPError(400, "Expected 'files' and/or 'resumes'")
+
+        report = {"added": [], "updated": [], "unchanged": [], "duplicates": [], "failed": []}
+        if files:
+            try:
+                decoded = [(item["name"], base64.b64decode(item["content_base64"], validate=True)) for item in files]
+            except (KeyError, TypeError, ValueError) as e:
+                raise HTTPError(400, f"Invalid 'files' entry: {e}")
+            for key, names in asdict(self.store.ingest_uploads(decoded)).items():
+                report[key].extend(names)
+        if texts:
+            try:
+                records = [
+                    {"name": item["name"], "content": item["content"], "metadata": {"source": "api"}}
+                    for item in texts
+                ]
+            except (KeyError, TypeError) as e:
+                raise HTTPError(400, f"Invalid 'resumes' entry: {e}")
+            for key, names in asdict(self.store.upsert(records)).items():
+                report[key].extend(names)
+        return report
+
+    def rank(self, payload: Dict) -> Dict:
+        """Rank inline resumes or the candidate database against a job description."""
+        job_description = payload.get("job_description")
+        if not job_description or not isinstance(job_description, str):
+            raise HTTPError(400, "'job_description' is required")
+        top_k = payload.get("top_k", 10)
+        if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+            raise HTTPError(400, "'top_k' must be a positive integer or null")
+        rerank = payload.get("rerank")
+        if rerank is not None and not isinstance(rerank, bool):
+            raise HTTPError(400, "'rerank' must be a boolean or null")
+        resumes = payload.get("resumes")
+        if resumes is not None and (not isinstance(resumes, list) or not all(
+            isinstance(r, dict) and isinstance(r.get("filename"), str) and isinstance(r.get("content"), str)
+            for r in resumes
+        )):
+            raise HTTPError(400, "'resumes' must be a list of {filename, content}")
+        skill_filter = _skill_filter(payload)
+
+        # The whole payload is valid: only now take a slot in the encode queue
+        start = time.perf_counter()
+        job_embedding = self.batcher.submit([job_description])[0]
+        if resumes is not None:
+            if config is None or config.dedup.enabled:
+                resumes = deduplicate(resumes)
+            results = rank_resumes(
+                job_description, resumes, top_k=top_k, rerank=rerank, job_embedding=job_embedding,
+                skill_filter=skill_filter
+            )
+        else:
+            results = self.store.search(
+                job_description, top_k=top_k, rerank=rerank, job_embedding=job_embedding, skill_filter=skill_filter
+            )
+
+        include_content = bool(payload.get("include_content"))
+        return {
+            "results": [
+                dict(
+                    {"filename": r.filename, "score": r.score},
+                    **({"aliases": r.aliases} if r.aliases else {}),
+                    **({"content": r.content} if include_content else {})
+                )
+                for r in results
+            ],
+            "took_ms": (time.perf_counter() - start) * 1000,
+        }
+
+    def explain(self, payload: Dict) -> Dict:
+        """LLM explanation of one candidate's match (see resume_matcher.explainer)."""
+        # Imported here: the service can run without Ollama until this is used
+        from resume_matcher.explainer import generate_explanation
+
+        job_description = payload.get("job_description")
+        if not job_description:
+            raise HTTPError(400, "'job_description' is required")
+        resume_text = payload.get("resume")
+        if resume_text is None:
+            name = payload.get("candidate")
+            if not name:
+                raise HTTPError(400, "Expected 'resume' (text) or 'candidate' (stored name)")
+            candidate = self.store.get(name)
+            if candidate is None:
+                raise HTTPError(404, f"Unknown candidate: {name}")
+            resume_text = candidate["content"]
+        return {"explanation": generate_explanation(resume_text, job_description)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes requests to the server's RankingService and encodes JSON answers."""
+
+    server: "RankingServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        if logger:
+            logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self) -> None:
+        self._dispatch({
+            "/health": lambda body, query: self.server.service.health(),
+            "/skills": lambda body, query: self.server.service.skills(),
+        }, read_body=False)
+
+    def do_POST(self) -> None:
+        self._dispatch({
+            "/ingest": self._ingest,
+            "/rank": lambda body, query: self.server.service.rank(self._json(body)),
+            "/explain": lambda body, query: self.server.service.explain(self._json(body)),
+        })
+
+    def _ingest(self, body: bytes, query: Dict) -> Dict:
+        if self.headers.get("Content-Type", "").split(";")[0].strip() == "application/pdf":
+            name = (query.get("name") or [None])[0]
+            if not name:
+                raise HTTPError(400, "Raw PDF uploads need ?name=")
+            payload = {"files": [{"name": name, "content_base64": base64.b64encode(body).decode("ascii")}]}
+        else:
+            payload = self._json(body)
+        return self.server.service.ingest(payload)
+
+    @staticmethod
+    def _json(body: bytes) -> Dict:
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        return payload
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        # Base64 inflates PDFs by a third; leave room for it and the JSON
+        if length > _max_body_bytes() * 4 // 3 + 65536:
+            # The unread body would be parsed as the next request on this
+            # keep-alive connection
+            self.close_connection = True
+            raise HTTPError(413, f"Request body of {length} bytes is too large")
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, routes: Dict, read_body: bool = True) -> None:
+        url = urlparse(self.path)
+        route = routes.get(url.path)
+        status, payload, headers = 200, None, {}
+        if not self.server.slots.acquire(blocking=False):
+            if read_body:
+                # Drain the body so the connection stays usable, unless it is
+                # too large to be worth reading: then the connection is closed
+                try:
+                    self._read_body()
+                except HTTPError:
+                    pass
+            metrics.incr("http_rejected")
+            status, payload, headers = 503, {"error": "Server busy"}, {"Retry-After": "1"}
+        else:
+            start = time.perf_counter()
+            try:
+                body = self._read_body() if read_body else b""
+                if route is None:
+                    raise HTTPError(404, f"No route for {self.command} {url.path}")
+                payload = route(body, parse_qs(url.query))
+            except HTTPError as e:
+                status, payload = e.status, {"error": str(e)}
+            except UploadTooLarge as e:
+                status, payload = 413, {"error": str(e)}
+            except QueueFull as e:
+                status, payload, headers = 503, {"error": str(e)}, {"Retry-After": "1"}
+            except Exception as e:
+                if logger:
+                    logger.error(f"{self.command} {url.path} failed: {e}", exc_info=True)
+                status, payload = 500, {"error": "Internal server error"}
+            finally:
+                self.server.slots.release()
+            metrics.record("http_request", time.perf_counter() - start, path=url.path, status=status)
+        self._send(status, payload, headers)
+
+    def _send(self, status: int, payload: Dict, headers: Dict[str, str]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class RankingServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server around a RankingService.
+
+    Args:
+        address: (host, port) to listen on
+        service: The operations to expose
+        max_inflight: Requests handled at once before answering 503
+            (defaults to config.server.max_inflight)
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: RankingService, max_inflight: Optional[int] = None):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.slots = threading.BoundedSemaphore(
+            max_inflight or (config.server.max_inflight if config else 64)
+        )
+
+
+def serve(host: Optional[str] = None, port: Optional[int] = None, service: Optional[RankingService] = None) -> None:
+    """
+    Run the ranking service until interrupted.
+
+    Args:
+        host: Interface to bind (defaults to config.server.host)
+        port: Port to listen on (defaults to config.server.port)
+        service: Service instance (defaults to one over the configured store)
+    """
+    host = host or (config.server.host if config else "127.0.0.1")
+    port = port if port is not None else (config.server.port if config else 8080)
+    service = service or RankingService()
+    server = RankingServer((host, port), service)
+    if logger:
+        logger.info(f"Ranking service listening on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.batcher.close()
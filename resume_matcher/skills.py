@@ -0,0 +1,466 @@
+"""
+Structured skill and experience extraction.
+
+Ranking alone is one cosine number per resume; filtering on required skills
+or years of experience would mean scanning every resume's text again for
+each query. Instead, resumes are tagged once, at ingest:
+
+- skills: an Aho-Corasick automaton over every alias of a skill taxonomy
+  finds all of them in one pass over the lowercased text, so the cost is
+  linear in the text length whatever the size of the vocabulary. Matches
+  must sit on word boundaries ("java" does not match "javascript").
+- experience: the largest "N years of experience" stated in the text
+
+Each resume's skills are stored as a bitset (one bit per skill, packed in
+uint64 words). A SkillIndex stacks them in a matrix, so a SkillFilter
+(required skills, preferred skills, minimum experience) is a few
+vectorized AND / popcount operations over all resumes, applied before
+rank_resumes scores anything.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from resume_matcher.metrics import metrics
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+# A taxonomy entry is either a list of aliases, or {"aliases": [...],
+# "match_name": false} for a skill whose bare name is too common in prose
+# to be matched ("go", "excel at", "react to"); the name still works in
+# filters either way.
+TaxonomyEntry = Union[List[str], Dict]
+
+# Skill -> aliases (matched case-insensitively, with the skill name unless
+# the entry says otherwise). R and C are too ambiguous to be listed at all.
+DEFAULT_TAXONOMY: Dict[str, TaxonomyEntry] = {
+    # Languages
+    "Python": [],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript"],
+    "TypeScript": [],
+    "Go": {"aliases": ["golang", "go lang", "go programming"], "match_name": False},
+    "Rust": [],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "PHP": [],
+    "Ruby": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Scala": [],
+    "MATLAB": [],
+    "Bash": ["shell scripting"],
+    "SQL": [],
+    # Data stores
+    "PostgreSQL": ["postgres"],
+    "MySQL": [],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search"],
+    "Cassandra": [],
+    "Snowflake": [],
+    # Data engineering
+    "Kafka": ["apache kafka"],
+    "Spark": ["apache spark", "pyspark"],
+    "Hadoop": [],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "ETL": [],
+    # Data science
+    "Pandas": [],
+    "NumPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "PyTorch": [],
+    "TensorFlow": [],
+    "Keras": [],
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "LLM": ["llms", "large language models"],
+    "Statistics": [],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": {"aliases": ["microsoft excel", "ms excel", "advanced excel", "excel vba"], "match_name": False},
+    # Cloud and operations
+    "Docker": [],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Linux": [],
+    "Git": [],
+    "CI/CD": ["continuous integration", "continuous delivery"],
+    "Jenkins": [],
+    # Web
+    "React": {"aliases": ["react.js", "reactjs", "react native", "react redux"], "match_name": False},
+    "Angular": [],
+    "Vue": ["vue.js", "vuejs"],
+    "Node.js": ["nodejs"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": [],
+    "GraphQL": [],
+    "REST APIs": ["rest api", "restful"],
+    "Microservices": ["microservice"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    # Methods and tools
+    "Agile": [],
+    "Scrum": [],
+    "Jira": [],
+}
+
+# "5 years of experience", "5+ yrs experience", "5 years of professional
+# experience", "5 ans d'expérience"
+_YEARS_RE = re.compile(
+    r"(\d{1,2}(?:[.,]\d)?)\s*\+?\s*(?:years?|yrs?|ans)\s+(?:of\s+|d['’]\s*)?(?:[a-zà-ÿ-]+\s+)?(?:experience|expérience)",
+    re.IGNORECASE
+)
+
+
+def extract_years(text: str) -> float:
+    """Largest stated number of years of experience, NaN if none."""
+    years = [float(match.group(1).replace(",", ".")) for match in _YEARS_RE.finditer(text)]
+    return max(years) if years else float("nan")
+
+
+def taxonomy_entry(entry: TaxonomyEntry) -> Tuple[List[str], bool]:
+    """
+    Normalize a taxonomy entry.
+
+    Returns:
+        (aliases, whether the bare skill name is matched too)
+
+    Raises:
+        ValueError: If the entry is neither a list of strings nor an object
+            with an "aliases" list and an optional boolean "match_name"
+    """
+    if isinstance(entry, dict):
+        aliases, match_name = entry.get("aliases", []), entry.get("match_name", True)
+        if set(entry) - {"aliases", "match_name"} or not isinstance(match_name, bool):
+            raise ValueError(f"Invalid taxonomy entry: {entry!r}")
+    else:
+        aliases, match_name = entry, True
+    if not isinstance(aliases, list) or not all(isinstance(alias, str) for alias in aliases):
+        raise ValueError(f"Invalid taxonomy entry: {entry!r}")
+    return aliases, match_name
+
+
+def load_taxonomy(path: str) -> Dict[str, TaxonomyEntry]:
+    """
+    Read a taxonomy from a JSON file.
+
+    Args:
+        path: JSON object mapping each skill name to a list of aliases, or
+            to {"aliases": [...], "match_name": false}
+
+    Returns:
+        Skill -> entry mapping, in file order
+
+    Raises:
+        ValueError: If the file is not a mapping of names to valid entries
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    if not isinstance(taxonomy, dict):
+        raise ValueError(f"{path}: expected a JSON object of skill -> list of aliases")
+    for entry in taxonomy.values():
+        try:
+            taxonomy_entry(entry)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+    return taxonomy
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher (Aho-Corasick automaton).
+
+    The trie of the patterns is compiled into a transition table (failure
+    links followed ahead of time), so scanning a text costs at most two dict
+    lookups per character however many patterns there are.
+
+    Args:
+        patterns: Strings to find (matched as given: lowercase them, and the
+            text, for case-insensitive matching)
+    """
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append(pattern_id)
+
+        # Breadth-first, so a state's failure link is resolved before its
+        # children. Each state keeps the transitions it inherits from its
+        # failure chain, except the root's: those are looked up last.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char) or goto[0].get(char, 0)
+                queue.append(child)
+        self._root = goto[0]
+        self._delta = delta
+        self._outputs = outputs
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Every occurrence of every pattern, overlapping ones included.
+
+        Yields:
+            (end, pattern index) pairs, ``end`` being the index just past
+            the match, in order of end position
+        """
+        root = self._root
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for position, char in enumerate(text):
+            state = delta[state].get(char) or root.get(char, 0)
+            if outputs[state]:
+                for pattern_id in outputs[state]:
+                    yield position + 1, pattern_id
+
+
+class SkillVocabulary:
+    """
+    A skill taxonomy compiled for extraction.
+
+    Args:
+        taxonomy: Skill name -> aliases, or taxonomy entry (defaults to
+            DEFAULT_TAXONOMY)
+
+    Raises:
+        ValueError: If a taxonomy entry is invalid
+    """
+
+    def __init__(self, taxonomy: Optional[Dict[str, TaxonomyEntry]] = None):
+        taxonomy = DEFAULT_TAXONOMY if taxonomy is None else taxonomy
+        self.skills: List[str] = list(taxonomy)
+        self.n_words = max(1, -(-len(self.skills) // 64))
+        # Names and aliases accepted by bits(), matched or not
+        self._lookup: Dict[str, int] = {}
+        patterns, owners, entries = [], [], []
+        for skill_id, skill in enumerate(self.skills):
+            aliases, match_name = taxonomy_entry(taxonomy[skill])
+            entries.append([skill, match_name, *aliases])
+            for alias in [skill, *aliases]:
+                alias = alias.lower().strip()
+                if not alias or alias in self._lookup:
+                    continue
+                self._lookup[alias] = skill_id
+                if match_name or alias != skill.lower().strip():
+                    patterns.append(alias)
+                    owners.append(skill_id)
+        self._owners = owners
+        self._lengths = [len(pattern) for pattern in patterns]
+        self.matcher = AhoCorasick(patterns)
+        # Identifies the vocabulary bitsets were computed with
+        self.digest = hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def skill_ids(self, text: str) -> List[int]:
+        """Ids of the skills mentioned in a text, in vocabulary order."""
+        text = text.lower()
+        found = set()
+        for end, pattern_id in self.matcher.iter_matches(text):
+            start = end - self._lengths[pattern_id]
+            # Whole words only: no letter or digit right before or after
+            if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                found.add(self._owners[pattern_id])
+        return sorted(found)
+
+    def pack(self, skill_ids: Iterable[int]) -> np.ndarray:
+        """Bitset (n_words uint64) with the given skill ids set."""
+        words = [0] * self.n_words
+        for skill_id in skill_ids:
+            words[skill_id >> 6] |= 1 << (skill_id & 63)
+        return np.array(words, dtype=np.uint64)
+
+    def extract(self, text: str) -> np.ndarray:
+        """Bitset of the skills mentioned in a text."""
+        return self.pack(self.skill_ids(text))
+
+    def bits(self, skills: Iterable[str]) -> np.ndarray:
+        """
+        Bitset of skills given by name or alias (case-insensitive).
+
+        Raises:
+            ValueError: If a skill is not in the vocabulary
+        """
+        skill_ids = []
+        for skill in skills:
+            skill_id = self._lookup.get(skill.lower().strip())
+            if skill_id is None:
+                raise ValueError(f"Unknown skill: {skill}")
+            skill_ids.append(skill_id)
+        return self.pack(skill_ids)
+
+    def decode(self, bits: np.ndarray) -> List[str]:
+        """Skill names of a bitset."""
+        flags = np.unpackbits(np.ascontiguousarray(bits, dtype="<u8").view(np.uint8), bitorder="little")
+        return [self.skills[i] for i in np.flatnonzero(flags[:len(self.skills)])]
+
+
+_vocabulary: Optional[SkillVocabulary] = None
+_vocabulary_lock = threading.Lock()
+
+
+def get_vocabulary() -> SkillVocabulary:
+    """The shared vocabulary: config.skills.taxonomy_file, or DEFAULT_TAXONOMY."""
+    global _vocabulary
+    with _vocabulary_lock:
+        if _vocabulary is None:
+            path = config.skills.taxonomy_file if config else ""
+            _vocabulary = SkillVocabulary(load_taxonomy(path) if path else None)
+            if logger:
+                logger.info(f"Skill vocabulary: {len(_vocabulary)} skills, {len(_vocabulary.matcher)} patterns")
+        return _vocabulary
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per row of a uint64 bitset matrix (or in a single bitset)."""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    return np.unpackbits(words.view(np.uint8), axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+@dataclass
+class SkillFilter:
+    """
+    Structured criteria applied before scoring.
+
+    Attributes:
+        required: Skills every kept resume must mention
+        preferred: Skills that raise the score of the resumes mentioning them
+        min_years: Minimum stated years of experience (resumes stating none
+            are dropped when set)
+        boost: Score added for mentioning every preferred skill, pro rata
+            for some (defaults to config.skills.boost)
+    """
+    required: List[str] = field(default_factory=list)
+    preferred: List[str] = field(default_factory=list)
+    min_years: Optional[float] = None
+    boost: Optional[float] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.required or self.preferred or self.min_years)
+
+    def key(self) -> str:
+        """Canonical text of the criteria, e.g. for cache keys."""
+        return json.dumps([
+            sorted(s.lower() for s in self.required),
+            sorted(s.lower() for s in self.preferred),
+            self.min_years,
+            self.boost,
+        ])
+
+
+class SkillIndex:
+    """
+    Skill bitsets and years of experience of a list of resumes.
+
+    Args:
+        bits: uint64 matrix, one bitset row per resume
+        years: Stated years of experience per resume (NaN if unknown)
+        vocabulary: Vocabulary the bitsets were computed with
+    """
+
+    def __init__(self, bits: np.ndarray, years: np.ndarray, vocabulary: SkillVocabulary):
+        self.bits = np.ascontiguousarray(bits, dtype=np.uint64).reshape(-1, vocabulary.n_words)
+        self.years = np.asarray(years, dtype=np.float32)
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def build(cls, texts: Sequence[str], vocabulary: Optional[SkillVocabulary] = None) -> "SkillIndex":
+        """Extract skills and experience from resume texts (one pass over each)."""
+        vocabulary = vocabulary if vocabulary is not None else get_vocabulary()
+        bits = np.zeros((len(texts), vocabulary.n_words), dtype=np.uint64)
+        years = np.empty(len(texts), dtype=np.float32)
+        with metrics.span("skill_extract", resumes=len(texts)):
+            for row, text in enumerate(texts):
+                bits[row] = vocabulary.extract(text)
+                years[row] = extract_years(text)
+        return cls(bits, years, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.bits.nbytes + self.years.nbytes)
+
+    def skills_of(self, row: int) -> List[str]:
+        """Skill names found in one resume."""
+        return self.vocabulary.decode(self.bits[row])
+
+    def count(self, skills: Iterable[str]) -> np.ndarray:
+        """Number of the given skills each resume mentions."""
+        return popcount(self.bits & self.vocabulary.bits(skills))
+
+    def mask(self, skill_filter: SkillFilter) -> np.ndarray:
+        """
+        Resumes meeting the filter's hard criteria.
+
+        Returns:
+            Boolean array: every required skill present and, with
+            min_years, at least that many stated years of experience
+
+        Raises:
+            ValueError: If a skill is not in the vocabulary
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if skill_filter.required:
+            required = self.vocabulary.bits(skill_filter.required)
+            keep &= np.all((self.bits & required) == required, axis=1)
+        if skill_filter.min_years:
+            # NaN (nothing stated) compares False
+            keep &= self.years >= skill_filter.min_years
+        return keep
+
+    def boosts(self, skill_filter: SkillFilter) -> np.ndarray:
+        """
+        Score bonus per resume: boost x share of the preferred skills it mentions.
+
+        Raises:
+            ValueError: If a skill is not in the vocabulary
+        """
+        if not skill_filter.preferred:
+            return np.zeros(len(self), dtype=np.float32)
+        boost = skill_filter.boost if skill_filter.boost is not None else (config.skills.boost if config else 0.1)
+        preferred = self.vocabulary.bits(skill_filter.preferred)
+        wanted = int(popcount(preferred))
+        return (boost * popcount(self.bits & preferred) / wanted).astype(np.float32)
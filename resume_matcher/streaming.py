@@ -0,0 +1,422 @@
+"""
+Streaming ingestion: rank very large resume collections with flat memory.
+
+load_resumes + rank_resumes hold every resume text (and vector) at once,
+so memory grows with the pool. stream_rank instead walks its inputs
+lazily and runs parse -> embed -> score on fixed-size batches, keeping
+only a running top-k heap; vectors go through the embedding cache as
+usual, so a second run over the same archive skips the model. Duplicate
+resumes are folded as they stream by (see resume_matcher.dedup): copies of
+files already read are not even parsed. The Deduplicator is the one part
+that grows with the input, by a few hundred bytes per distinct resume
+(plus a float16 embedding when near-duplicates are confirmed by embedding).
+
+Inputs can be mixed:
+
+- PDF files
+- directories (walked recursively, archives inside them included)
+- zip and tar archives (.zip, .tar, .tar.gz/.tgz, .tar.bz2, .tar.xz);
+  tar files are read as a stream, members never touch the disk
+- list files (.txt/.lst): one input per line
+- "-": inputs read from stdin, one per line
+"""
+
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from resume_matcher.dedup import Deduplicator, fold_duplicates
+from resume_matcher.metrics import metrics
+from resume_matcher.resume_parser import _extract_worker, _resolve_workers, get_text_cache
+from resume_matcher.text_cache import bytes_digest, file_digest
+from resume_matcher.vector_index import normalize
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+LIST_SUFFIXES = (".txt", ".lst")
+
+
+@dataclass
+class ResumeSource:
+    """
+    One PDF to ingest.
+
+    Attributes:
+        name: Path of the file, or "<archive>!<member>" for archive members
+        data: Content of archive members (None for files on disk)
+    """
+    name: str
+    data: Optional[bytes] = None
+
+    def digest(self) -> str:
+        return bytes_digest(self.data) if self.data is not None else file_digest(self.name)
+
+
+def _max_member_bytes() -> int:
+    return (config.app.max_file_size_mb if config else 10) * 1024 * 1024
+
+
+def _is_pdf(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def iter_sources(inputs: Iterable[str]) -> Iterator[ResumeSource]:
+    """
+    Lazily expand inputs into the PDFs they contain.
+
+    Args:
+        inputs: PDF files, directories, archives, list files or "-"
+
+    Yields:
+        ResumeSource per PDF; archive members larger than
+        ``config.app.max_file_size_mb`` are skipped
+    """
+    for item in inputs:
+        item = item.strip()
+        if not item:
+            continue
+        lowered = item.lower()
+        if item == "-":
+            yield from iter_sources(line for line in sys.stdin)
+        elif os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    lowered_name = name.lower()
+                    if _is_pdf(name) or lowered_name.endswith(".zip") or lowered_name.endswith(TAR_SUFFIXES):
+                        yield from iter_sources([os.path.join(root, name)])
+        elif lowered.endswith(".zip"):
+            yield from _iter_zip(item)
+        elif lowered.endswith(TAR_SUFFIXES):
+            yield from _iter_tar(item)
+        elif lowered.endswith(LIST_SUFFIXES):
+            with open(item, "r", encoding="utf-8") as f:
+                yield from iter_sources(f)
+        elif _is_pdf(item):
+            yield ResumeSource(item)
+        elif logger:
+            logger.warning(f"Skipping {item}: not a PDF, folder, archive or list file")
+
+
+def _iter_zip(path: str) -> Iterator[ResumeSource]:
+    limit = _max_member_bytes()
+    try:
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_pdf(info.filename):
+                    continue
+                if info.file_size > limit:
+                    if logger:
+                        logger.warning(f"Skipping {path}!{info.filename}: {info.file_size} bytes")
+                    continue
+                yield ResumeSource(f"{path}!{info.filename}", archive.read(info))
+    except (OSError, zipfile.BadZipFile) as e:
+        if logger:
+            logger.error(f"Error reading archive {path}: {e}")
+
+
+def _iter_tar(path: str) -> Iterator[ResumeSource]:
+    limit = _max_member_bytes()
+    try:
+        # "r|*": sequential stream, no index of the whole archive in memory
+        with tarfile.open(path, "r|*") as archive:
+            for member in archive:
+                if not member.isfile() or not _is_pdf(member.name):
+                    continue
+                if member.size > limit:
+                    if logger:
+                        logger.warning(f"Skipping {path}!{member.name}: {member.size} bytes")
+                    continue
+                f = archive.extractfile(member)
+                if f is not None:
+                    yield ResumeSource(f"{path}!{member.name}", f.read())
+    except (OSError, tarfile.TarError) as e:
+        if logger:
+            logger.error(f"Error reading archive {path}: {e}")
+
+
+def _extract_source(source: ResumeSource, timeout: Optional[float]) -> Tuple[str, str, float, int]:
+    return _extract_worker(source.name, timeout, source.data)
+
+
+class _BatchParser:
+    """
+    Parses batches of sources on one long-lived process pool.
+
+    submit() starts parsing a batch in the background and collect() waits
+    for it, so the next batch is parsed while the current one is embedded.
+    At most two batches are in flight, which bounds memory.
+
+    With a deduplicator, a file whose bytes are already known is not
+    parsed: a copy of a file from a batch the caller has folded becomes its
+    alias right away, a copy of one still being parsed is settled when its
+    batch is collected (returned with the text of the first copy and their
+    shared 'digest' when both are in the same batch).
+    """
+
+    def __init__(self, workers: Optional[int], timeout: Optional[float], deduplicator: Optional[Deduplicator] = None):
+        self.workers = _resolve_workers(workers)
+        self.timeout = timeout if timeout is not None else (config.parser.file_timeout if config else 0)
+        self.cache = get_text_cache()
+        self.deduplicator = deduplicator
+        # Digests of the files parsing in submitted, uncollected batches
+        self._in_flight: Dict[str, str] = {}
+        self._pool = None
+
+    def __enter__(self) -> "_BatchParser":
+        if self.workers > 1:
+            self._pool = self._start_pool()
+        return self
+
+    def _start_pool(self):
+        # Spawned, not forked: a fork would copy the parent's model threads
+        # and held locks (see the parser's pool)
+        return multiprocessing.get_context("spawn").Pool(processes=self.workers)
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+
+    def submit(self, sources: List[ResumeSource]):
+        """Serve cached texts and skip known copies, start parsing the rest."""
+        cached, todo, digests, repeats = [], [], {}, []
+        first: Dict[str, str] = {}
+        for source in sources:
+            if self.cache is None and self.deduplicator is None:
+                todo.append(source)
+                continue
+            try:
+                digest = source.digest()
+            except OSError as e:
+                if logger:
+                    logger.error(f"Error reading {source.name}: {e}")
+                continue
+            if self.deduplicator is not None:
+                if self._alias(source.name, digest):
+                    continue
+                if digest in self._in_flight:
+                    repeats.append((source.name, digest))
+                    continue
+                first[digest] = self._in_flight[digest] = source.name
+            text = self.cache.get(digest) if self.cache is not None else None
+            if text is not None:
+                cached.append({"filename": source.name, "content": text, "digest": digest})
+            else:
+                digests[source.name] = digest
+                todo.append(source)
+        if self.cache is not None:
+            metrics.incr("text_cache_hits", len(cached))
+            metrics.incr("text_cache_misses", len(todo))
+
+        worker = partial(_extract_source, timeout=self.timeout)
+        if self._pool is not None and todo:
+            pending = self._pool.map_async(worker, todo, chunksize=1)
+        else:
+            pending = todo
+        return cached, pending, digests, first, repeats, len(todo)
+
+    def _alias(self, name: str, digest: str) -> bool:
+        """Record a copy of known bytes as an alias; returns whether they were known."""
+        if self.deduplicator.seen_bytes(digest) is None:
+            return False
+        # Byte digest match: no text needed
+        self.deduplicator.add(name, "", digest)
+        metrics.incr("duplicate_resumes")
+        return True
+
+    def collect(self, submitted) -> List[Dict]:
+        """Wait for a submitted batch and return its resumes."""
+        cached, pending, digests, first, repeats, count = submitted
+        if isinstance(pending, list):
+            # In-process: no SIGALRM timeout (it only works on the main thread),
+            # like the parser's serial path
+            results = [_extract_source(source, None) for source in pending]
+        else:
+            # Same guard as the parser's stall timeout, for a whole batch
+            waves = math.ceil(count / self.workers)
+            stall_timeout = self.timeout * 2 * waves if self.timeout else None
+            try:
+                results = pending.get(timeout=stall_timeout)
+            except multiprocessing.TimeoutError:
+                if logger:
+                    logger.error(f"PDF extraction stalled, skipping a batch of {count} files")
+                # Stuck workers would stall every following batch
+                self._pool.terminate()
+                self._pool = self._start_pool()
+                results = []
+
+        resumes = list(cached)
+        for name, text, seconds, pages in results:
+            metrics.record("parse_pdf", seconds, file=os.path.basename(name), pages=pages)
+            metrics.observe("pdf_pages", pages)
+            if not text:
+                continue
+            if self.cache is not None and name in digests:
+                self.cache.put(digests[name], text)
+            resume = {"filename": name, "content": text}
+            if name in digests:
+                resume["digest"] = digests[name]
+            resumes.append(resume)
+        for digest in first:
+            del self._in_flight[digest]
+        if repeats:
+            texts = {resume["digest"]: resume["content"] for resume in resumes if "digest" in resume}
+            for name, digest in repeats:
+                if digest in texts:
+                    resumes.append({"filename": name, "content": texts[digest], "digest": digest})
+                else:
+                    # First copy in an earlier batch, folded by now (or unreadable, like this one)
+                    self._alias(name, digest)
+        return resumes
+
+
+def iter_resume_batches(
+    inputs: Iterable[str],
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    deduplicator: Optional[Deduplicator] = None
+) -> Iterator[List[Dict]]:
+    """
+    Parse inputs lazily, one batch of resumes at a time.
+
+    Args:
+        inputs: PDF files, directories, archives, list files or "-"
+        batch_size: PDFs per batch (defaults to config.parser.stream_batch_size)
+        workers: Parser processes (defaults to config, 0 = CPU count)
+        timeout: Per-file time limit in seconds (defaults to config)
+        deduplicator: Deduplicator the caller folds each batch with; byte
+            copies of files from earlier batches are added to it as aliases
+            and not parsed
+
+    Yields:
+        Lists of dicts with 'filename', 'content' and, when computed,
+        'digest' keys; files without text are left out
+    """
+    batch_size = batch_size or (config.parser.stream_batch_size if config else 256)
+    sources = iter_sources(inputs)
+    with _BatchParser(workers, timeout, deduplicator) as parser:
+        submitted = None
+        while True:
+            batch = list(itertools.islice(sources, batch_size))
+            upcoming = parser.submit(batch) if batch else None
+            if submitted is not None:
+                yield parser.collect(submitted)
+            if upcoming is None:
+                return
+            submitted = upcoming
+
+
+def stream_rank(
+    job_description: str,
+    inputs: Iterable[str],
+    top_k: int = 10,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    pooling: Optional[str] = None,
+    rerank: Optional[bool] = None,
+    progress=None
+) -> list:
+    """
+    Rank a resume collection of any size against a job description.
+
+    Semantic retrieval only: the BM25 modes need collection-wide term
+    statistics that a single pass does not have.
+
+    Args:
+        job_description: The job posting text
+        inputs: PDF files, directories, archives, list files or "-"
+        top_k: Matches kept
+        batch_size: PDFs parsed and embedded per batch (defaults to config)
+        workers: Parser processes (defaults to config, 0 = CPU count)
+        pooling: Chunk pooling method, as in rank_resumes
+        rerank: Re-order the final shortlist with the cross-encoder
+            (defaults to config.reranker.enabled)
+        progress: Optional callable(resumes_scored, seconds_elapsed),
+            called after each batch
+
+    Returns:
+        List of RankedResume sorted by score descending; ties keep the
+        order in which the resumes were read. Duplicates are folded into
+        the first copy read (unless config.dedup is disabled), whose
+        'aliases' lists them, including copies read after it
+    """
+    # Imported here: the model stack is only needed once ranking starts
+    from resume_matcher import reranker
+    from resume_matcher.chunker import resolve_pooling
+    from resume_matcher.matcher import RankedResume, _score_embeddings, embed_resumes, get_model
+
+    if top_k <= 0:
+        return []
+    if rerank is None:
+        rerank = config.reranker.enabled if config else False
+    keep = max(top_k, config.reranker.top_n if config else 20) if rerank else top_k
+
+    pooling = resolve_pooling(pooling if pooling is not None else (config.model.pooling if config else None))
+    with metrics.span("encode", batch_size=1):
+        job_matrix = normalize(get_model().encode([job_description]))
+    deduplicator = Deduplicator() if config is None or config.dedup.enabled else None
+
+    # Min-heap of (score, -position, position, dedup item, resume): the root
+    # is the weakest kept match, and of equal scores the latest read.
+    # Positions are unique, so comparisons never reach the resume dicts
+    heap = []
+    seen = 0
+    start = time.perf_counter()
+    for resumes in iter_resume_batches(inputs, batch_size=batch_size, workers=workers, deduplicator=deduplicator):
+        items = [None] * len(resumes)
+        if deduplicator is not None and resumes:
+            unique = fold_duplicates(resumes, deduplicator)
+            resumes = [resumes[position] for position, _ in unique]
+            items = [item for _, item in unique]
+        if not resumes:
+            continue
+        with metrics.span("stream_batch", resumes=len(resumes)):
+            embeddings = embed_resumes([r['content'] for r in resumes], pooling)
+            scores = _score_embeddings(job_matrix, embeddings)[0]
+        if deduplicator is not None:
+            # Whole-text embeddings double as the near-duplicate confirmation vectors
+            deduplicator.forget_texts(dict(zip(items, embeddings)) if pooling is None else None)
+        for resume, item, score in zip(resumes, items, scores.tolist()):
+            entry = (score, -seen, seen, item, resume)
+            if len(heap) < keep:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+            seen += 1
+        if progress is not None:
+            progress(seen, time.perf_counter() - start)
+
+    ranked = sorted(heap, key=lambda entry: (-entry[0], entry[2]))
+    aliases = deduplicator.aliases if deduplicator is not None else {}
+    results = [
+        RankedResume(dict(resume, aliases=list(aliases[item])) if item in aliases else resume, position, score)
+        for score, _, position, item, resume in ranked
+    ]
+    if logger:
+        logger.info(f"Streamed {seen} resumes in {time.perf_counter() - start:.1f}s")
+        if deduplicator is not None:
+            stats = deduplicator.stats()
+            logger.info(f"Dedup: {stats['exact']} exact, {stats['near']} near duplicates folded")
+
+    if rerank and results:
+        results = reranker.rerank(job_description, results)
+    return results[:top_k]
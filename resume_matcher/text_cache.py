@@ -0,0 +1,131 @@
+"""
+Persistent cache of text extracted from PDFs.
+
+Entries are keyed by the SHA-256 digest of the file bytes, so the same
+resume re-uploaded under any name is parsed only once. Text is stored
+zlib-compressed in a single SQLite database, which keeps the cache compact
+and safe to share between threads and processes.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+
+_READ_CHUNK = 1 << 20
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def bytes_digest(data: BytesLike) -> str:
+    """
+    Hash an in-memory buffer (e.g. ``uploaded_file.getbuffer()``) without copying it.
+
+    Args:
+        data: Bytes-like object holding the file content
+
+    Returns:
+        Hex SHA-256 digest of the content
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash a file on disk in fixed-size chunks.
+
+    Args:
+        path: Path of the file
+
+    Returns:
+        Hex SHA-256 digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """
+    SQLite-backed map from file digest to extracted text.
+
+    Args:
+        db_path: Path of the SQLite database file (created if missing)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts ("
+                " digest TEXT PRIMARY KEY,"
+                " text BLOB NOT NULL,"
+                " created_at REAL NOT NULL DEFAULT (julianday('now'))"
+                ")"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the cache thread-safe
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, digest: str) -> Optional[str]:
+        """
+        Look up the text extracted from a file.
+
+        Args:
+            digest: SHA-256 digest of the file bytes
+
+        Returns:
+            The cached text, or None on a miss
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT text FROM texts WHERE digest = ?", (digest,)).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def put(self, digest: str, text: str) -> None:
+        """
+        Store the text extracted from a file.
+
+        Args:
+            digest: SHA-256 digest of the file bytes
+            text: Extracted text
+        """
+        blob = zlib.compress(text.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO texts (digest, text) VALUES (?, ?)", (digest, blob))
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
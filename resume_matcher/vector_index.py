@@ -0,0 +1,500 @@
+"""
+Persistent vector index over normalized resume embeddings.
+
+Two backends share the same API (build, add, remove, query, search,
+save/load):
+
+- FlatIndex: exact inner-product scan, the reference for recall.
+- IVFIndex: inverted-file index. Vectors are clustered with spherical
+  k-means and a query only scans the ``nprobe`` closest clusters, so search
+  cost grows with the pool size divided by the number of clusters. Recall
+  is traded for speed through nprobe: on 100k synthetic 384-d vectors with
+  316 lists (benchmarks/bench_vector_index.py), recall@10 is 0.84 at
+  nprobe=8, 0.94 at 16 and 0.97 at 32, against 1.0 for the flat scan.
+
+CandidateStore uses IVFIndex to shortlist rows when INDEX_BACKEND=ivf.
+
+Vectors are L2-normalized on insertion, so inner product equals cosine
+similarity and matches the scores of rank_resumes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from config import config
+    from logger import logger
+except ImportError:
+    # Fallback if config/logger not available
+    config = None
+    logger = None
+
+
+META_FILE = "meta.json"
+VECTORS_FILE = "vectors.npy"
+CENTROIDS_FILE = "centroids.npy"
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize rows as float32 (zero rows are left as zeros).
+
+    Args:
+        vectors: 1D or 2D array of embeddings
+
+    Returns:
+        2D float32 array of unit-length rows
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Uses np.argpartition so the cost is O(n + k log k) instead of a full sort.
+    Ties are broken by lower index first, which matches a stable descending
+    sort of the whole array.
+
+    Args:
+        scores: 1D array of scores
+        k: Number of results wanted
+
+    Returns:
+        1D array of at most k indices into ``scores``
+    """
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+
+    partition = np.argpartition(-scores, k - 1)[:k]
+    threshold = scores[partition].min()
+    # argpartition picks arbitrary members of a tie at the boundary; keep
+    # the lowest indices instead so results are deterministic
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    selected = np.concatenate([above, ties])
+    order = np.lexsort((selected, -scores[selected]))
+    return selected[order]
+
+
+def _default_encode(texts: List[str]) -> np.ndarray:
+    # Imported lazily so the index can be used without loading the model
+    from resume_matcher.matcher import get_model
+    return get_model().encode(texts)
+
+
+class VectorIndex:
+    """
+    Base class: id bookkeeping, growable vector storage and persistence.
+
+    Args:
+        dim: Embedding dimension
+        encode: Function turning a list of texts into embeddings, used by
+            ``search`` (defaults to the shared SentenceTransformer model)
+    """
+
+    backend = "base"
+
+    def __init__(self, dim: int, encode: Optional[Callable[[List[str]], np.ndarray]] = None):
+        self.dim = dim
+        self.encode = encode or _default_encode
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # Over-allocated buffer so repeated add() calls are amortized O(1)
+        self._buffer = np.empty((0, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the stored (normalized) vectors, one row per id."""
+        return self._buffer[:len(self._ids)]
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray) -> "VectorIndex":
+        """
+        Replace the index content with the given vectors.
+
+        Args:
+            ids: Unique identifiers (e.g. resume digests or filenames)
+            vectors: 2D array of embeddings aligned with ``ids``
+
+        Returns:
+            self, for chaining
+        """
+        self._ids = []
+        self._rows = {}
+        self._buffer = np.empty((0, self.dim), dtype=np.float32)
+        self.add(ids, vectors)
+        return self
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Insert vectors; an id that is already indexed is replaced.
+
+        Args:
+            ids: Unique identifiers
+            vectors: 2D array of embeddings aligned with ``ids``
+        """
+        vectors = normalize(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {vectors.shape[1]}")
+
+        existing = [item_id for item_id in ids if item_id in self._rows]
+        if existing:
+            self.remove(existing)
+
+        start = len(self._ids)
+        self._reserve(start + len(ids))
+        self._buffer[start:start + len(ids)] = vectors
+        for offset, item_id in enumerate(ids):
+            self._rows[item_id] = start + offset
+        self._ids.extend(ids)
+        self._on_add(start, vectors)
+
+    def remove(self, ids: Sequence[str]) -> int:
+        """
+        Delete vectors by id (unknown ids are ignored).
+
+        Args:
+            ids: Identifiers to delete
+
+        Returns:
+            Number of vectors removed
+        """
+        rows = [self._rows[item_id] for item_id in ids if item_id in self._rows]
+        if not rows:
+            return 0
+
+        keep = np.ones(len(self._ids), dtype=bool)
+        keep[rows] = False
+        n_kept = int(keep.sum())
+        self._buffer[:n_kept] = self.vectors[keep]
+        self._ids = [item_id for item_id, k in zip(self._ids, keep) if k]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._on_remove(keep)
+        return len(rows)
+
+    def scan(self, vector: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows worth scoring for a query embedding, with their scores.
+
+        Args:
+            vector: Query embedding (normalized internally)
+
+        Returns:
+            (row indices into ``vectors``, cosine similarities)
+        """
+        if not self._ids:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        return self._candidates(normalize(vector)[0])
+
+    def query(self, vector: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the k stored vectors most similar to a query embedding.
+
+        Args:
+            vector: Query embedding (normalized internally)
+            k: Number of results
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        if not self._ids:
+            return []
+        rows, scores = self.scan(vector)
+        best = top_k_indices(scores, k)
+        return [(self._ids[rows[i]], float(scores[i])) for i in best]
+
+    def search(self, job_description: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Encode a job description and return the top-k matching ids.
+
+        Args:
+            job_description: The job posting text
+            k: Number of results
+
+        Returns:
+            List of (id, cosine similarity) pairs, best first
+        """
+        return self.query(np.asarray(self.encode([job_description]))[0], k)
+
+    def save(self, path: str) -> None:
+        """
+        Persist the index to a directory.
+
+        Args:
+            path: Target directory (created if missing)
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / VECTORS_FILE, self.vectors)
+        meta = {"backend": self.backend, "dim": self.dim, "ids": self._ids}
+        meta.update(self._meta())
+        tmp_path = directory / (META_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, directory / META_FILE)
+
+        if logger:
+            logger.info(f"Saved {self.backend} index with {len(self)} vectors to {directory}")
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._buffer):
+            return
+        capacity = max(size, 2 * len(self._buffer), 1024)
+        buffer = np.empty((capacity, self.dim), dtype=np.float32)
+        buffer[:len(self._ids)] = self.vectors
+        self._buffer = buffer
+
+    # Hooks for subclasses
+    def _on_add(self, start: int, vectors: np.ndarray) -> None:
+        pass
+
+    def _on_remove(self, keep: np.ndarray) -> None:
+        pass
+
+    def _candidates(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (row indices, scores) of the vectors to consider for a query."""
+        raise NotImplementedError
+
+    def _meta(self) -> dict:
+        return {}
+
+
+class FlatIndex(VectorIndex):
+    """Exact search: every stored vector is scored."""
+
+    backend = "flat"
+
+    def _candidates(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return np.arange(len(self._ids)), self.vectors @ query
+
+
+class IVFIndex(VectorIndex):
+    """
+    Approximate search over an inverted file of k-means clusters.
+
+    The index is retrained once it holds RETRAIN_GROWTH times the vectors
+    it was trained on, so clusters (and the automatic number of lists)
+    follow the pool as it grows.
+
+    Args:
+        dim: Embedding dimension
+        nlist: Number of clusters (None or 0 = sqrt of the training set size)
+        nprobe: Number of closest clusters scanned per query (more is
+            slower and closer to exact, see the module docstring)
+        encode: Text encoder used by ``search``
+        seed: Random seed for k-means initialisation
+
+    Attributes:
+        configured_nlist: The ``nlist`` argument (None = automatic)
+        nlist: Number of clusters of the trained index
+    """
+
+    backend = "ivf"
+
+    # Enough points per centroid for stable clusters without training on
+    # the whole pool
+    TRAIN_POINTS_PER_LIST = 64
+    TRAIN_ITERATIONS = 10
+    RETRAIN_GROWTH = 2
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 32,
+        encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+        seed: int = 0
+    ):
+        super().__init__(dim, encode)
+        self.configured_nlist = nlist or None
+        self.nlist = self.configured_nlist
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray) -> "IVFIndex":
+        self.train(vectors)
+        self._assignments = np.empty(0, dtype=np.int32)
+        return super().build(ids, vectors)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """
+        Learn the cluster centroids with spherical k-means.
+
+        Args:
+            vectors: Training embeddings (a sample is used for large sets)
+        """
+        vectors = normalize(vectors)
+        n = len(vectors)
+        if n == 0:
+            raise ValueError("Cannot train an IVF index without vectors")
+
+        nlist = min(self.configured_nlist or max(1, int(np.sqrt(n))), n)
+        rng = np.random.default_rng(self.seed)
+        sample_size = min(n, nlist * self.TRAIN_POINTS_PER_LIST)
+        sample = vectors[rng.choice(n, sample_size, replace=False)] if sample_size < n else vectors
+
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        for _ in range(self.TRAIN_ITERATIONS):
+            assignments = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters with random points
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        self.nlist = nlist
+        self.trained_size = n
+        self._assignments = self._nearest(self.vectors, centroids) if len(self) else np.empty(0, dtype=np.int32)
+        self._lists = None
+
+        if logger:
+            logger.info(f"Trained IVF index: {nlist} lists on {len(sample)} vectors")
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk_size: int = 16384) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), chunk_size):
+            block = vectors[start:start + chunk_size] @ centroids.T
+            assignments[start:start + chunk_size] = block.argmax(axis=1)
+        return assignments
+
+    def _on_add(self, start: int, vectors: np.ndarray) -> None:
+        if not self.is_trained or len(self) >= self.RETRAIN_GROWTH * max(self.trained_size, 1):
+            # The first batch doubles as training data; later, clusters
+            # trained on a fraction of the pool would grow unbalanced
+            self.train(self.vectors)
+            return
+        self._assignments = np.concatenate([self._assignments[:start], self._nearest(vectors, self.centroids)])
+        self._lists = None
+
+    def _on_remove(self, keep: np.ndarray) -> None:
+        self._assignments = self._assignments[keep]
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        # Rebuilt lazily after mutations: one stable sort groups rows by list
+        if self._lists is None:
+            order = np.argsort(self._assignments, kind="stable")
+            bounds = np.searchsorted(self._assignments[order], np.arange(self.nlist + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.nlist)]
+        return self._lists
+
+    def _candidates(self, query: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        lists = self._inverted_lists()
+        probes = top_k_indices(self.centroids @ query, self.nprobe)
+        rows = np.sort(np.concatenate([lists[p] for p in probes]))
+        return rows, self.vectors[rows] @ query
+
+    def _meta(self) -> dict:
+        return {
+            "nlist": self.configured_nlist,
+            "nprobe": self.nprobe,
+            "seed": self.seed,
+            "trained_size": self.trained_size,
+        }
+
+    def save(self, path: str) -> None:
+        super().save(path)
+        if self.centroids is not None:
+            np.save(Path(path) / CENTROIDS_FILE, self.centroids)
+
+
+def create_index(
+    dim: int,
+    backend: Optional[str] = None,
+    encode: Optional[Callable[[List[str]], np.ndarray]] = None,
+    **kwargs
+) -> VectorIndex:
+    """
+    Create an empty index for the given (or configured) backend.
+
+    Args:
+        dim: Embedding dimension
+        backend: "flat" or "ivf" (defaults to config.index.backend)
+        encode: Text encoder used by ``search``
+        **kwargs: Backend options (nlist, nprobe) overriding config
+
+    Returns:
+        Empty VectorIndex
+    """
+    backend = backend or (config.index.backend if config else "flat")
+    if backend == "flat":
+        return FlatIndex(dim, encode=encode)
+    if backend == "ivf":
+        options = {"nlist": config.index.nlist, "nprobe": config.index.nprobe} if config else {}
+        options.update(kwargs)
+        return IVFIndex(dim, encode=encode, **options)
+    raise ValueError(f"Unknown index backend: {backend}")
+
+
+def load_index(
+    path: str,
+    encode: Optional[Callable[[List[str]], np.ndarray]] = None
+) -> VectorIndex:
+    """
+    Load an index saved with ``VectorIndex.save``.
+
+    Args:
+        path: Directory the index was saved to
+        encode: Text encoder used by ``search``
+
+    Returns:
+        The restored index
+    """
+    directory = Path(path)
+    with open(directory / META_FILE, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta["backend"] == "ivf":
+        index = IVFIndex(meta["dim"], nlist=meta["nlist"], nprobe=meta["nprobe"], encode=encode, seed=meta["seed"])
+        centroids_path = directory / CENTROIDS_FILE
+        if centroids_path.exists():
+            index.centroids = np.load(centroids_path)
+            index.nlist = len(index.centroids)
+            index.trained_size = meta.get("trained_size", len(meta["ids"]))
+    else:
+        index = FlatIndex(meta["dim"], encode=encode)
+
+    vectors = np.load(directory / VECTORS_FILE)
+    index._ids = list(meta["ids"])
+    index._rows = {item_id: row for row, item_id in enumerate(index._ids)}
+    index._buffer = vectors
+    if isinstance(index, IVFIndex) and index.is_trained:
+        index._assignments = index._nearest(vectors, index.centroids)
+    return index
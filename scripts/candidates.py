@@ -0,0 +1,105 @@
+"""
+Manage the persistent candidate database and search it.
+
+Resumes are parsed and embedded once at ingest; a search then only encodes
+the job description and scans the stored embeddings.
+
+Usage:
+    python scripts/candidates.py ingest data/ more_cvs/cv_12.pdf
+    python scripts/candidates.py search --job job.txt --top-k 10
+    python scripts/candidates.py search --text "Python developer with SQL"
+    python scripts/candidates.py delete cv_12.pdf cv_13.pdf
+    python scripts/candidates.py list
+    python scripts/candidates.py compact
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_matcher.candidate_store import CandidateStore
+
+
+def expand_paths(paths: list) -> list:
+    """PDF files given directly or found in the given folders."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(".pdf")
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--store", help="Store directory (defaults to CANDIDATE_STORE_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Add or update resumes")
+    ingest.add_argument("paths", nargs="+", help="PDF files or folders of PDFs")
+
+    search = commands.add_parser("search", help="Rank stored candidates against a job description")
+    job = search.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job", help="Job description file (.txt)")
+    job.add_argument("--text", help="Job description text")
+    search.add_argument("--top-k", type=int, default=10)
+    search.add_argument("--output", help="Write results to this JSON file")
+
+    delete = commands.add_parser("delete", help="Remove candidates by name")
+    delete.add_argument("names", nargs="+")
+
+    commands.add_parser("list", help="List stored candidates")
+    commands.add_parser("compact", help="Drop deleted entries from disk")
+    args = parser.parse_args()
+
+    store = CandidateStore(args.store)
+
+    if args.command == "ingest":
+        files = expand_paths(args.paths)
+        print(f"📂 {len(files)} PDF files")
+        report = store.ingest_files(files)
+        print(f"✅ {report}")
+        for name in report.failed:
+            print(f"   ⚠️ No text extracted from {name}")
+
+    elif args.command == "search":
+        if args.job:
+            with open(args.job, "r", encoding="utf-8") as f:
+                job_description = f.read()
+        else:
+            job_description = args.text
+        results = store.search(job_description, top_k=args.top_k)
+        print(f"🎯 Top {len(results)} of {len(store)} candidates")
+        print("-" * 40)
+        for result in results:
+            print(f"{result.score:.4f}     | {result.filename}")
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump([{"filename": r.filename, "score": r.score} for r in results], f, indent=2)
+            print(f"\n💾 Results written to {args.output}")
+
+    elif args.command == "delete":
+        print(f"🗑️ Deleted {store.delete(args.names)} candidates")
+
+    elif args.command == "list":
+        for name in store.names():
+            print(name)
+        stats = store.stats()
+        print(f"\n{stats['candidates']} candidates, {stats['vectors']} stored vectors "
+              f"({stats['dead_ratio']:.0%} dead, {stats['dtype']})")
+
+    elif args.command == "compact":
+        print(f"🧹 Dropped {store.compact()} dead vectors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Minimal fake Ollama server for testing and benchmarking the explainer
+without a real LLM.
+
+Implements POST /api/generate (streaming and non-streaming) and answers
+with a canned explanation, emitted token by token with a configurable delay.
+
+Prompt evaluation can be simulated too (--prompt-delay per prompt word).
+Like Ollama's runner, the server keeps the previous prompt "evaluated": only
+the words after the prefix it shares with the previous prompt are charged,
+and reported as prompt_eval_count.
+
+Usage:
+    python scripts/fake_ollama.py --port 11434 --token-delay 0.01
+
+Or from Python:
+    server, url = start_fake_ollama()
+    client = OllamaClient(base_url=url)
+    ...
+    server.shutdown()
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+CANNED_RESPONSE = (
+    "- Strong hands-on experience with the core technologies listed in the job.\n"
+    "- Relevant professional experience in a similar role.\n"
+    "- Demonstrated ability to deliver projects matching the job requirements."
+)
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests_seen += 1
+
+        if self.server.fail_next > 0:
+            self.server.fail_next -= 1
+            body = b'{"error": "simulated failure"}'
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        tokens = [word + " " for word in self.server.response_text.split(" ")]
+        prompt_tokens = self._evaluate_prompt(payload.get("prompt", "").split())
+        stats = {
+            "done": True,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(self.server.prompt_delay * prompt_tokens * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(self.server.token_delay * len(tokens) * 1e9),
+            "context": [1, 2, 3],
+        }
+
+        if payload.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(self.server.token_delay)
+                self._write_chunk({"model": payload.get("model"), "response": token, "done": False})
+            self._write_chunk(dict(stats, model=payload.get("model"), response=""))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(self.server.token_delay * len(tokens))
+            body = json.dumps(dict(stats, model=payload.get("model"), response="".join(tokens))).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _evaluate_prompt(self, words: list) -> int:
+        """Charge the prompt words not shared with the cached previous prompt."""
+        with self.server.prompt_lock:
+            cached = self.server.cached_prompt
+            shared = 0
+            for a, b in zip(cached, words):
+                if a != b:
+                    break
+                shared += 1
+            evaluated = len(words) - shared
+            self.server.prompt_words_evaluated += evaluated
+            time.sleep(self.server.prompt_delay * evaluated)
+            self.server.cached_prompt = words
+        return evaluated
+
+    def _write_chunk(self, data: dict) -> None:
+        line = json.dumps(data).encode() + b"\n"
+        self.wfile.write(f"{len(line):X}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        # Keep test and benchmark output clean
+        pass
+
+
+def start_fake_ollama(
+    port: int = 0,
+    token_delay: float = 0.0,
+    response_text: str = CANNED_RESPONSE,
+    fail_next: int = 0,
+    prompt_delay: float = 0.0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start the fake server on a background thread.
+
+    Args:
+        port: Port to listen on (0 = any free port)
+        token_delay: Seconds to wait before each generated token
+        response_text: Text returned as the explanation
+        fail_next: Number of initial requests answered with HTTP 503
+        prompt_delay: Seconds per evaluated (not cached) prompt word
+
+    Returns:
+        (server, base URL); call server.shutdown() to stop it
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeOllamaHandler)
+    server.daemon_threads = True
+    server.token_delay = token_delay
+    server.response_text = response_text
+    server.fail_next = fail_next
+    server.requests_seen = 0
+    server.prompt_delay = prompt_delay
+    server.prompt_lock = threading.Lock()
+    server.cached_prompt = []
+    server.prompt_words_evaluated = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds per generated token")
+    parser.add_argument("--prompt-delay", type=float, default=0.0, help="Seconds per evaluated prompt word")
+    args = parser.parse_args()
+
+    server, url = start_fake_ollama(args.port, args.token_delay, prompt_delay=args.prompt_delay)
+    print(f"🤖 Fake Ollama listening on {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
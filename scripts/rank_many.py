@@ -0,0 +1,80 @@
+"""
+Rank a folder of resumes against a folder of job descriptions in one pass.
+
+Each job description is a .txt file; resumes are PDFs. The resume pool is
+parsed and encoded once, then scored against every job with rank_many.
+
+Usage:
+    python scripts/rank_many.py --jobs jobs/ --resumes data/ --top-k 10
+    python scripts/rank_many.py --jobs jobs/ --resumes data/ --output results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_matcher.resume_parser import load_resumes
+from resume_matcher.matcher import rank_many
+
+
+def list_files(folder: str, extension: str) -> list:
+    return sorted(
+        os.path.join(folder, f)
+        for f in os.listdir(folder)
+        if f.lower().endswith(extension)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", required=True, help="Folder of job descriptions (.txt)")
+    parser.add_argument("--resumes", default="data", help="Folder of resumes (.pdf)")
+    parser.add_argument("--top-k", type=int, default=10, help="Matches kept per job")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    job_files = list_files(args.jobs, ".txt")
+    pdf_files = list_files(args.resumes, ".pdf")
+    if not job_files or not pdf_files:
+        print(f"❌ Need at least one .txt in '{args.jobs}' and one .pdf in '{args.resumes}'.")
+        return 1
+
+    job_descriptions = []
+    for path in job_files:
+        with open(path, "r", encoding="utf-8") as f:
+            job_descriptions.append(f.read())
+
+    print(f"📂 {len(job_files)} jobs, {len(pdf_files)} resumes")
+
+    print("\n--- Phase 1: Parsing PDFs ---")
+    resumes = load_resumes(pdf_files)
+    print(f"✅ Parsed {len(resumes)} resumes")
+
+    print("\n--- Phase 2: Matching ---")
+    rankings = rank_many(job_descriptions, resumes, top_k=args.top_k)
+
+    report = {}
+    for job_file, ranking in zip(job_files, rankings):
+        report[job_file] = [
+            dict({"filename": r.filename, "score": r.score}, **({"aliases": r.aliases} if r.aliases else {}))
+            for r in ranking
+        ]
+        print(f"\n🎯 {job_file}")
+        print("-" * 40)
+        for result in ranking:
+            print(f"{result.score:.4f}     | {result.filename}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
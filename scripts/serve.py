@@ -0,0 +1,41 @@
+"""
+Run the headless ranking service (JSON over HTTP) on the candidate database.
+
+Endpoints: GET /health, POST /ingest, POST /rank, POST /explain; see
+resume_matcher/server.py for the request formats.
+
+Usage:
+    python scripts/serve.py
+    python scripts/serve.py --host 0.0.0.0 --port 9000 --store data/store
+
+    curl -s localhost:8080/rank -d '{"job_description": "Python developer", "top_k": 5}'
+    curl -s -H 'Content-Type: application/pdf' --data-binary @cv.pdf 'localhost:8080/ingest?name=cv.pdf'
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.matcher import preload_model
+from resume_matcher.server import RankingService, serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Interface to bind (defaults to SERVER_HOST)")
+    parser.add_argument("--port", type=int, help="Port (defaults to SERVER_PORT)")
+    parser.add_argument("--store", help="Candidate database directory (defaults to STORE_DIR)")
+    args = parser.parse_args()
+
+    # Load the model while the socket opens, not on the first request
+    preload_model()
+    serve(args.host, args.port, RankingService(CandidateStore(args.store)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
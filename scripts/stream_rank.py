@@ -0,0 +1,69 @@
+"""
+Rank a resume collection of any size against one job description, with
+flat memory: PDFs are read, embedded and scored batch by batch and only
+the running top-k is kept.
+
+Inputs can be PDFs, folders, zip/tar archives, list files (one path per
+line) or "-" to read paths from stdin.
+
+Usage:
+    python scripts/stream_rank.py --job job.txt resumes.tar.gz --top-k 20
+    python scripts/stream_rank.py --text "Python developer with SQL" data/ archive.zip
+    find /mnt/cvs -name '*.pdf' | python scripts/stream_rank.py --job job.txt -
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from resume_matcher.streaming import stream_rank
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="PDFs, folders, archives, list files or -")
+    job = parser.add_mutually_exclusive_group(required=True)
+    job.add_argument("--job", help="Job description file (.txt)")
+    job.add_argument("--text", help="Job description text")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, help="PDFs per batch (defaults to PARSER_STREAM_BATCH_SIZE)")
+    parser.add_argument("--workers", type=int, help="Parser processes (defaults to PARSER_WORKERS)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.job:
+        with open(args.job, "r", encoding="utf-8") as f:
+            job_description = f.read()
+    else:
+        job_description = args.text
+
+    def progress(scored: int, seconds: float):
+        print(f"\r⏳ {scored} resumes scored ({scored / max(seconds, 1e-9):.1f}/s)", end="", file=sys.stderr, flush=True)
+
+    results = stream_rank(
+        job_description,
+        args.inputs,
+        top_k=args.top_k,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        progress=progress
+    )
+    print(file=sys.stderr)
+
+    print(f"🎯 Top {len(results)} candidates")
+    print("-" * 40)
+    for result in results:
+        print(f"{result.score:.4f}     | {result.filename}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([{"filename": r.filename, "score": r.score} for r in results], f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
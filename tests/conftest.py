@@ -0,0 +1,78 @@
+"""
+Shared fixtures: a deterministic fake encoder in place of the
+SentenceTransformer model, so the tests run offline and fast.
+"""
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Must happen before the project modules read their configuration: no
+# persistent caches, no metrics files, everything encoded in-process
+os.environ["CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["MODEL_WORKERS"] = "1"
+
+# Add parent directory to path so we can import project modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DIM = 16
+
+
+def fake_embedding(text: str) -> np.ndarray:
+    """Bag of hashed words: texts sharing words get similar vectors."""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % DIM] += 1.0
+    return vector
+
+
+class FakeModel:
+    """Stands in for SentenceTransformer: encode() and max_seq_length only."""
+
+    max_seq_length = 256
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, **kwargs):
+        self.encoded += len(texts)
+        return np.array([fake_embedding(text) for text in texts], dtype=np.float32).reshape(len(texts), DIM)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Patch the matcher's model loader; the returned model counts encoded texts."""
+    from resume_matcher import matcher
+
+    model = FakeModel()
+    monkeypatch.setattr(matcher, "get_model", lambda *args, **kwargs: model)
+    return model
+
+
+def make_pdf(text: str) -> bytes:
+    """Smallest one-page PDF whose extracted text is ``text`` (ASCII, no parentheses)."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
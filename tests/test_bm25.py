@@ -0,0 +1,58 @@
+import numpy as np
+
+from resume_matcher.bm25 import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_drops_stopwords_and_case():
+    assert tokenize("The Python developer with SQL") == ["python", "developer", "sql"]
+
+
+def test_rare_terms_weigh_more():
+    index = BM25Index()
+    index.add(
+        ["a", "b", "c"],
+        ["python developer", "java developer", "python kubernetes developer"]
+    )
+    results = index.search("kubernetes developer", k=3)
+    assert results[0][0] == "c"
+    # Every document has "developer": the remaining ones tie on it
+    assert {doc_id for doc_id, _ in results[1:]} == {"a", "b"}
+
+
+def test_no_match_returns_nothing():
+    index = BM25Index()
+    index.add(["a"], ["python developer"])
+    assert index.search("rust") == []
+
+
+def test_replace_and_remove():
+    index = BM25Index()
+    index.add(["a", "b"], ["python", "java"])
+    index.add(["a"], ["rust"])
+    assert len(index) == 2
+    assert index.search("python") == []
+    assert index.search("rust")[0][0] == "a"
+
+    assert index.remove(["a", "unknown"]) == 1
+    assert "a" not in index
+    assert index.search("rust") == []
+
+
+def test_compaction_keeps_scores():
+    index = BM25Index()
+    index.add([str(i) for i in range(10)], [f"python doc{i}" for i in range(10)])
+    index.add(["go"], ["golang python"])
+    before = dict(index.search("golang python", k=3))
+
+    index.remove([str(i) for i in range(6)])
+    # More than half the rows were dead: renumbered without them
+    assert index.ids == ["6", "7", "8", "9", "go"]
+    assert index.row_of("go") == 4
+    after = dict(index.search("golang python", k=3))
+    assert list(after)[0] == list(before)[0] == "go"
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([np.array([0, 1, 2]), np.array([2, 1])], size=4, k=60)
+    assert np.argsort(-fused, kind="stable").tolist() == [2, 1, 0, 3]
+    assert fused[3] == 0
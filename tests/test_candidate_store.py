@@ -0,0 +1,107 @@
+import pytest
+
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.skills import SkillFilter
+
+RESUMES = {
+    "alice.pdf": "python developer django postgresql 6 years of experience",
+    "bob.pdf": "java engineer spring kubernetes",
+    "carol.pdf": "python data scientist pandas machine learning",
+    "dave.pdf": "frontend developer javascript vue css",
+}
+
+
+def records(resumes):
+    return [{"name": name, "content": content} for name, content in resumes.items()]
+
+
+@pytest.fixture
+def store(tmp_path, fake_model):
+    store = CandidateStore(str(tmp_path / "candidates"), compact_ratio=0)
+    store.upsert(records(RESUMES))
+    return store
+
+
+def test_upsert_reports_added_updated_unchanged(store, fake_model):
+    encoded = fake_model.encoded
+    report = store.upsert(records({"alice.pdf": RESUMES["alice.pdf"], "bob.pdf": "rust engineer", "erin.pdf": "go"}))
+    assert (report.added, report.updated, report.unchanged) == (["erin.pdf"], ["bob.pdf"], ["alice.pdf"])
+    # Unchanged resumes are not embedded again
+    assert fake_model.encoded == encoded + 2
+    assert store.get("bob.pdf")["content"] == "rust engineer"
+    assert len(store) == 5
+
+
+def test_search_ranks_live_candidates(store):
+    results = store.search("python developer django", top_k=2)
+    assert len(results) == 2
+    assert results[0].filename == "alice.pdf"
+    assert results[0].score >= results[1].score
+
+    store.delete(["alice.pdf"])
+    assert "alice.pdf" not in [r.filename for r in store.search("python developer django", top_k=None)]
+
+
+def test_compaction_drops_dead_vectors_and_keeps_search(store):
+    store.upsert(records({"bob.pdf": "python backend engineer"}))
+    store.delete(["dave.pdf"])
+    before = [(r.filename, r.score) for r in store.search("python engineer", top_k=None)]
+    assert store.stats()["vectors"] == 5
+    assert store.dead_ratio() == pytest.approx(2 / 5)
+
+    assert store.compact() == 2
+    assert store.stats()["vectors"] == 3
+    assert store.dead_ratio() == 0
+    after = [(r.filename, r.score) for r in store.search("python engineer", top_k=None)]
+    assert [name for name, _ in after] == [name for name, _ in before]
+    assert [score for _, score in after] == pytest.approx([score for _, score in before], abs=1e-3)
+
+
+def test_automatic_compaction(tmp_path, fake_model):
+    store = CandidateStore(str(tmp_path / "candidates"), compact_ratio=0.25)
+    store.upsert(records(RESUMES))
+    store.delete(["alice.pdf", "bob.pdf"])
+    assert store.stats()["vectors"] == 2
+    assert sorted(store.names()) == ["carol.pdf", "dave.pdf"]
+
+
+def test_store_reopens_from_disk(store, tmp_path):
+    reopened = CandidateStore(str(tmp_path / "candidates"))
+    assert sorted(reopened.names()) == sorted(RESUMES)
+    assert reopened.search("java kubernetes", top_k=1)[0].filename == "bob.pdf"
+
+
+def test_skill_filter(store):
+    results = store.search("developer", top_k=None, skill_filter=SkillFilter(required=["Python"], min_years=5))
+    assert [r.filename for r in results] == ["alice.pdf"]
+    with pytest.raises(ValueError):
+        store.search("developer", skill_filter=SkillFilter(required=["Cobol"]))
+
+
+def test_ivf_backend_matches_flat_search(tmp_path, fake_model):
+    pool = {f"cv{i}.pdf": f"{RESUMES[name]} project{i % 7}" for i, name in enumerate(list(RESUMES) * 30)}
+    flat = CandidateStore(str(tmp_path / "flat"), index_backend="flat")
+    ivf = CandidateStore(str(tmp_path / "ivf"), index_backend="ivf")
+    for store in (flat, ivf):
+        store.upsert(records(pool))
+
+    query = "python developer django project3"
+    assert ivf.search(query, top_k=5)[0].filename == flat.search(query, top_k=5)[0].filename
+    # More results than the probed lists hold: falls back to the exact scan
+    assert [r.filename for r in ivf.search(query, top_k=None)] == [r.filename for r in flat.search(query, top_k=None)]
+
+
+def test_ivf_index_holds_live_rows_only(tmp_path, fake_model):
+    store = CandidateStore(str(tmp_path / "ivf"), index_backend="ivf", compact_ratio=0)
+    store.upsert(records(RESUMES))
+    store.delete(["dave.pdf"])
+    # Built after the delete: the tombstoned vector is left out
+    assert store.search("python developer", top_k=1)[0].filename == "alice.pdf"
+    assert len(store._ann_index()) == 3
+
+    # Updated and deleted after the build: pruned from the index
+    store.upsert(records({"bob.pdf": "python backend engineer", "erin.pdf": "go developer"}))
+    store.delete(["carol.pdf"])
+    assert len(store._ann_index()) == 3
+    assert sorted(r.filename for r in store.search("python engineer", top_k=3)) == ["alice.pdf", "bob.pdf", "erin.pdf"]
+    assert store.search("python backend engineer", top_k=1)[0].filename == "bob.pdf"
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from resume_matcher.chunker import ChunkedEmbeddings, chunk_text, resolve_pooling, split_documents
+from resume_matcher.matcher import embed_resume_chunks, rank_resumes
+
+
+def words(text, spans):
+    return [text[start:end].split() for start, end in spans]
+
+
+def test_windows_overlap_and_cover_the_text():
+    text = " ".join(f"w{i}" for i in range(10))
+    windows = words(text, chunk_text(text, max_tokens=4, overlap=1))
+    assert windows == [["w0", "w1", "w2", "w3"], ["w3", "w4", "w5", "w6"], ["w6", "w7", "w8", "w9"]]
+    assert chunk_text("", max_tokens=4) == []
+    # The overlap is capped at half a window, so windows keep advancing
+    assert len(chunk_text(text, max_tokens=4, overlap=10)) == 4
+
+
+def test_split_documents_tracks_owners():
+    chunks, owners = split_documents(["a b c", "", "d e f g h"], max_tokens=3, overlap=0)
+    assert chunks == ["a b c", "d e f", "g h"]
+    assert owners.tolist() == [0, 2, 2]
+
+
+def test_pooling_methods():
+    vectors = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    chunked = ChunkedEmbeddings(["a1", "a2", "c1"], np.array([0, 0, 2]), vectors, 3)
+    np.testing.assert_allclose(chunked.pooled("mean"), [[0.7071, 0.7071, 0], [0, 0, 0], [0, 0, 1]], atol=1e-4)
+    np.testing.assert_allclose(chunked.pooled("max"), chunked.pooled("mean"), atol=1e-4)
+
+    query = np.array([[1.0, 0.2, 0.0]])
+    top = chunked.score_matrix(query, "top")[0]
+    # A document scores as its best chunk; one without chunks scores 0
+    assert top[0] == pytest.approx(1 / np.linalg.norm([1.0, 0.2]))
+    assert top[1] == 0
+    mean = chunked.score_matrix(query, "mean")[0]
+    assert mean[0] < top[0]
+    assert chunked.best_chunks(query[0], 0, n=1)[0][0] == "a1"
+    with pytest.raises(ValueError):
+        chunked.pooled("top")
+
+
+def test_concatenate_offsets_owners():
+    part = ChunkedEmbeddings(["x"], np.array([1]), np.ones((1, 2), dtype=np.float32), 2)
+    empty = ChunkedEmbeddings([], np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32), 1)
+    merged = ChunkedEmbeddings.concatenate([part, empty, part])
+    assert merged.owners.tolist() == [1, 4]
+    assert merged.n_documents == 5
+
+
+def test_resolve_pooling():
+    assert resolve_pooling("none") is None
+    assert resolve_pooling("top") == "top"
+    with pytest.raises(ValueError):
+        resolve_pooling("median")
+
+
+def test_chunks_reach_text_past_the_model_limit(fake_model, monkeypatch):
+    # Windows of 4 words: a truncating model would only see "sales"
+    monkeypatch.setattr(fake_model, "max_seq_length", 6)
+    long_resume = "sales manager retail team " * 3 + "python developer django postgresql"
+    resumes = [
+        {"filename": "long.pdf", "content": long_resume},
+        {"filename": "short.pdf", "content": "java engineer spring boot"},
+    ]
+    chunked = embed_resume_chunks([r["content"] for r in resumes])
+    assert chunked.owners.tolist().count(0) > 1
+    assert rank_resumes("python django", resumes, pooling="top", rerank=False)[0].filename == "long.pdf"
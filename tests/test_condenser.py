@@ -0,0 +1,51 @@
+import numpy as np
+
+from resume_matcher.condenser import (
+    GAP_MARKER,
+    condense_resume,
+    estimate_tokens,
+    select_passages,
+    split_passages,
+)
+
+from conftest import FakeModel
+
+
+def test_split_keeps_short_lines_together():
+    text = "Python\nDjango\nSQL\n\n" + "word " * 100
+    passages = split_passages(text, passage_tokens=16)
+    assert passages[0] == "Python\nDjango\nSQL"
+    assert all(len(passage) <= 16 * 4 for passage in passages)
+    assert " ".join(" ".join(passages).split()) == " ".join(text.split())
+
+
+def test_selection_is_greedy_by_score_within_budget():
+    scores = np.array([0.9, 0.8, 0.7, 0.1])
+    # The second passage does not fit after the first: smaller ones fill the space
+    assert select_passages(scores, [6, 6, 3, 1], budget=10) == [0, 2, 3]
+    assert select_passages(scores, [6, 6, 3, 1], budget=5) == [2, 3]
+    assert select_passages(scores, [6, 6, 3, 1], budget=0) == []
+
+
+def test_ties_keep_reading_order():
+    assert select_passages(np.array([0.5, 0.5, 0.5]), [2, 2, 2], budget=4) == [0, 1]
+
+
+def test_short_resumes_are_unchanged():
+    embed = FakeModel().encode
+    assert condense_resume("python developer", "python", token_budget=100, embed=embed) == "python developer"
+    long_text = "python developer\n" * 100
+    assert condense_resume(long_text, "python", token_budget=0, embed=embed) == long_text
+
+
+def test_condensed_resume_fits_and_keeps_matching_passages():
+    lines = [f"filler activity number {i} unrelated hobby" for i in range(40)]
+    lines[25] = "senior kubernetes engineer terraform aws"
+    model = FakeModel()
+    condensed = condense_resume("\n".join(lines), "kubernetes terraform aws", token_budget=100, embed=model.encode)
+
+    assert estimate_tokens(condensed) <= 100
+    assert "kubernetes" in condensed
+    assert condensed.startswith(GAP_MARKER)
+    # Job and passages in a single encode call
+    assert model.encoded == 1 + len(split_passages("\n".join(lines), 64))
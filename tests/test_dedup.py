@@ -0,0 +1,161 @@
+import os
+
+import numpy as np
+
+from resume_matcher import resume_parser, streaming
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.dedup import Deduplicator, LSHIndex, MinHasher, deduplicate, normalize_text, shingle_hashes
+from resume_matcher.matcher import rank_many
+from resume_matcher.resume_parser import iter_uploaded_resumes
+from resume_matcher.streaming import stream_rank
+from resume_matcher.text_cache import bytes_digest
+
+from conftest import make_pdf
+
+ALICE = (
+    "Alice Martin, senior Python developer. Ten years of experience building Django and Flask services, "
+    "PostgreSQL schemas and Kafka pipelines. Led a team of five engineers at Acme Corp and mentored juniors."
+)
+BOB = (
+    "Bob Durand, Java engineer. Spring Boot microservices on Kubernetes, AWS infrastructure with Terraform, "
+    "CI/CD with Jenkins. Previously a QA engineer writing automated test suites at Globex."
+)
+
+
+def resume(name, content, **extra):
+    return dict({"filename": name, "content": content}, **extra)
+
+
+def test_similar_texts_have_similar_signatures():
+    hasher = MinHasher(64)
+    alice = hasher.signature(shingle_hashes(normalize_text(ALICE).split()))
+    edited = hasher.signature(shingle_hashes(normalize_text(ALICE + " Speaks French.").split()))
+    bob = hasher.signature(shingle_hashes(normalize_text(BOB).split()))
+    assert (alice == edited).mean() > 0.7
+    assert (alice == bob).mean() < 0.2
+
+
+def test_lsh_candidates_share_a_band():
+    index = LSHIndex(num_perm=8, bands=4)
+    hasher = MinHasher(8)
+    index.add(0, hasher.signature(shingle_hashes(ALICE.split())))
+    assert index.candidates(hasher.signature(shingle_hashes(ALICE.split()))) == [0]
+    assert index.candidates(hasher.signature(shingle_hashes(BOB.split()))) == []
+
+
+def test_exact_and_near_duplicates_are_folded():
+    deduplicator = Deduplicator(embedding_threshold=0)
+    kept = deduplicate([
+        resume("alice.pdf", ALICE),
+        resume("bob.pdf", BOB),
+        resume("alice_copy.pdf", "  ".join(ALICE.split())),
+        resume("alice_v2.pdf", ALICE + " Speaks French."),
+    ], deduplicator)
+
+    assert [r["filename"] for r in kept] == ["alice.pdf", "bob.pdf"]
+    assert kept[0]["aliases"] == ["alice_copy.pdf", "alice_v2.pdf"]
+    assert "aliases" not in kept[1]
+    assert deduplicator.stats() == {"unique": 2, "exact": 1, "near": 1, "rejected": 0}
+
+
+def test_aliases_follow_the_item_not_the_name():
+    kept = deduplicate([
+        resume("cv.pdf", ALICE),
+        resume("cv.pdf", BOB),
+        resume("copy.pdf", ALICE),
+    ], Deduplicator(embedding_threshold=0))
+    assert [r.get("aliases") for r in kept] == [["copy.pdf"], None]
+
+
+def test_byte_digest_short_circuits_text_work():
+    deduplicator = Deduplicator(embedding_threshold=0)
+    assert deduplicator.add("a.pdf", ALICE, digest="d1") is None
+    assert deduplicator.add("b.pdf", "unparsed text", digest="d1") == "a.pdf"
+
+
+def test_embeddings_veto_template_lookalikes():
+    # Same template, different person: shingles alone would merge them
+    first = "Carol Petit. " + BOB
+    second = "David Roux. " + BOB
+
+    def embed(texts):
+        # Orthogonal vectors: the candidates are never confirmed
+        return [[1.0, 0.0] if text == first else [0.0, 1.0] for text in texts]
+
+    deduplicator = Deduplicator(threshold=0.1, embedding_threshold=0.95, embed=embed)
+    kept = deduplicate([resume("a.pdf", first), resume("b.pdf", second)], deduplicator)
+    assert len(kept) == 2
+    assert deduplicator.rejected == 1
+
+
+def test_forgotten_texts_still_confirm_near_duplicates():
+    deduplicator = Deduplicator(embed=lambda texts: [[1.0, 0.0] for _ in texts])
+    deduplicator.add("alice.pdf", ALICE)
+    deduplicator.forget_texts({0: np.array([1.0, 0.0], dtype=np.float32)})
+    assert deduplicator.add("alice_v2.pdf", ALICE + " Speaks French.") == "alice.pdf"
+    assert deduplicator.aliases == {0: ["alice_v2.pdf"]}
+
+
+def test_uploads_carry_their_digest(fake_model):
+    pdf = make_pdf(ALICE)
+    resumes = list(iter_uploaded_resumes([("a.pdf", pdf), ("b.pdf", pdf), ("c.pdf", make_pdf(BOB))], workers=1))
+    digests = {r["filename"]: r["digest"] for r in resumes}
+    assert digests["a.pdf"] == digests["b.pdf"] == bytes_digest(pdf)
+    assert digests["c.pdf"] != digests["a.pdf"]
+
+
+def test_store_folds_duplicates_into_the_survivor(tmp_path, fake_model):
+    store = CandidateStore(str(tmp_path / "candidates"))
+    report = store.upsert([
+        {"name": "alice.pdf", "content": ALICE},
+        {"name": "bob.pdf", "content": BOB},
+        {"name": "alice_v2.pdf", "content": ALICE + " Speaks French."},
+    ])
+    assert (sorted(report.added), report.duplicates) == (["alice.pdf", "bob.pdf"], ["alice_v2.pdf"])
+    encoded = fake_model.encoded
+
+    # A copy of a stored candidate is neither embedded nor stored
+    report = store.upsert([{"name": "alice_copy.pdf", "content": ALICE}, {"name": "bob.pdf", "content": BOB}])
+    assert (report.duplicates, report.unchanged) == (["alice_copy.pdf"], ["bob.pdf"])
+    assert fake_model.encoded == encoded
+    assert sorted(store.names()) == ["alice.pdf", "bob.pdf"]
+    assert store.get("alice.pdf")["aliases"] == ["alice_v2.pdf", "alice_copy.pdf"]
+    assert store.search("python django", top_k=1)[0].aliases == ["alice_v2.pdf", "alice_copy.pdf"]
+
+
+def test_uploaded_copies_of_stored_candidates_are_not_parsed(tmp_path, fake_model, monkeypatch):
+    store = CandidateStore(str(tmp_path / "candidates"))
+    pdf = make_pdf(ALICE)
+    assert store.ingest_uploads([("alice.pdf", pdf)]).added == ["alice.pdf"]
+
+    parsed = []
+    real_parse = resume_parser._parse_timed
+    monkeypatch.setattr(resume_parser, "_parse_timed", lambda name, data: parsed.append(name) or real_parse(name, data))
+    report = store.ingest_uploads([("copy.pdf", pdf), ("bob.pdf", make_pdf(BOB))])
+    assert (report.added, report.duplicates) == (["bob.pdf"], ["copy.pdf"])
+    assert parsed == ["bob.pdf"]
+    assert store.get("alice.pdf")["aliases"] == ["copy.pdf"]
+
+
+def test_rank_many_ranks_each_resume_once(fake_model):
+    resumes = [resume("alice.pdf", ALICE), resume("bob.pdf", BOB), resume("copy.pdf", ALICE)]
+    (ranking,) = rank_many(["python django"], resumes, top_k=3)
+    assert [(r.filename, r.index) for r in ranking] == [("alice.pdf", 0), ("bob.pdf", 1)]
+    assert ranking[0].aliases == ["copy.pdf"]
+    assert fake_model.encoded == 1 + 2
+
+
+def test_stream_rank_skips_copies_from_earlier_batches(tmp_path, fake_model, monkeypatch):
+    for name, text in [("1_alice.pdf", ALICE), ("2_bob.pdf", BOB), ("3_copy.pdf", ALICE), ("4_copy.pdf", ALICE)]:
+        (tmp_path / name).write_bytes(make_pdf(text))
+    parsed = []
+    real_extract = streaming._extract_source
+    monkeypatch.setattr(
+        streaming, "_extract_source", lambda source, timeout: parsed.append(source.name) or real_extract(source, timeout)
+    )
+
+    results = stream_rank("python django", [str(tmp_path)], top_k=5, batch_size=2, workers=1, rerank=False)
+    assert [os.path.basename(r.filename) for r in results] == ["1_alice.pdf", "2_bob.pdf"]
+    assert [os.path.basename(alias) for alias in results[0].aliases] == ["3_copy.pdf", "4_copy.pdf"]
+    # The second batch holds only copies of a file already read
+    assert [os.path.basename(name) for name in parsed] == ["1_alice.pdf", "2_bob.pdf"]
@@ -0,0 +1,75 @@
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from resume_matcher.embedding_backends import OnnxEncoder, load_model, onnx_export_dir
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_importing_the_app_stack_loads_no_model_library():
+    code = (
+        "import sys; import resume_matcher.matcher, resume_matcher.jobs, resume_matcher.server; "
+        "print(sorted(m for m in ('torch', 'sentence_transformers', 'onnxruntime') if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "[]"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown model backend"):
+        load_model("all-MiniLM-L6-v2", backend="tensorflow")
+
+
+def test_export_dir_is_a_safe_name():
+    assert Path(onnx_export_dir("sentence-transformers/all-MiniLM-L6-v2")).name == "sentence-transformers_all-MiniLM-L6-v2"
+
+
+class FakeTokenizer:
+    """Token ids are word lengths; padded to the longest text of the batch."""
+
+    def encode_batch(self, texts):
+        lengths = [[len(word) for word in text.split()] for text in texts]
+        width = max(map(len, lengths))
+        return [
+            SimpleNamespace(
+                ids=ids + [0] * (width - len(ids)),
+                attention_mask=[1] * len(ids) + [0] * (width - len(ids)),
+                type_ids=[0] * width
+            )
+            for ids in lengths
+        ]
+
+
+class FakeSession:
+    """Token embedding = (id, 1): mean pooling gives (mean word length, 1)."""
+
+    def run(self, outputs, feeds):
+        ids = feeds["input_ids"].astype(np.float32)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+def encoder(pooling="mean", normalize=False):
+    model = object.__new__(OnnxEncoder)
+    model.pooling, model.normalize, model.max_seq_length = pooling, normalize, 128
+    model._batch_tokenizer, model.session, model._inputs = FakeTokenizer(), FakeSession(), {"input_ids", "attention_mask"}
+    return model
+
+
+def test_onnx_pooling_ignores_padding():
+    texts = ["ab", "abcd ab", "a abc abcdef"]
+    np.testing.assert_allclose(encoder().encode(texts, batch_size=2), [[2, 1], [3, 1], [10 / 3, 1]], rtol=1e-6)
+    np.testing.assert_allclose(encoder("max").encode(texts), [[2, 1], [4, 1], [6, 1]])
+    np.testing.assert_allclose(encoder("cls").encode(texts), [[2, 1], [4, 1], [1, 1]])
+
+
+def test_onnx_encode_matches_the_sentence_transformer_api():
+    model = encoder(normalize=True)
+    single = model.encode("abc")
+    assert single.shape == (2,)
+    assert np.linalg.norm(single) == pytest.approx(1)
+    assert model.encode([]).shape == (0, 0)
@@ -0,0 +1,131 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from resume_matcher.embedding_cache import EmbeddingCache, make_key
+
+from conftest import DIM, fake_embedding
+
+
+def vectors(texts):
+    return np.array([fake_embedding(text) for text in texts])
+
+
+def test_key_ignores_layout_but_not_model():
+    assert make_key("m", "python  developer\n") == make_key("m", "python developer")
+    assert make_key("m", "python developer") != make_key("other", "python developer")
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a b", "c d"], vectors(["a b", "c d"]))
+
+    found = cache.get_many(["a b", "unknown", "c  d"])
+    np.testing.assert_array_equal(found[0], fake_embedding("a b"))
+    assert found[1] is None
+    np.testing.assert_array_equal(found[2], fake_embedding("c d"))
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.dim == DIM
+
+
+def test_persists_across_instances(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a b"], vectors(["a b"]))
+    cache.close()
+
+    reopened = EmbeddingCache(str(tmp_path), "model")
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.get_many(["a b"])[0], fake_embedding("a b"))
+
+
+def test_lookups_do_not_rewrite_the_index(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a", "b"], vectors(["a", "b"]))
+    index_file = cache.path / EmbeddingCache.INDEX_FILE
+    before = index_file.stat().st_mtime_ns
+
+    cache.get_many(["a", "b", "a"])
+    assert index_file.stat().st_mtime_ns == before
+
+    # The refreshed recency order ("a" last) is saved on close
+    cache.close()
+    reopened = EmbeddingCache(str(tmp_path), "model", max_entries=2)
+    reopened.put_many(["c"], vectors(["c"]))
+    assert reopened.get_many(["b"])[0] is None
+    assert reopened.get_many(["a"])[0] is not None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=2)
+    cache.put_many(["a", "b"], vectors(["a", "b"]))
+    cache.get_many(["a"])
+    cache.put_many(["c"], vectors(["c"]))
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get_many(["b"])[0] is None
+    assert cache.get_many(["a"])[0] is not None
+
+
+def test_rejects_non_positive_capacity(tmp_path):
+    with pytest.raises(ValueError):
+        EmbeddingCache(str(tmp_path), "model", max_entries=0)
+
+
+def crash_copy(cache, target):
+    """The cache directory as a crashed process would leave it (nothing flushed at exit)."""
+    shutil.copytree(cache.path, target)
+    return EmbeddingCache(str(target.parent.parent), "model", max_entries=cache.max_entries)
+
+
+def test_stores_append_to_the_journal(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "live"), "model", max_entries=2)
+    cache.put_many(["a", "b"], vectors(["a", "b"]))
+    index_file = cache.path / EmbeddingCache.INDEX_FILE
+    before = index_file.read_bytes()
+
+    # "a" is evicted for "c", which takes its row
+    cache.put_many(["c"], vectors(["c"]))
+    assert index_file.read_bytes() == before
+
+    recovered = crash_copy(cache, tmp_path / "crashed" / "embeddings" / "model")
+    assert recovered.get_many(["a"])[0] is None
+    np.testing.assert_array_equal(recovered.get_many(["c"])[0], fake_embedding("c"))
+    np.testing.assert_array_equal(recovered.get_many(["b"])[0], fake_embedding("b"))
+
+
+def test_torn_journal_line_is_ignored(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "live"), "model")
+    cache.put_many(["a"], vectors(["a"]))
+    cache.put_many(["b"], vectors(["b"]))
+    with open(cache.path / EmbeddingCache.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write("+ abc")
+
+    recovered = crash_copy(cache, tmp_path / "crashed" / "embeddings" / "model")
+    assert len(recovered) == 2
+    assert recovered.get_many(["b"])[0] is not None
+
+
+def test_index_is_rewritten_once_the_journal_outgrows_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(EmbeddingCache, "JOURNAL_MIN_ENTRIES", 2)
+    cache = EmbeddingCache(str(tmp_path), "model", max_entries=3)
+    cache.put_many(["a"], vectors(["a"]))
+    cache.put_many(["b", "c"], vectors(["b", "c"]))
+    assert cache._journal_entries == 2
+    # The eviction of "a" and the store of "d": 4 journal entries for 3 indexed
+    cache.put_many(["d"], vectors(["d"]))
+    assert cache._journal_entries == 0
+    assert len((cache.path / EmbeddingCache.JOURNAL_FILE).read_text().splitlines()) == 1
+
+
+def test_concurrent_processes_get_their_own_directory(tmp_path):
+    first = EmbeddingCache(str(tmp_path), "model")
+    # A second open file description conflicts like another process would
+    second = EmbeddingCache(str(tmp_path), "model")
+    assert second.path != first.path
+    assert second.path.name == first.path.name + ".1"
+
+    first.close()
+    second.close()
+    assert EmbeddingCache(str(tmp_path), "model").path == first.path
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from resume_matcher import embedding_pool
+from resume_matcher.embedding_pool import EmbeddingPool, adaptive_batch_size, encode_local, resolve_pool_size
+
+from conftest import FakeModel, fake_embedding
+
+
+def test_pool_size_defaults_fit_the_cores(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 16)
+    assert resolve_pool_size(0, 0) == (4, 4)
+    assert resolve_pool_size(2, 0) == (2, 8)
+    assert resolve_pool_size(3, 1) == (3, 1)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    assert resolve_pool_size(0, 0) == (1, 2)
+
+
+def test_batch_size_follows_text_length():
+    short = adaptive_batch_size(["python"] * 10, batch_tokens=1024, max_batch_size=128)
+    long = adaptive_batch_size(["word " * 400] * 10, max_seq_length=256, batch_tokens=1024, max_batch_size=128)
+    assert short == 128
+    assert long == 4
+    assert adaptive_batch_size([], batch_tokens=1024, max_batch_size=64) == 64
+
+
+class InlinePool:
+    """Runs map() in this process and records the shards."""
+
+    def __init__(self):
+        self.shards = []
+
+    def map(self, function, shards, chunksize=1):
+        self.shards.extend(shards)
+        return [function(shard) for shard in shards]
+
+
+def test_shards_are_reassembled_in_input_order(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(embedding_pool, "_encode_shard", lambda texts: encode_local(model, texts))
+    pool = EmbeddingPool(workers=2, threads_per_worker=1, min_texts=8)
+    inline = InlinePool()
+    monkeypatch.setattr(pool, "start", lambda: inline)
+
+    texts = [f"resume {i} " + "python " * (i % 5) for i in range(40)]
+    vectors = pool.encode(texts)
+    np.testing.assert_array_equal(vectors, [fake_embedding(text) for text in texts])
+    # A few shards per worker, cut from the texts sorted longest first
+    assert len(inline.shards) == 8
+    lengths = [len(text) for shard in inline.shards for text in shard]
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def test_small_batches_stay_in_process():
+    pool = EmbeddingPool(workers=2, threads_per_worker=1, min_texts=8)
+    assert not pool.should_use(7)
+    assert pool.should_use(8)
+    assert not EmbeddingPool(workers=1, min_texts=1).should_use(100)
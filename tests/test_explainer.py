@@ -0,0 +1,135 @@
+import asyncio
+import json
+
+import pytest
+import requests
+
+from resume_matcher import explainer
+from resume_matcher.explainer import OllamaClient, OllamaError
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, data=None, lines=()):
+        self.status_code = status_code
+        self._data = data or {}
+        self._lines = [json.dumps(line).encode("utf-8") for line in lines]
+        self.text = json.dumps(self._data)
+        self.closed = False
+
+    def json(self):
+        return self._data
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeSession:
+    """Answers each post() with the next outcome: a FakeResponse or an exception to raise."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.posts = []
+
+    def post(self, url, json=None, stream=False, timeout=None):
+        self.posts.append({"url": url, "payload": json, "stream": stream, "timeout": timeout})
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(explainer.time, "sleep", delays.append)
+    return delays
+
+
+def client(*outcomes, **kwargs):
+    ollama = OllamaClient(
+        base_url="http://ollama:11434/", model="llama3", timeout=7, max_retries=2, retry_backoff=0.5,
+        resume_token_budget=0, **kwargs
+    )
+    ollama.session = FakeSession(*outcomes)
+    return ollama
+
+
+def test_transient_failures_are_retried_with_backoff(sleeps):
+    ollama = client(
+        requests.exceptions.ConnectionError("refused"),
+        FakeResponse(503),
+        FakeResponse(200, {"response": "Strong Python match"}),
+    )
+    assert ollama.generate("prompt") == "Strong Python match"
+    assert sleeps == [0.5, 1.0]
+    post = ollama.session.posts[-1]
+    assert (post["url"], post["timeout"], post["stream"]) == ("http://ollama:11434/api/generate", 7, False)
+    assert post["payload"]["prompt"] == "prompt"
+
+
+def test_retries_are_bounded(sleeps):
+    ollama = client(*[requests.exceptions.Timeout("slow")] * 3)
+    with pytest.raises(requests.exceptions.Timeout):
+        ollama.generate("prompt")
+    assert len(ollama.session.posts) == 3
+
+    ollama = client(*[FakeResponse(500)] * 3)
+    with pytest.raises(OllamaError, match="500"):
+        ollama.generate("prompt")
+
+
+def test_client_errors_are_not_retried(sleeps):
+    ollama = client(FakeResponse(404, {"error": "model not found"}))
+    with pytest.raises(OllamaError, match="404"):
+        ollama.generate("prompt")
+    assert (len(ollama.session.posts), sleeps) == (1, [])
+
+
+def test_stream_yields_tokens_until_done(sleeps):
+    ollama = client(FakeResponse(lines=[
+        {"response": "Strong", "done": False},
+        {"response": " match", "done": False},
+        {"response": "", "done": True, "eval_count": 2, "eval_duration": 1e9},
+        {"response": "ignored", "done": False},
+    ]))
+    assert list(ollama.stream("prompt")) == ["Strong", " match"]
+    assert ollama.session.posts[0]["stream"] is True
+
+    ollama = client(FakeResponse(lines=[{"response": "Str"}, {"error": "out of memory"}]))
+    with pytest.raises(OllamaError, match="out of memory"):
+        list(ollama.stream("prompt"))
+
+
+def test_payload_options():
+    ollama = client(deterministic=True)
+    payload = ollama.payload("prompt", stream=False)
+    assert payload["options"]["temperature"] == 0
+    assert "seed" in payload["options"]
+    assert payload["keep_alive"] == ollama.keep_alive
+
+
+def test_explain_many_keeps_order_and_reports_failures(sleeps, monkeypatch):
+    ollama = client()
+
+    def explain(resume_text, job_text):
+        if resume_text == "broken":
+            raise requests.exceptions.ConnectionError("refused")
+        return f"{resume_text} fits {job_text}"
+
+    monkeypatch.setattr(ollama, "explain", explain)
+    answers = asyncio.run(ollama.explain_many(["alice", "broken", "carol"], "the job", concurrency=2))
+    assert answers[0] == "alice fits the job"
+    assert "Ollama is not running" in answers[1]
+    assert answers[2] == "carol fits the job"
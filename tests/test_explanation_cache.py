@@ -0,0 +1,69 @@
+import pytest
+
+from resume_matcher import explanation_cache
+from resume_matcher.explainer import OllamaClient
+from resume_matcher.explanation_cache import ExplanationCache, make_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(explanation_cache.time, "time", clock)
+    return clock
+
+
+def test_key_covers_model_options_and_prompt():
+    key = make_key("llama3", {"temperature": 0, "seed": 42}, "prompt")
+    assert key == make_key("llama3", {"seed": 42, "temperature": 0}, "prompt")
+    assert key != make_key("llama3:70b", {"temperature": 0, "seed": 42}, "prompt")
+    assert key != make_key("llama3", {"temperature": 0.7, "seed": 42}, "prompt")
+    assert key != make_key("llama3", {"temperature": 0, "seed": 42}, "other prompt")
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ExplanationCache(str(tmp_path / "explanations.sqlite3"), ttl_seconds=3600)
+    cache.put("key", "Strong match")
+    clock.now += 3599
+    assert cache.get("key") == "Strong match"
+    clock.now += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ExplanationCache(str(tmp_path / "explanations.sqlite3"), ttl_seconds=0, max_entries=2)
+    cache.put("a", "A")
+    clock.now += 1
+    cache.put("b", "B")
+    clock.now += 1
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == "A"
+    clock.now += 1
+    cache.put("c", "C")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == ("A", None, "C")
+    assert len(cache) == 2
+
+
+def test_cache_is_shared_between_instances(tmp_path, clock):
+    path = str(tmp_path / "explanations.sqlite3")
+    ExplanationCache(path).put("key", "Strong match")
+    assert ExplanationCache(path).get("key") == "Strong match"
+
+
+def test_client_serves_cached_explanations(tmp_path, clock):
+    cache = ExplanationCache(str(tmp_path / "explanations.sqlite3"))
+    client = OllamaClient(cache=cache, resume_token_budget=0, deterministic=True)
+    cache.put(client.explanation_key("python developer", "python job"), "Strong match")
+    # No request is made: the session would fail
+    client.session = None
+    assert client.explain("python developer", "python job") == "Strong match"
+    assert list(client.stream_explain("python developer", "python job")) == ["Strong match"]
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from resume_matcher import jobs
+from resume_matcher.jobs import DONE, EMBEDDING, FAILED, PARSING, JobManager, fingerprint, unique_names
+
+from conftest import make_pdf
+
+FILES = [
+    ("alice.pdf", make_pdf("python developer django postgresql")),
+    ("bob.pdf", make_pdf("java engineer spring kubernetes")),
+    ("alice_copy.pdf", make_pdf("python developer django postgresql")),
+]
+
+
+@pytest.fixture
+def manager(tmp_path, fake_model, monkeypatch):
+    # jobs imported get_model by name
+    monkeypatch.setattr(jobs, "get_model", lambda *args, **kwargs: fake_model)
+    manager = JobManager(max_workers=1, max_completed=2, upload_dir=str(tmp_path / "uploads"), embed_batch_size=1)
+    yield manager
+    manager.shutdown()
+
+
+def record_statuses(manager):
+    statuses = []
+    update = manager._update
+
+    def recording(job, **changes):
+        if "status" in changes:
+            statuses.append(changes["status"])
+        update(job, **changes)
+
+    manager._update = recording
+    return statuses
+
+
+def wait(manager, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not manager.get(job_id).finished:
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+    return manager.get(job_id)
+
+
+def test_unique_names_and_fingerprint():
+    assert unique_names(["a/cv.pdf", "b/cv.pdf", "cv.pdf", "x.pdf"]) == ["cv.pdf", "cv (2).pdf", "cv (3).pdf", "x.pdf"]
+    files = [("a.pdf", b"one")]
+    assert fingerprint(files, "job") == fingerprint([("a.pdf", memoryview(b"one"))], "job")
+    assert fingerprint(files, "job") != fingerprint(files, "other job")
+    assert fingerprint(files, "job") != fingerprint([("b.pdf", b"one")], "job")
+
+
+def test_job_goes_through_each_state(manager):
+    statuses = record_statuses(manager)
+    job_id = manager.submit(FILES, "python django")
+    job = wait(manager, job_id)
+
+    assert statuses == [PARSING, EMBEDDING, DONE]
+    assert (job.parsed, job.total, job.to_embed, job.embedded) == (3, 3, 2, 2)
+    assert job.progress == 1.0
+    # The byte-identical copy is folded into the first upload
+    assert [r.filename for r in job.results] == ["alice.pdf", "bob.pdf"]
+    assert job.results[0].aliases == ["alice_copy.pdf"]
+    assert len(job.embeddings) == 2
+
+
+def test_same_analysis_is_served_from_the_finished_job(manager, fake_model):
+    job_id = manager.submit(FILES, "python django")
+    wait(manager, job_id)
+    encoded = fake_model.encoded
+    assert manager.submit(FILES, "python django") == job_id
+    assert fake_model.encoded == encoded
+    assert manager.submit(FILES, "java") != job_id
+
+
+def test_snapshots_are_copies(manager):
+    job_id = manager.submit(FILES, "python django")
+    job = wait(manager, job_id)
+    job.results.clear()
+    job.status = FAILED
+    assert manager.get(job_id).status == DONE
+    assert len(manager.get(job_id).results) == 2
+
+
+def test_failed_job_reports_its_error_and_can_be_resubmitted(manager):
+    def broken(job, files, job_dir):
+        raise RuntimeError("parser crashed")
+
+    manager._parse = broken
+    job_id = manager.submit(FILES, "python django")
+    job = wait(manager, job_id)
+    assert (job.status, job.error) == (FAILED, "parser crashed")
+
+    del manager._parse
+    assert manager.submit(FILES, "python django") != job_id
+
+
+def test_finished_jobs_are_evicted_oldest_first(manager):
+    ids = [wait(manager, manager.submit(FILES, f"job {i}")).id for i in range(3)]
+    assert manager.get(ids[0]) is None
+    assert all(manager.get(job_id) is not None for job_id in ids[1:])
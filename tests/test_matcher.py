@@ -0,0 +1,59 @@
+import pytest
+
+from resume_matcher import matcher
+from resume_matcher.matcher import RankedResume, rank_many, rank_resumes
+
+RESUMES = [
+    {"filename": "a.pdf", "content": "java engineer spring"},
+    {"filename": "b.pdf", "content": "python developer django"},
+    {"filename": "c.pdf", "content": "python developer django"},
+    {"filename": "d.pdf", "content": "frontend vue css"},
+    {"filename": "e.pdf", "content": "python developer django"},
+]
+
+JOBS = ["python django", "java spring", "vue css frontend"]
+
+
+def test_top_k_is_the_prefix_of_the_full_ranking(fake_model):
+    full = rank_resumes("python django", RESUMES, pooling="none", rerank=False)
+    assert len(full) == len(RESUMES)
+    assert [r.score for r in full] == sorted((r.score for r in full), reverse=True)
+    for k in range(1, len(RESUMES) + 1):
+        top = rank_resumes("python django", RESUMES, top_k=k, pooling="none", rerank=False)
+        assert [r.filename for r in top] == [r.filename for r in full[:k]]
+
+
+def test_ties_keep_input_order(fake_model):
+    # b, c and e have the same text, hence the same score; k cuts the tie
+    top = rank_resumes("python developer django", RESUMES, top_k=2, pooling="none", rerank=False)
+    assert [r.filename for r in top] == ["b.pdf", "c.pdf"]
+    assert top[0].score == top[1].score
+
+
+def test_results_reference_the_input_resumes(fake_model):
+    (best,) = rank_resumes("python django", RESUMES, top_k=1, pooling="none", rerank=False)
+    assert isinstance(best, RankedResume)
+    assert best.resume is RESUMES[best.index]
+    assert dict(best) == {"filename": best.filename, "score": best.score, "content": RESUMES[best.index]["content"]}
+    with pytest.raises(KeyError):
+        best["digest"]
+
+
+def test_rank_many_matches_rank_resumes(fake_model, monkeypatch):
+    # Without the copies of b.pdf, which rank_many folds and rank_resumes keeps
+    pool = [r for r in RESUMES if r["filename"] not in ("c.pdf", "e.pdf")]
+    # Score one job per block
+    monkeypatch.setattr(matcher, "SCORE_CHUNK_ELEMENTS", len(pool))
+    rankings = rank_many(JOBS, pool, top_k=2, pooling="none")
+    # The pool and the jobs are encoded once each
+    assert fake_model.encoded == len(pool) + len(JOBS)
+
+    for job, ranking in zip(JOBS, rankings):
+        expected = rank_resumes(job, pool, top_k=2, pooling="none", rerank=False)
+        assert [(r.filename, r.index) for r in ranking] == [(r.filename, r.index) for r in expected]
+        assert [r.score for r in ranking] == pytest.approx([r.score for r in expected])
+
+
+def test_rank_many_edge_cases(fake_model):
+    assert rank_many([], RESUMES) == []
+    assert rank_many(JOBS, []) == [[], [], []]
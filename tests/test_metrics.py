@@ -0,0 +1,74 @@
+import json
+import threading
+
+import pytest
+
+from resume_matcher.metrics import Metrics
+
+
+def test_disabled_registry_records_nothing():
+    registry = Metrics(enabled=False)
+    with registry.span("encode", batch_size=4) as span:
+        span.set(pages=2)
+    registry.incr("hits")
+    registry.observe("pages", 3)
+    assert registry.snapshot() == {"counters": {}, "summaries": {}}
+    assert registry.span("a") is registry.span("b")
+
+
+def test_spans_counters_and_observations(tmp_path):
+    log = tmp_path / "metrics.jsonl"
+    registry = Metrics(enabled=True, json_log=str(log))
+    with registry.span("parse_pdf", file="cv.pdf") as span:
+        span.set(pages=3)
+    with pytest.raises(ValueError):
+        with registry.span("encode"):
+            raise ValueError("model")
+    registry.incr("cache_hits", 2)
+    registry.incr("cache_hits")
+    registry.observe("pages", 3)
+    registry.observe("pages", 5)
+    registry.record("parse_pdf", 0.5, file="other.pdf")
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"] == {"cache_hits": 3}
+    assert snapshot["summaries"]["pages"] == {"count": 2, "sum": 8, "max": 5}
+    assert snapshot["summaries"]["parse_pdf_seconds"]["count"] == 2
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [(r["span"], r.get("pages"), r.get("error")) for r in records] == [
+        ("parse_pdf", 3, None), ("encode", None, "ValueError"), ("parse_pdf", None, None)
+    ]
+
+
+def test_run_breakdown_is_per_thread(tmp_path):
+    prometheus = tmp_path / "metrics.prom"
+    registry = Metrics(enabled=True, prometheus_file=str(prometheus))
+
+    def other_thread():
+        with registry.span("score"):
+            pass
+
+    with registry.run("analysis"):
+        with registry.span("encode"):
+            pass
+        with registry.span("encode"):
+            pass
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+    run = registry.last_run()
+    assert run["run"] == "analysis"
+    assert run["stages"]["encode"]["count"] == 2
+    assert "score" not in run["stages"]
+    text = prometheus.read_text()
+    assert "# TYPE recruiter_encode_seconds summary" in text
+    assert "recruiter_encode_seconds_count 2" in text
+
+
+def test_prometheus_names_are_sanitized():
+    registry = Metrics(enabled=True)
+    registry.incr("cache-hits.pdf")
+    assert "recruiter_cache_hits_pdf_total 1" in registry.prometheus_text()
+    registry.reset()
+    assert registry.prometheus_text() == "\n"
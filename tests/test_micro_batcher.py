@@ -0,0 +1,100 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from resume_matcher.micro_batcher import MicroBatcher, QueueFull
+
+from conftest import FakeModel, fake_embedding
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+class RecordingEncoder:
+    """Fake encoder that records the size of each call, optionally blocking."""
+
+    def __init__(self):
+        self.calls = []
+        self.entered = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.model = FakeModel()
+
+    def __call__(self, texts):
+        self.entered += 1
+        self.release.wait(5)
+        self.calls.append(len(texts))
+        return self.model.encode(texts)
+
+
+def test_results_are_aligned_with_each_request():
+    batcher = MicroBatcher(RecordingEncoder(), max_wait_ms=1)
+    try:
+        vectors = batcher.submit(["python developer", "java engineer"])
+        np.testing.assert_array_equal(vectors, [fake_embedding("python developer"), fake_embedding("java engineer")])
+        assert batcher.submit([]).shape == (0, 0)
+    finally:
+        batcher.close()
+
+
+def test_concurrent_requests_share_encode_calls():
+    encoder = RecordingEncoder()
+    batcher = MicroBatcher(encoder, max_size=64, max_wait_ms=200)
+    results = {}
+
+    def request(i):
+        results[i] = batcher.submit([f"job {i}"], timeout=5)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        batcher.close()
+
+    assert sum(encoder.calls) == 8
+    assert len(encoder.calls) < 8
+    for i in range(8):
+        np.testing.assert_array_equal(results[i], [fake_embedding(f"job {i}")])
+    assert batcher.stats()["texts"] == 8
+
+
+def test_full_queue_is_rejected():
+    encoder = RecordingEncoder()
+    encoder.release.clear()
+    batcher = MicroBatcher(encoder, max_size=1, max_wait_ms=0, max_queue=2)
+    waiting = [threading.Thread(target=batcher.submit, args=(["a"],)) for _ in range(3)]
+    try:
+        # The first text is taken by the (blocked) encode call, two more fill the queue
+        waiting[0].start()
+        wait_until(lambda: encoder.entered == 1)
+        for thread in waiting[1:]:
+            thread.start()
+        wait_until(lambda: batcher.pending == 2)
+        with pytest.raises(QueueFull):
+            batcher.submit(["b"])
+    finally:
+        encoder.release.set()
+        for thread in waiting:
+            thread.join()
+        batcher.close()
+
+
+def test_encode_errors_reach_every_caller():
+    def failing(texts):
+        raise RuntimeError("model unavailable")
+
+    batcher = MicroBatcher(failing, max_wait_ms=1)
+    try:
+        with pytest.raises(RuntimeError, match="model unavailable"):
+            batcher.submit(["a"])
+    finally:
+        batcher.close()
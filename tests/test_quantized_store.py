@@ -0,0 +1,95 @@
+import json
+
+import numpy as np
+import pytest
+
+from resume_matcher.quantized_store import (
+    IDS_FILE,
+    META_FILE,
+    QuantizedStore,
+    dequantize,
+    quantization_report,
+    quantize,
+)
+from resume_matcher.vector_index import normalize
+
+
+def random_vectors(n, dim=32, seed=0):
+    return normalize(np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32))
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_quantization_round_trip(dtype, tolerance):
+    vectors = random_vectors(50)
+    codes, scales = quantize(vectors, dtype)
+    assert (scales is not None) == (dtype == "int8")
+    np.testing.assert_allclose(dequantize(codes, scales), vectors, atol=tolerance)
+
+
+def test_zero_vector_survives_int8():
+    codes, scales = quantize(np.zeros((1, 4), dtype=np.float32), "int8")
+    np.testing.assert_array_equal(dequantize(codes, scales), np.zeros((1, 4)))
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_store_scores_match_float32(tmp_path, dtype):
+    vectors = random_vectors(100)
+    store = QuantizedStore(str(tmp_path / dtype), dtype=dtype)
+    store.add([f"id{i}" for i in range(60)], vectors[:60])
+    store.add([f"id{i}" for i in range(60, 100)], vectors[60:])
+
+    queries = random_vectors(3, seed=1)
+    np.testing.assert_allclose(store.scores(queries, chunk_rows=16), queries @ vectors.T, atol=2e-2)
+    assert store.query(vectors[42], k=1)[0][0] == "id42"
+
+
+def test_reopened_store_keeps_ids_and_vectors(tmp_path):
+    vectors = random_vectors(10)
+    store = QuantizedStore(str(tmp_path), dtype="int8")
+    assert store.add(["a", "b", "c"], vectors[:3]) == 3
+    # Known ids are skipped: the store is append-only
+    assert store.add(["b", "d"], vectors[3:5]) == 1
+
+    reopened = QuantizedStore(str(tmp_path))
+    assert reopened.dtype == "int8"
+    assert reopened.ids == ("a", "b", "c", "d")
+    np.testing.assert_allclose(reopened.vectors([3]), vectors[[4]], atol=1e-2)
+    # Ids live in their own append-only file, not in the metadata
+    assert "ids" not in json.loads((tmp_path / META_FILE).read_text())
+
+
+def test_ids_past_the_count_are_ignored(tmp_path):
+    vectors = random_vectors(3)
+    QuantizedStore(str(tmp_path)).add(["a", "b"], vectors[:2])
+    # An add() interrupted before its metadata write
+    with open(tmp_path / IDS_FILE, "a", encoding="utf-8") as f:
+        f.write("orphan\n")
+
+    store = QuantizedStore(str(tmp_path))
+    assert store.ids == ("a", "b")
+    store.add(["c"], vectors[2:])
+    assert QuantizedStore(str(tmp_path)).ids == ("a", "b", "c")
+
+
+def test_ids_in_metadata_are_migrated(tmp_path):
+    vectors = random_vectors(3)
+    QuantizedStore(str(tmp_path), dtype="float32").add(["a", "b"], vectors[:2])
+    # Layout of older stores: ids inside meta.json, no ids.txt
+    meta = json.loads((tmp_path / META_FILE).read_text())
+    (tmp_path / META_FILE).write_text(json.dumps(dict(meta, ids=["a", "b"])))
+    (tmp_path / IDS_FILE).unlink()
+
+    store = QuantizedStore(str(tmp_path))
+    assert store.ids == ("a", "b")
+    store.add(["c"], vectors[2:])
+    reopened = QuantizedStore(str(tmp_path))
+    assert reopened.ids == ("a", "b", "c")
+    assert "ids" not in json.loads((tmp_path / META_FILE).read_text())
+
+
+def test_quantization_report():
+    vectors = random_vectors(200)
+    report = {row["dtype"]: row for row in quantization_report(vectors, random_vectors(5, seed=2), k=10)}
+    assert report["float32"]["recall_at_k"] == 1.0
+    assert report["int8"]["bytes_per_vector"] == 32 + 4
+    assert report["float16"]["spearman"] > 0.99
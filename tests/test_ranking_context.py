@@ -0,0 +1,72 @@
+import time
+
+import pytest
+
+from resume_matcher.matcher import embed_resumes, rank_resumes
+from resume_matcher.ranking_context import RankingContext, RankingContextStore, upload_key
+
+RESUMES = [
+    {"filename": "alice.pdf", "content": "python developer django postgresql"},
+    {"filename": "bob.pdf", "content": "java engineer spring kubernetes"},
+    {"filename": "carol.pdf", "content": "python data scientist pandas"},
+]
+
+
+def test_upload_key_tracks_names_and_contents():
+    files = [("a.pdf", b"one"), ("b.pdf", b"two")]
+    assert upload_key(files) == upload_key([("a.pdf", bytearray(b"one")), ("b.pdf", memoryview(b"two"))])
+    assert upload_key(files) != upload_key([("a.pdf", b"one"), ("b.pdf", b"three")])
+    assert upload_key(files) != upload_key([("a.pdf", b"one"), ("c.pdf", b"two")])
+
+
+def test_ranking_encodes_only_the_job(fake_model):
+    embeddings = embed_resumes([r["content"] for r in RESUMES], None)
+    context = RankingContext("key", RESUMES, pooling="none", embeddings=embeddings)
+    encoded = fake_model.encoded
+    results = context.rank("python django developer")
+    assert fake_model.encoded == encoded + 1
+
+    expected = rank_resumes("python django developer", RESUMES, pooling="none")
+    assert [r.filename for r in results] == [r.filename for r in expected]
+    assert [r.score for r in results] == pytest.approx([r.score for r in expected])
+
+
+def test_missing_embeddings_are_computed_once(fake_model):
+    context = RankingContext("key", RESUMES, pooling="none")
+    assert fake_model.encoded == len(RESUMES)
+    context.rank("python")
+    context.rank("java")
+    assert fake_model.encoded == len(RESUMES) + 2
+
+
+def test_store_serves_only_the_same_upload_set(fake_model):
+    store = RankingContextStore(max_sessions=4, idle_minutes=30)
+    context = RankingContext("key", RESUMES, pooling="none")
+    store.put("session", context)
+    assert store.get("session", "key") is context
+    assert store.get("session", "other files") is None
+    assert store.get("other session", "key") is None
+
+    store.drop("session")
+    assert store.get("session", "key") is None
+
+
+def test_least_recently_used_session_is_evicted(fake_model):
+    store = RankingContextStore(max_sessions=2, idle_minutes=30)
+    for session in ("a", "b"):
+        store.put(session, RankingContext(session, RESUMES, pooling="none"))
+    store.get("a", "a")
+    store.put("c", RankingContext("c", RESUMES, pooling="none"))
+    assert len(store) == 2
+    assert store.get("b", "b") is None
+    assert store.get("a", "a") is not None
+
+
+def test_idle_sessions_are_evicted(fake_model):
+    store = RankingContextStore(max_sessions=4, idle_minutes=1)
+    store.put("old", RankingContext("old", RESUMES, pooling="none"))
+    store.put("recent", RankingContext("recent", RESUMES, pooling="none"))
+    store.get("old", "old").last_used = time.monotonic() - 120
+    assert store.evict_idle() == 1
+    assert store.get("old", "old") is None
+    assert store.stats()["sessions"] == 1
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from resume_matcher import reranker
+from resume_matcher.matcher import RankedResume
+from resume_matcher.reranker import ScoreCache, cross_scores, rerank
+
+
+class FakeCrossEncoder:
+    """Logit +2 for resumes mentioning kubernetes, -2 otherwise; records the pairs it reads."""
+
+    def __init__(self):
+        self.pairs = []
+
+    def predict(self, pairs, batch_size=16, show_progress_bar=False):
+        self.pairs.extend(pairs)
+        return np.array([2.0 if "kubernetes" in resume else -2.0 for _, resume in pairs])
+
+
+@pytest.fixture
+def cross_encoder(monkeypatch):
+    model = FakeCrossEncoder()
+    monkeypatch.setattr(reranker, "get_cross_encoder", lambda: model)
+    monkeypatch.setattr(reranker, "get_score_cache", lambda: None)
+    return model
+
+
+def ranking(*entries):
+    return [
+        RankedResume({"filename": name, "content": content}, i, score)
+        for i, (name, content, score) in enumerate(entries)
+    ]
+
+
+def sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def test_shortlist_is_reordered_by_blended_score(cross_encoder):
+    ranked = ranking(
+        ("a.pdf", "python developer", 0.9),
+        ("b.pdf", "devops kubernetes", 0.8),
+        ("c.pdf", "java engineer", 0.7),
+        ("d.pdf", "go kubernetes", 0.6),
+    )
+    results = rerank("platform engineer", ranked, top_n=3, weight=0.5)
+
+    assert [r.filename for r in results] == ["b.pdf", "a.pdf", "c.pdf", "d.pdf"]
+    assert results[0].score == pytest.approx(0.5 * sigmoid(2) + 0.5 * 0.8)
+    assert results[1].score == pytest.approx(0.5 * sigmoid(-2) + 0.5 * 0.9)
+    # Past the shortlist: never read, given the shortlist's lowest cross score
+    assert len(cross_encoder.pairs) == 3
+    assert results[3].score == pytest.approx(0.5 * sigmoid(-2) + 0.5 * 0.6)
+    assert results[3].score <= results[2].score
+    assert [r.index for r in results] == [1, 0, 2, 3]
+
+
+def test_zero_weight_keeps_the_first_stage(cross_encoder):
+    ranked = ranking(("a.pdf", "python", 0.9), ("b.pdf", "kubernetes", 0.8))
+    results = rerank("job", ranked, top_n=2, weight=0)
+    assert [(r.filename, r.score) for r in results] == [("a.pdf", 0.9), ("b.pdf", 0.8)]
+
+
+def test_pairs_are_scored_once_longest_first(cross_encoder):
+    scores = cross_scores("job", ["short", "a much longer resume text", "short"])
+    assert scores.tolist() == [-2.0, -2.0, -2.0]
+    assert [resume for _, resume in cross_encoder.pairs] == ["a much longer resume text", "short"]
+
+
+def test_scores_are_cached_per_job_and_resume(cross_encoder, tmp_path, monkeypatch):
+    cache = ScoreCache(str(tmp_path / "rerank.sqlite3"))
+    monkeypatch.setattr(reranker, "get_score_cache", lambda: cache)
+    first = cross_scores("job", ["devops kubernetes", "python"])
+    # Whitespace does not change the key
+    second = cross_scores("job", ["devops   kubernetes", "python"])
+    np.testing.assert_array_equal(first, second)
+    assert len(cross_encoder.pairs) == 2
+    assert cache.stats()["hits"] == 2
+
+    cross_scores("another job", ["python"])
+    assert len(cross_encoder.pairs) == 3
+    assert len(cache) == 3
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from resume_matcher import resume_parser
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.jobs import JobManager
+from resume_matcher.resume_parser import (
+    BufferReader,
+    UploadTooLarge,
+    _extract_worker,
+    check_upload_size,
+    extract_text_from_pdf,
+    iter_resumes,
+    iter_uploaded_resumes,
+    load_resumes,
+)
+
+from conftest import make_pdf
+
+TEXTS = [f"resume number {i} python developer" for i in range(8)]
+
+
+@pytest.fixture
+def pdf_paths(tmp_path):
+    paths = []
+    for i, text in enumerate(TEXTS):
+        path = tmp_path / f"cv{i}.pdf"
+        path.write_bytes(make_pdf(text))
+        paths.append(str(path))
+    return paths
+
+
+def test_small_batches_are_parsed_serially_in_order(pdf_paths, tmp_path, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started")
+
+    monkeypatch.setattr(resume_parser.multiprocessing, "get_context", no_pool)
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    resumes = list(iter_resumes([pdf_paths[1], str(broken), pdf_paths[0]], workers=4))
+    # Unreadable files are skipped
+    assert [r["content"] for r in resumes] == [TEXTS[1], TEXTS[0]]
+
+
+def test_pool_matches_serial_parsing(pdf_paths, monkeypatch):
+    contexts = []
+    get_context = resume_parser.multiprocessing.get_context
+    monkeypatch.setattr(
+        resume_parser.multiprocessing, "get_context", lambda method: contexts.append(method) or get_context(method)
+    )
+    serial = load_resumes(pdf_paths, workers=1)
+    pooled = load_resumes(pdf_paths, workers=2, timeout=30)
+    assert contexts == ["spawn"]
+    assert sorted(r["filename"] for r in pooled) == sorted(pdf_paths)
+    assert sorted((r["filename"], r["content"]) for r in pooled) == sorted((r["filename"], r["content"]) for r in serial)
+
+
+def test_slow_file_times_out(pdf_paths, monkeypatch):
+    def slow_read(path, data=None):
+        time.sleep(2)
+        return "never returned", 1
+
+    monkeypatch.setattr(resume_parser, "_read_pdf", slow_read)
+    start = time.perf_counter()
+    path, text, seconds, pages = _extract_worker(pdf_paths[0], timeout=0.05)
+    assert (path, text, pages) == (pdf_paths[0], "", 0)
+    assert time.perf_counter() - start < 1
+
+
+@pytest.fixture
+def one_mb_limit(monkeypatch):
+    monkeypatch.setattr(resume_parser.config.app, "max_file_size_mb", 1)
+
+
+def test_upload_limit_applies_to_the_total(one_mb_limit):
+    half = memoryview(bytearray(512 * 1024))
+    assert check_upload_size([("a.pdf", half), ("b.pdf", b"x" * 1024)]) == 512 * 1024 + 1024
+    with pytest.raises(UploadTooLarge, match="limit is 1 MB"):
+        check_upload_size([("a.pdf", half), ("b.pdf", half), ("c.pdf", b"x")])
+
+
+def test_oversized_uploads_are_refused_before_parsing(one_mb_limit, tmp_path, monkeypatch):
+    def no_parse(*args, **kwargs):
+        raise AssertionError("parsed")
+
+    monkeypatch.setattr(resume_parser, "_parse_timed", no_parse)
+    files = [("big.pdf", bytes(2 * 1024 * 1024))]
+    with pytest.raises(UploadTooLarge):
+        CandidateStore(str(tmp_path / "candidates")).ingest_uploads(files)
+    manager = JobManager(max_workers=1, upload_dir=str(tmp_path / "uploads"))
+    try:
+        with pytest.raises(UploadTooLarge):
+            manager.submit(files, "python developer")
+    finally:
+        manager.shutdown()
+
+
+def test_uploads_are_parsed_from_memory(tmp_path):
+    pdf = make_pdf(TEXTS[0])
+    reader = BufferReader(memoryview(pdf))
+    reader.seek(-5, 2)
+    assert reader.read() == pdf[-5:]
+    assert extract_text_from_pdf(memoryview(pdf)) == TEXTS[0]
+
+    files = [("a.pdf", memoryview(pdf)), ("b.pdf", bytearray(make_pdf(TEXTS[1])))]
+    resumes = sorted(iter_uploaded_resumes(files, spill_dir=str(tmp_path), workers=1), key=lambda r: r["filename"])
+    assert [(r["filename"], r["content"]) for r in resumes] == [("a.pdf", TEXTS[0]), ("b.pdf", TEXTS[1])]
+    # Small batches are parsed in-process: nothing is spilled
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,94 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from resume_matcher.candidate_store import CandidateStore
+from resume_matcher.matcher import encode_texts
+from resume_matcher.micro_batcher import MicroBatcher
+from resume_matcher.server import RankingServer, RankingService
+
+
+@pytest.fixture
+def server(tmp_path, fake_model):
+    service = RankingService(CandidateStore(str(tmp_path / "candidates")), MicroBatcher(encode_texts, max_wait_ms=1))
+    server = RankingServer(("127.0.0.1", 0), service, max_inflight=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.batcher.close()
+
+
+def request(server, method, path, payload=None, headers=None):
+    """Send one HTTP/1.1 request; return (status, body, raw reply)."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", "Host: test", f"Content-Length: {len(body)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(("\r\n".join(lines) + "\r\n\r\n").encode("ascii") + body)
+        reply = _read_reply(sock)
+    head, _, content = reply.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content), reply
+
+
+def _read_reply(sock):
+    head = b""
+    while b"\r\n\r\n" not in head:
+        head += sock.recv(4096)
+    length = int([line.split(b":")[1] for line in head.split(b"\r\n") if line.lower().startswith(b"content-length")][0])
+    while len(head.partition(b"\r\n\r\n")[2]) < length:
+        head += sock.recv(4096)
+    return head
+
+
+def test_ingest_then_rank(server):
+    status, report, _ = request(server, "POST", "/ingest", {"resumes": [
+        {"name": "alice.pdf", "content": "python developer django"},
+        {"name": "bob.pdf", "content": "java engineer spring"},
+    ]})
+    assert status == 200
+    assert sorted(report["added"]) == ["alice.pdf", "bob.pdf"]
+
+    status, ranked, _ = request(server, "POST", "/rank", {"job_description": "python django", "top_k": 1})
+    assert status == 200
+    assert [r["filename"] for r in ranked["results"]] == ["alice.pdf"]
+
+    status, health, _ = request(server, "GET", "/health")
+    assert (status, health["candidates"]) == (200, 2)
+
+
+def test_duplicates_are_folded(server):
+    cv = "python developer django postgresql"
+    status, report, _ = request(server, "POST", "/ingest", {"resumes": [
+        {"name": "alice.pdf", "content": cv},
+        {"name": "copy.pdf", "content": cv},
+    ]})
+    assert (report["added"], report["duplicates"]) == (["alice.pdf"], ["copy.pdf"])
+
+    status, ranked, _ = request(server, "POST", "/rank", {"job_description": "python", "resumes": [
+        {"filename": "a.pdf", "content": cv},
+        {"filename": "b.pdf", "content": "java engineer spring"},
+        {"filename": "c.pdf", "content": cv},
+    ]})
+    assert status == 200
+    assert [(r["filename"], r.get("aliases")) for r in ranked["results"]] == [("a.pdf", ["c.pdf"]), ("b.pdf", None)]
+
+
+def test_invalid_payloads_are_rejected(server):
+    assert request(server, "POST", "/rank", {"top_k": 3})[0] == 400
+    assert request(server, "POST", "/rank", {"job_description": "python", "top_k": 0})[0] == 400
+    assert request(server, "POST", "/rank", {"job_description": "python", "resumes": ["text"]})[0] == 400
+    assert request(server, "GET", "/nowhere")[0] == 404
+
+
+def test_oversized_body_closes_the_connection(server):
+    head = "POST /rank HTTP/1.1\r\nHost: test\r\nContent-Length: 1000000000\r\n\r\n"
+    with socket.create_connection(server.server_address, timeout=5) as sock:
+        sock.sendall(head.encode("ascii") + b'{"job_description": ')
+        reply = _read_reply(sock)
+        assert reply.split()[1] == b"413"
+        # The unread body is not taken for the next request: the server hangs up
+        assert sock.recv(4096) == b""
@@ -0,0 +1,88 @@
+import json
+import math
+
+import numpy as np
+import pytest
+
+from resume_matcher.skills import (
+    AhoCorasick,
+    SkillFilter,
+    SkillIndex,
+    SkillVocabulary,
+    extract_years,
+    load_taxonomy,
+    popcount,
+)
+
+
+def test_aho_corasick_finds_overlapping_matches():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+    found = [(end, matcher.patterns[pattern]) for end, pattern in matcher.iter_matches("ushers")]
+    assert found == [(4, "she"), (4, "he"), (6, "hers")]
+
+
+def test_matches_whole_words_and_aliases():
+    vocabulary = SkillVocabulary({"Java": [], "JavaScript": ["js"], "Kubernetes": ["k8s"]})
+    assert vocabulary.decode(vocabulary.extract("JavaScript and k8s")) == ["JavaScript", "Kubernetes"]
+    assert vocabulary.decode(vocabulary.extract("Java, JS")) == ["Java", "JavaScript"]
+    assert vocabulary.decode(vocabulary.extract("javanese k8sx")) == []
+
+
+def test_ambiguous_names_only_match_their_aliases():
+    vocabulary = SkillVocabulary()
+    prose = "I excel at teamwork, react to incidents calmly and go the extra mile."
+    assert vocabulary.decode(vocabulary.extract(prose)) == []
+    listed = "Golang, React.js and Microsoft Excel"
+    assert {"Go", "React", "Excel"} <= set(vocabulary.decode(vocabulary.extract(listed)))
+    # Filters still accept the names
+    assert vocabulary.decode(vocabulary.bits(["go", "Excel"])) == ["Go", "Excel"]
+
+
+def test_taxonomy_file_entries(tmp_path):
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps({"Go": {"aliases": ["golang"], "match_name": False}, "Rust": []}))
+    vocabulary = SkillVocabulary(load_taxonomy(str(path)))
+    assert vocabulary.decode(vocabulary.extract("go rust golang")) == ["Go", "Rust"]
+    assert vocabulary.decode(vocabulary.extract("go rust")) == ["Rust"]
+
+    path.write_text(json.dumps({"Go": {"alias": ["golang"]}}))
+    with pytest.raises(ValueError):
+        load_taxonomy(str(path))
+
+
+def test_unknown_filter_skill_is_rejected():
+    with pytest.raises(ValueError, match="Unknown skill"):
+        SkillVocabulary({"Python": []}).bits(["Cobol"])
+
+
+def test_bitsets_span_several_words():
+    taxonomy = {f"skill{i}": [] for i in range(130)}
+    vocabulary = SkillVocabulary(taxonomy)
+    bits = vocabulary.extract("skill0 skill64 skill129")
+    assert vocabulary.n_words == 3
+    assert vocabulary.decode(bits) == ["skill0", "skill64", "skill129"]
+    assert int(popcount(bits)) == 3
+
+
+def test_extract_years():
+    assert extract_years("5+ years of experience in Python, 8 years of professional experience") == 8
+    assert extract_years("3,5 ans d'expérience") == 3.5
+    assert math.isnan(extract_years("No numbers here"))
+
+
+def test_skill_index_mask_and_boosts():
+    vocabulary = SkillVocabulary({"Python": [], "SQL": [], "Docker": []})
+    index = SkillIndex.build([
+        "Python and SQL, 6 years of experience",
+        "Python and Docker, 2 years of experience",
+        "SQL only",
+    ], vocabulary)
+
+    assert index.mask(SkillFilter(required=["Python"])).tolist() == [True, True, False]
+    assert index.mask(SkillFilter(required=["python"], min_years=5)).tolist() == [True, False, False]
+
+    boosts = index.boosts(SkillFilter(preferred=["SQL", "Docker"], boost=0.2))
+    np.testing.assert_allclose(boosts, [0.1, 0.1, 0.1])
+    assert index.count(["Python", "SQL"]).tolist() == [2, 1, 1]
+    assert index.skills_of(1) == ["Python", "Docker"]
+    assert not SkillFilter()
@@ -0,0 +1,96 @@
+import io
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from resume_matcher import streaming
+from resume_matcher.matcher import rank_resumes
+from resume_matcher.streaming import iter_resume_batches, iter_sources, stream_rank
+
+from conftest import make_pdf
+
+TEXTS = {
+    "a.pdf": "python developer django postgresql",
+    "b.pdf": "java engineer spring kubernetes",
+    "c.pdf": "python data scientist pandas",
+    "d.pdf": "frontend developer javascript vue",
+    "e.pdf": "python backend engineer flask",
+}
+
+
+@pytest.fixture
+def folder(tmp_path):
+    root = tmp_path / "cvs"
+    (root / "sub").mkdir(parents=True)
+    for name, text in TEXTS.items():
+        (root / ("sub" if name == "c.pdf" else "") / name).write_bytes(make_pdf(text))
+    (root / "notes.md").write_text("not a resume")
+    return root
+
+
+def basenames(sources):
+    return [os.path.basename(source.name) for source in sources]
+
+
+def test_sources_from_folders_archives_and_lists(folder, tmp_path):
+    assert basenames(iter_sources([str(folder)])) == ["a.pdf", "b.pdf", "d.pdf", "e.pdf", "c.pdf"]
+
+    with zipfile.ZipFile(tmp_path / "cvs.zip", "w") as archive:
+        archive.writestr("x.pdf", make_pdf("zip member"))
+        archive.writestr("readme.txt", "skipped")
+    with tarfile.open(tmp_path / "cvs.tar.gz", "w:gz") as archive:
+        data = make_pdf("tar member")
+        info = tarfile.TarInfo("dir/y.pdf")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    (tmp_path / "list.txt").write_text(f"{tmp_path / 'cvs.zip'}\n\n{tmp_path / 'cvs.tar.gz'}\n")
+
+    sources = list(iter_sources([str(tmp_path / "list.txt")]))
+    assert [source.name for source in sources] == [f"{tmp_path / 'cvs.zip'}!x.pdf", f"{tmp_path / 'cvs.tar.gz'}!dir/y.pdf"]
+    assert all(source.data is not None for source in sources)
+
+
+def test_oversized_archive_members_are_skipped(tmp_path, monkeypatch):
+    with zipfile.ZipFile(tmp_path / "cvs.zip", "w") as archive:
+        archive.writestr("small.pdf", b"x" * 10)
+        archive.writestr("large.pdf", b"x" * 1000)
+    monkeypatch.setattr(streaming, "_max_member_bytes", lambda: 100)
+    assert [source.name.split("!")[1] for source in iter_sources([str(tmp_path / "cvs.zip")])] == ["small.pdf"]
+
+
+def test_batches_are_bounded(folder):
+    batches = list(iter_resume_batches([str(folder)], batch_size=2, workers=1))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sorted(os.path.basename(r["filename"]) for batch in batches for r in batch) == sorted(TEXTS)
+
+
+def test_stream_rank_matches_rank_resumes(folder, fake_model):
+    scored = []
+    results = stream_rank(
+        "python developer", [str(folder)], top_k=3, batch_size=2, workers=1, rerank=False,
+        progress=lambda count, seconds: scored.append(count)
+    )
+    expected = rank_resumes(
+        "python developer", [{"filename": name, "content": text} for name, text in TEXTS.items()], top_k=3, rerank=False
+    )
+    assert [os.path.basename(r.filename) for r in results] == [r.filename for r in expected]
+    assert [r.score for r in results] == pytest.approx([r.score for r in expected])
+    assert scored == [2, 4, 5]
+    assert stream_rank("python", [str(folder)], top_k=0) == []
+
+
+def test_ties_keep_reading_order(tmp_path, fake_model):
+    # Same words in another order: equal scores, but not duplicates
+    for i, text in enumerate(["python django developer", "developer python django", "django developer python"]):
+        (tmp_path / f"{i}.pdf").write_bytes(make_pdf(text))
+    results = stream_rank("python django", [str(tmp_path)], top_k=2, batch_size=1, workers=1, rerank=False)
+    assert [os.path.basename(r.filename) for r in results] == ["0.pdf", "1.pdf"]
+    assert results[0].score == results[1].score
+
+
+def test_pooled_batches(folder, fake_model):
+    serial = stream_rank("python", [str(folder)], top_k=5, batch_size=2, workers=1, rerank=False)
+    pooled = stream_rank("python", [str(folder)], top_k=5, batch_size=2, workers=2, rerank=False)
+    assert [(r.filename, r.score) for r in pooled] == [(r.filename, r.score) for r in serial]
@@ -0,0 +1,40 @@
+from resume_matcher import resume_parser
+from resume_matcher.resume_parser import iter_resumes, iter_uploaded_resumes
+from resume_matcher.text_cache import TextCache, bytes_digest, file_digest
+
+from conftest import make_pdf
+
+
+def test_digests_agree_for_files_and_buffers(tmp_path):
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(b"%PDF" * 100000)
+    assert file_digest(str(path)) == bytes_digest(memoryview(path.read_bytes()))
+
+
+def test_texts_persist_across_instances(tmp_path):
+    cache = TextCache(str(tmp_path / "texts.sqlite3"))
+    assert cache.get("digest") is None
+    cache.put("digest", "python développeur")
+    assert TextCache(str(tmp_path / "texts.sqlite3")).get("digest") == "python développeur"
+    assert len(cache) == 1
+    assert cache.stats() == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+
+
+def test_cached_files_are_not_parsed_again(tmp_path, monkeypatch):
+    cache = TextCache(str(tmp_path / "texts.sqlite3"))
+    monkeypatch.setattr(resume_parser, "get_text_cache", lambda: cache)
+    pdf = make_pdf("python developer django")
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(pdf)
+    assert [r["content"] for r in iter_resumes([str(path)], workers=1)] == ["python developer django"]
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("parsed")
+
+    monkeypatch.setattr(resume_parser, "_parse_timed", no_parse)
+    # Same bytes under another name, from disk and from memory
+    copy = tmp_path / "renamed.pdf"
+    copy.write_bytes(pdf)
+    assert [r["content"] for r in iter_resumes([str(copy)], workers=1)] == ["python developer django"]
+    assert [r["filename"] for r in iter_uploaded_resumes([("upload.pdf", memoryview(pdf))])] == ["upload.pdf"]
+    assert cache.stats()["hits"] == 2
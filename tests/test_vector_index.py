@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from resume_matcher.vector_index import FlatIndex, IVFIndex, load_index, normalize, top_k_indices
+
+
+def clustered(n, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((8, dim))
+    return centers[rng.integers(0, 8, n)] + 0.3 * rng.standard_normal((n, dim))
+
+
+def test_normalize_leaves_zero_rows():
+    rows = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+    np.testing.assert_allclose(rows, [[0.6, 0.8], [0.0, 0.0]])
+    assert rows.dtype == np.float32
+
+
+def test_top_k_breaks_ties_by_index():
+    scores = np.array([0.5, 0.9, 0.5, 0.1, 0.5])
+    assert top_k_indices(scores, 3).tolist() == [1, 0, 2]
+    assert top_k_indices(scores, 10).tolist() == [1, 0, 2, 4, 3]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+def test_flat_index_add_replace_remove():
+    index = FlatIndex(2)
+    index.add(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+    assert index.query(np.array([1.0, 0.1]), 1)[0][0] == "a"
+
+    index.add(["a"], np.array([[0.0, 1.0]]))
+    assert len(index) == 2
+    assert index.remove(["b", "unknown"]) == 1
+    assert index.ids == ["a"]
+    assert index.query(np.array([0.0, 1.0]), 5) == [("a", pytest.approx(1.0))]
+
+    with pytest.raises(ValueError):
+        index.add(["c", "c"], np.ones((2, 2)))
+
+
+def test_ivf_with_every_list_probed_matches_flat():
+    vectors = clustered(500)
+    ids = [str(i) for i in range(len(vectors))]
+    flat = FlatIndex(16).build(ids, vectors)
+    ivf = IVFIndex(16, nlist=10, nprobe=10).build(ids, vectors)
+    for query in clustered(5, seed=1):
+        assert [i for i, _ in ivf.query(query, 10)] == [i for i, _ in flat.query(query, 10)]
+
+
+def test_ivf_keeps_the_configured_nlist():
+    index = IVFIndex(16, nlist=50)
+    index.add([str(i) for i in range(20)], clustered(20))
+    # Capped by the training set, but the setting survives for retraining
+    assert (index.nlist, index.configured_nlist) == (20, 50)
+
+    index.add([str(i) for i in range(20, 200)], clustered(180, seed=1))
+    assert index.trained_size == 200
+    assert index.nlist == 50
+
+
+def test_ivf_retrains_when_the_pool_doubles():
+    index = IVFIndex(16)
+    index.add([str(i) for i in range(100)], clustered(100))
+    assert (index.nlist, index.trained_size) == (10, 100)
+
+    index.add([str(i) for i in range(100, 150)], clustered(50, seed=1))
+    assert index.trained_size == 100
+    index.add([str(i) for i in range(150, 400)], clustered(250, seed=2))
+    assert (index.nlist, index.trained_size) == (20, 400)
+
+
+def test_save_and_load(tmp_path):
+    vectors = clustered(300)
+    ids = [f"cv_{i}" for i in range(len(vectors))]
+    index = IVFIndex(16, nlist=8, nprobe=3).build(ids, vectors)
+    index.save(str(tmp_path))
+
+    loaded = load_index(str(tmp_path))
+    assert isinstance(loaded, IVFIndex)
+    assert (loaded.nlist, loaded.configured_nlist, loaded.nprobe) == (8, 8, 3)
+    for query in clustered(3, seed=1):
+        assert loaded.query(query, 5) == index.query(query, 5)